@@ -57,7 +57,9 @@ async def main_page(st, container):
 
     user = await app.execute(GetUserDTO(id=uuid.UUID(current_user_id)), container.db_session())
     accounts_data = await get_accounts_data(user)
-    txs_data = await get_transactions_data(user)
+    # cursors of the opened transactions pages, the last one is the current page
+    txs_cursors = st.session_state.setdefault('txs_cursors', [None])
+    txs_data, txs_next_cursor = await get_transactions_data(user, txs_cursors[-1])
     categories = await get_categories_data(user.id)
 
     tab1, tab2, tab3 = st.tabs([Pages.accounts, Pages.transactions, Pages.categories])
@@ -73,6 +75,15 @@ async def main_page(st, container):
 
         await add_transaction__form(st, user, accounts_data, categories)
         st.table(data=txs_data)
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button('Newer', disabled=len(txs_cursors) == 1):
+                txs_cursors.pop()
+                st.rerun()
+        with col2:
+            if st.button('Older', disabled=txs_next_cursor is None):
+                txs_cursors.append(txs_next_cursor)
+                st.rerun()
     with tab3:
         st.header(Pages.categories.value)
         col1, col2 = st.columns(2)
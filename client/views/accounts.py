@@ -17,7 +17,7 @@ async def get_accounts_data(user, container=Provide[Container]):
     display_data = [AccountReadModel(
         number=account.number,
         name=account.name,
-        balance=account.balance
+        balance=account.balance.to_decimal()
     ).model_dump(by_alias=True) for account in data]
 
     return display_data
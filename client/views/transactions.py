@@ -10,10 +10,16 @@ from domain.account.queries import GetAllUserAccountsDTO, GetAccountByNumberDTO
 from domain.category.queries import GetCategoryByNameDTO
 from domain.transaction.queries import GetUserTransactionsDTO
 
+TRANSACTIONS_PAGE_SIZE = 50
+
+
 @inject
-async def get_transactions_data(user, container=Provide[Container]):
+async def get_transactions_data(user, cursor=None, container=Provide[Container]):
     app = container.app()
-    txs = await app.execute(GetUserTransactionsDTO(user.id), container.db_session())
+    txs = await app.execute(
+        GetUserTransactionsDTO(user.id, limit=TRANSACTIONS_PAGE_SIZE, cursor=cursor),
+        container.db_session()
+    )
     user_accounts = await app.execute(GetAllUserAccountsDTO(user.id), container.db_session())
 
     display_data = []
@@ -23,13 +29,13 @@ async def get_transactions_data(user, container=Provide[Container]):
         display_data.append(
             TransactionReadModel(
                 debit_account=debit_acc.name if debit_acc else None,
-                amount=tx.amount,
+                amount=tx.amount.to_decimal(),
                 credit_account=credit_acc.name if credit_acc else None,
                 type=tx.type,
                 category=tx.category.name if tx.category else None
             ).model_dump(by_alias=True)
         )
-    return display_data
+    return display_data, txs.next_cursor
 
 @inject
 async def add_transaction__form(st, user, accounts, categories, container=Provide[Container]):
@@ -0,0 +1,64 @@
+"""009 add account balance checkpoint
+
+Revision ID: 0d7be51a93c4
+Revises: a4b3c6b55975
+Create Date: 2026-10-18 10:12:41.208534
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d7be51a93c4'
+down_revision: Union[str, None] = 'a4b3c6b55975'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('account_balance_checkpoint',
+    sa.Column('account_id', sa.UUID(), nullable=False),
+    sa.Column('period_end', sa.DateTime(), nullable=False),
+    sa.Column('balance', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], name=op.f('account_balance_checkpoint_account_id_account_fkey')),
+    sa.PrimaryKeyConstraint('id', name=op.f('account_balance_checkpoint_pkey')),
+    sa.UniqueConstraint('account_id', 'period_end', name='account_balance_checkpoint_account_id_period_end_key')
+    )
+
+    # checkpoints of existing history: running balance at the end of every month with transactions
+    op.execute("""
+        INSERT INTO account_balance_checkpoint (id, account_id, period_end, balance, created_at)
+        SELECT
+            gen_random_uuid(),
+            account.id,
+            periods.period_end,
+            sum(periods.delta) OVER (PARTITION BY account.id ORDER BY periods.period_end),
+            now() at time zone 'utc'
+        FROM account
+        JOIN (
+            SELECT
+                legs.number,
+                date_trunc('month', legs.created_at) + interval '1 month' AS period_end,
+                sum(legs.delta) AS delta
+            FROM (
+                SELECT debit_account AS number, amount AS delta, created_at
+                FROM transaction
+                WHERE debit_account IS NOT NULL AND deleted_at IS NULL
+                UNION ALL
+                SELECT credit_account AS number, -amount AS delta, created_at
+                FROM transaction
+                WHERE credit_account IS NOT NULL AND deleted_at IS NULL
+            ) AS legs
+            GROUP BY legs.number, period_end
+        ) AS periods ON periods.number = account.number
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('account_balance_checkpoint')
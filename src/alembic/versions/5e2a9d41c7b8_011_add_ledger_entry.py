@@ -0,0 +1,60 @@
+"""011 add ledger entry
+
+Revision ID: 5e2a9d41c7b8
+Revises: b81e0f3c92d7
+Create Date: 2026-10-18 12:26:09.734150
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a9d41c7b8'
+down_revision: Union[str, None] = 'b81e0f3c92d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ledger_entry',
+    sa.Column('account_id', sa.UUID(), nullable=False),
+    sa.Column('transaction_id', sa.UUID(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], name=op.f('ledger_entry_account_id_account_fkey')),
+    sa.ForeignKeyConstraint(['transaction_id'], ['transaction.id'], name=op.f('ledger_entry_transaction_id_transaction_fkey')),
+    sa.PrimaryKeyConstraint('id', name=op.f('ledger_entry_pkey'))
+    )
+
+    # ledger entries of existing transactions: debit leg +amount, credit leg -amount
+    op.execute("""
+        INSERT INTO ledger_entry (id, account_id, transaction_id, amount, created_at, deleted_at)
+        SELECT gen_random_uuid(), account.id, transaction.id, transaction.amount, transaction.created_at, transaction.deleted_at
+        FROM transaction
+        JOIN account ON account.number = transaction.debit_account
+        UNION ALL
+        SELECT gen_random_uuid(), account.id, transaction.id, -transaction.amount, transaction.created_at, transaction.deleted_at
+        FROM transaction
+        JOIN account ON account.number = transaction.credit_account
+    """)
+
+    op.create_index('ledger_entry_account_id_created_at_idx', 'ledger_entry', ['account_id', 'created_at', 'transaction_id'], unique=False)
+    op.create_index(op.f('ledger_entry_transaction_id_idx'), 'ledger_entry', ['transaction_id'], unique=False)
+
+    # account history is read through ledger entries now
+    op.drop_index('transaction_debit_account_created_at_id_idx', table_name='transaction')
+    op.drop_index('transaction_credit_account_created_at_id_idx', table_name='transaction')
+
+
+def downgrade() -> None:
+    op.create_index('transaction_credit_account_created_at_id_idx', 'transaction', ['credit_account', 'created_at', 'id'], unique=False)
+    op.create_index('transaction_debit_account_created_at_id_idx', 'transaction', ['debit_account', 'created_at', 'id'], unique=False)
+
+    op.drop_index(op.f('ledger_entry_transaction_id_idx'), table_name='ledger_entry')
+    op.drop_index('ledger_entry_account_id_created_at_idx', table_name='ledger_entry')
+    op.drop_table('ledger_entry')
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark of list mapping: mapper created for every item (as `SqlAlchemyRepository.data_mapper` did)
+vs shared mapper instance with per-item calls vs bulk DataMapper.rows_to_entities:
+time of mapping and memory held by mapped entities.
+Rows are plain tuples of TransactionDataMapper.columns, database is not involved, GC is paused while timing.
+
+    cd src && python -m benchmarks.mapping [rows]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from shared.money import Money
+from storage.transaction import TransactionDataMapper
+
+
+def make_rows(count: int) -> list[tuple]:
+    user_id, category_id = uuid.uuid4(), uuid.uuid4()
+    started = datetime(2024, 1, 1)
+    return [
+        (
+            uuid.uuid4(), None, '1234567890123456', user_id, Money(1000), 'income',
+            category_id if i % 2 else None, started + timedelta(seconds=i),
+            'category' if i % 2 else None, None
+        )
+        for i in range(count)
+    ]
+
+
+def mapper_per_row(rows):
+    return [TransactionDataMapper().row_to_entity(row) for row in rows]
+
+
+def shared_mapper(rows):
+    mapper = TransactionDataMapper.instance()
+    return [mapper.row_to_entity(row) for row in rows]
+
+
+def bulk(rows):
+    return TransactionDataMapper.instance().rows_to_entities(rows)
+
+
+def main(count: int, repeat: int = 5):
+    rows = make_rows(count)
+    print(f'{count} rows')
+    baseline = None
+    for title, map_rows in (('mapper per row', mapper_per_row), ('shared mapper', shared_mapper), ('bulk', bulk)):
+        timings = []
+        for _ in range(repeat):
+            gc.collect()
+            gc.disable()
+            started = time.perf_counter()
+            entities = map_rows(rows)
+            timings.append(time.perf_counter() - started)
+            gc.enable()
+            assert len(entities) == count
+            del entities
+        elapsed = min(timings)
+        baseline = baseline or elapsed
+
+        tracemalloc.start()
+        entities = map_rows(rows)
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del entities
+        print(f'{title:<16}{elapsed * 1e3:>8.1f} ms{baseline / elapsed:>8.2f}x{allocated / 2 ** 20:>8.1f} MB')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,65 @@
+"""
+Micro-benchmark of amounts arithmetic in Python, as done by statements, imports and reconciliations:
+running balance over transaction amounts and comparisons with zero -
+Decimal amounts (quantized after every step, as balances were) vs Money operators,
+and sum of amounts - builtin sum() of Decimal vs Money.sum() of integer cents.
+
+    cd src && python -m benchmarks.money [amounts]
+"""
+import random
+import sys
+import time
+from decimal import Decimal
+
+from shared.money import Money
+
+CENT = Decimal('0.01')
+
+
+def decimal_balance(amounts: list[Decimal]) -> Decimal:
+    balance, zero = Decimal('0.00'), Decimal(0)
+    for amount in amounts:
+        balance = (balance + amount).quantize(CENT)
+        if balance < zero:
+            balance = zero
+    return balance
+
+
+def money_balance(amounts: list[Money]) -> Money:
+    balance, zero = Money.ZERO, Money.ZERO
+    for amount in amounts:
+        balance = balance + amount
+        if balance < zero:
+            balance = zero
+    return balance
+
+
+def measure(function, amounts, repeat: int = 5) -> tuple[float, object]:
+    timings, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(amounts)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(count: int):
+    random.seed(0)
+    cents = [random.randint(-100_000, 100_000) for _ in range(count)]
+    decimals = [Decimal(value).scaleb(-2) for value in cents]
+    amounts = [Money(value) for value in cents]
+    print(f'{count} amounts')
+
+    cases = (
+        ('Decimal running balance', decimal_balance, decimals),
+        ('Money running balance', money_balance, amounts),
+        ('Decimal sum()', sum, decimals),
+        ('Money.sum()', Money.sum, amounts),
+    )
+    for title, function, values in cases:
+        elapsed, result = measure(function, values)
+        print(f'{title:<26}{elapsed * 1e3:>8.1f} ms  {result}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
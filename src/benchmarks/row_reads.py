@@ -0,0 +1,96 @@
+"""
+Benchmark of list reads: ORM instances (with joined category) + DataMapper.model_to_entity
+vs Core read mode - entity columns selected and entities built from rows (DataMapper.row_to_entity).
+Transactions are read from in-memory SQLite, so mostly Python-side cost is measured:
+CPU time of read + mapping and peak memory allocated by it (tracemalloc).
+
+    cd src && python -m benchmarks.row_reads [rows]
+"""
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from shared.database import Base
+from storage.models import TransactionModel, CategoryModel
+from storage.transaction import TransactionDataMapper, TransactionSqlAlchemyRepository
+
+
+def make_id(number: int) -> uuid.UUID:
+    # SQLite stores UUID column with numeric affinity: random hex of digits (and single `e`) would turn into number
+    return uuid.UUID(int=(0xa << 124) | number)
+
+
+def fill(session: Session, rows: int):
+    user_id = make_id(rows + 10)
+    category_ids = [make_id(rows + i) for i in range(10)]
+    session.execute(insert(CategoryModel), [
+        dict(id=category_id, name=f'category {i}', user_id=None) for i, category_id in enumerate(category_ids)
+    ])
+    started = datetime(2024, 1, 1)
+    session.execute(insert(TransactionModel), [
+        dict(
+            id=make_id(i),
+            user_id=user_id,
+            credit_account=None,
+            debit_account='1234567890123456',
+            amount=Decimal('10.00'),
+            type='income',
+            category_id=category_ids[i % 10] if i % 2 else None,
+            created_at=started + timedelta(seconds=i)
+        )
+        for i in range(rows)
+    ])
+    session.commit()
+
+
+def read_orm(session: Session) -> list:
+    mapper = TransactionDataMapper()
+    instances = session.scalars(select(TransactionModel)).unique().all()
+    entities = [mapper.model_to_entity(instance) for instance in instances]
+    session.expunge_all()
+    return entities
+
+
+def read_rows(session: Session) -> list:
+    mapper = TransactionDataMapper()
+    rows = session.execute(TransactionSqlAlchemyRepository._transactions_stmt()).all()
+    return [mapper.row_to_entity(row) for row in rows]
+
+
+def measure(read, session: Session) -> tuple[float, int, int]:
+    """CPU seconds, peak allocated bytes, entities count"""
+    started = time.process_time()
+    entities = read(session)
+    cpu_time = time.process_time() - started
+    del entities
+
+    tracemalloc.start()
+    entities = read(session)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_time, peak, len(entities)
+
+
+def main(rows: int):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        fill(session, rows)
+
+        print(f'{rows} transactions')
+        print(f'{"":<12}{"CPU, ms":>10}{"peak, MB":>10}')
+        for title, read in (('ORM', read_orm), ('Core rows', read_rows)):
+            read(session)  # warm up: statement compilation
+            cpu_time, peak, count = measure(read, session)
+            assert count == rows
+            print(f'{title:<12}{cpu_time * 1e3:>10.0f}{peak / 2 ** 20:>10.1f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
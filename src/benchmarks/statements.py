@@ -0,0 +1,121 @@
+"""
+Micro-benchmark of per-call Python overhead of hot repository statements:
+statement built on every call (as repositories did before) vs statement built once with bound parameters.
+Measured: statement construction + cache key generation, which SQLAlchemy does on every execution
+to find compiled SQL in its cache; database round trip is not included.
+
+    cd src && python -m benchmarks.statements [calls]
+"""
+import sys
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import select, update, and_, exists, literal, null, true, union_all
+
+from storage import account, transaction
+from storage.models import AccountModel, AccountBalanceModel, AccountAccessModel, CategoryModel
+
+
+def account_by_number(number):
+    return select(
+        AccountModel,
+        AccountBalanceModel.balance
+    ).join(
+        AccountBalanceModel,
+        AccountBalanceModel.account_id == AccountModel.id
+    ).where(AccountModel.number == number).limit(1)
+
+
+def apply_balance_delta(account_id, delta):
+    return update(AccountBalanceModel).where(
+        AccountBalanceModel.account_id == account_id
+    ).values(
+        balance=AccountBalanceModel.balance + delta,
+        updated_at=datetime.utcnow()
+    ).returning(
+        AccountBalanceModel.balance
+    ).execution_options(synchronize_session=False)
+
+
+def participants(user_id, account_numbers, category_id):
+    return union_all(
+        select(
+            literal('account').label('kind'),
+            AccountModel.id,
+            AccountModel.number,
+            AccountModel.name,
+            AccountModel.owner_id,
+            AccountBalanceModel.balance,
+            exists().where(
+                and_(
+                    AccountAccessModel.account_id == AccountModel.id,
+                    AccountAccessModel.user_id == user_id,
+                    AccountAccessModel.deleted_at.is_(None)
+                )
+            ).label('is_accessible')
+        ).join(
+            AccountBalanceModel,
+            AccountBalanceModel.account_id == AccountModel.id
+        ).where(
+            and_(
+                AccountModel.number.in_(account_numbers),
+                AccountModel.deleted_at.is_(None)
+            )
+        ),
+        select(
+            literal('category'),
+            CategoryModel.id,
+            null(),
+            CategoryModel.name,
+            CategoryModel.user_id,
+            null(),
+            true()
+        ).where(
+            and_(
+                CategoryModel.id == category_id,
+                CategoryModel.deleted_at.is_(None)
+            )
+        )
+    )
+
+
+def measure(build, calls: int) -> float:
+    """Mean seconds per call"""
+    started = time.perf_counter()
+    for _ in range(calls):
+        build()._generate_cache_key()
+    return (time.perf_counter() - started) / calls
+
+
+def main(calls: int):
+    user_id, account_id, category_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cases = [
+        (
+            'get_by_number',
+            lambda: account_by_number('1234567890123456'),
+            lambda: account._accounts_by_numbers_stmt
+        ),
+        (
+            'apply_balance_delta',
+            lambda: apply_balance_delta(account_id, Decimal('1.00')),
+            lambda: account._apply_balance_delta_stmt
+        ),
+        (
+            'get_participants',
+            lambda: participants(user_id, ['1234567890123456', '6543210987654321'], category_id),
+            lambda: transaction._participants_stmt
+        ),
+    ]
+
+    print(f'{calls} calls, microseconds per call')
+    print(f'{"":<24}{"per call":>10}{"prebuilt":>10}{"speedup":>10}')
+    for title, per_call, prebuilt in cases:
+        per_call_time = measure(per_call, calls)
+        prebuilt_time = measure(prebuilt, calls)
+        print(f'{title:<24}{per_call_time * 1e6:>10.2f}{prebuilt_time * 1e6:>10.2f}{per_call_time / prebuilt_time:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
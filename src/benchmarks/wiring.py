@@ -0,0 +1,62 @@
+"""
+Micro-benchmark of handler dependency injection:
+@inject resolution on every call vs handler compiled by core.wiring (repositories pooled per session).
+Handler does nothing but binds repositories to session, so only dispatch overhead is measured,
+database is not needed.
+
+    cd src && python -m benchmarks.wiring [calls]
+"""
+import asyncio
+import sys
+import time
+
+from dependency_injector.wiring import inject, Provide
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.dependencies import Container
+from core.wiring import compile_handler
+
+
+@inject
+async def handler(
+        command,
+        session: AsyncSession,
+        tx_repo=Provide[Container.tx_repo],
+        account_repo=Provide[Container.account_repo],
+        category_repo=Provide[Container.category_repo]
+):
+    # the same dependencies as create_transaction had
+    tx_repo.session = session
+    account_repo.session = session
+    category_repo.session = session
+
+
+async def measure(handler, calls: int, new_session_per_call: bool) -> float:
+    """Mean seconds per call, session creation is included for both handlers"""
+    session = AsyncSession()
+    started = time.perf_counter()
+    for _ in range(calls):
+        if new_session_per_call:
+            session = AsyncSession()
+        await handler(None, session)
+    return (time.perf_counter() - started) / calls
+
+
+async def main(calls: int):
+    container = Container()
+    container.wire(modules=[sys.modules[__name__]])
+    compiled = compile_handler(handler, container)
+
+    print(f'{calls} calls, microseconds per call')
+    print(f'{"":<28}{"@inject":>10}{"compiled":>10}{"speedup":>10}')
+    for title, new_session_per_call in (('session per call', True), ('shared session', False)):
+        injected_time = await measure(handler, calls, new_session_per_call)
+        compiled_time = await measure(compiled, calls, new_session_per_call)
+        print(
+            f'{title:<28}{injected_time * 1e6:>10.2f}{compiled_time * 1e6:>10.2f}'
+            f'{injected_time / compiled_time:>9.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000))
@@ -1,13 +1,59 @@
-import inspect
+import contextlib
+import dataclasses
+import itertools
+import time
 import typing
-from importlib import import_module
+from contextvars import ContextVar
+from dataclasses import dataclass
 
+from dependency_injector import containers
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
+from core.cache import QueryCache, CacheStats
+from core.metrics import Metrics, MetricsSink, ActionStats, PoolMetrics, PoolStats
+from core.handlers_manifest import HANDLERS
+from core.registry import HandlerRegistry, RegistryStats
+from core.replicas import ReplicaRouter
+from core.wiring import compile_handler
 from shared.interfaces import Command, Query
 
 
+@dataclass
+class _UnitOfWork:
+    session: AsyncSession
+    # cache tags invalidated by commands of the unit of work, None - all cached results
+    invalidated_tags: set[str] | None = dataclasses.field(default_factory=set)
+
+    def invalidate(self, tags: typing.Iterable[str] | None):
+        if tags is None:
+            self.invalidated_tags = None
+        elif self.invalidated_tags is not None:
+            self.invalidated_tags.update(tags)
+
+
+# DB transaction of query is READ ONLY: Postgres skips write bookkeeping (options of other dialects are ignored)
+READ_ONLY_EXECUTION_OPTIONS = {'postgresql_readonly': True}
+
+# Unit of work, which is being executed in the current context (asyncio task)
+_current_uow: ContextVar[_UnitOfWork | None] = ContextVar('current_uow', default=None)
+
+
+@dataclass
+class ExecutionResult:
+    """
+    Outcome of a single action executed by Application.execute_many:
+    handler result if action succeeded, otherwise the exception action failed with
+    """
+    action: Command | Query
+    result: typing.Any = None
+    error: Exception | None = None
+
+    @property
+    def is_success(self) -> bool:
+        return self.error is None
+
+
 class Application:
     """
     Application stores information about application Commands, Queries, Services
@@ -18,59 +64,287 @@ class Application:
      - otherwise, session changes are being rolled back
 
     So, here sqlalchemy ORM Session Unit Of Work pattern is used
-    """
-
-    def __init__(self):
-        self.modules = [
-            import_module('domain.category.commands', package=None),
-            import_module('domain.category.queries', package=None),
 
-            import_module('domain.user.commands', package=None),
-            import_module('domain.user.queries', package=None),
+    Unit of work is ambient: if handler executes other actions (app.execute inside handler),
+    nested actions join the session of the outermost one, so all changes are committed once
+    at the outermost level or rolled back together.
 
-            import_module('domain.transaction.commands', package=None),
-            import_module('domain.transaction.queries', package=None),
+    Every execution is measured (latency, errors, SQL statements and rows, see core.metrics):
+    stats() returns aggregated metrics per action class, samples are passed to metrics sinks.
+    pool_stats() returns connection pool metrics: every unit of work acquires its connection at start,
+    time of acquisition is recorded as checkout wait.
 
-            import_module('domain.account.commands', package=None),
-            import_module('domain.account.queries', package=None),
+    Results of queries, which declare cache tags (Query.cache_tags), are cached;
+    cached results are dropped by tags, which committed commands invalidate (Command.invalidates).
+    Only outermost queries are served from cache: nested ones read through the session of the caller.
 
-        ]
+    Outermost queries run on read-only session profile (see `_open_session`): no autoflush,
+    no expire on commit, READ ONLY DB transaction, which is released without commit.
+    If read replicas are configured, outermost queries are routed to them (see core.replicas),
+    `session_maker` passed by caller is used for commands and for queries pinned to the primary.
+    Replica results are not cached while replicas may lag behind committed commands.
 
-        self.handlers = self.get_handlers()
-
-    def get_handlers(self):
-        handlers = dict()
-        def get_action_class(handler_function):
-            params_with_types = typing.get_type_hints(handler_function)
-            action_class = params_with_types.get('command') \
-                if params_with_types.get('command') \
-                else params_with_types.get('query')
+    Handlers are looked up in HandlerRegistry (see core.registry): by default handler modules are imported
+    on the first dispatch of their action, as listed in core.handlers_manifest; `handler_manifest=None` -
+    handlers of domain packages are introspected at start.
+    If `container` is passed, handler dependencies are resolved from it once, at the first dispatch
+    (see core.wiring): repositories are shared by actions of one session, instead of @inject resolution per call.
+    """
 
-            return action_class
+    def __init__(
+            self,
+            metrics_sinks: typing.Iterable[MetricsSink] = (),
+            query_cache: QueryCache | None = None,
+            replica_router: ReplicaRouter | None = None,
+            handler_manifest: typing.Mapping[str, str] | None = HANDLERS,
+            container: containers.Container | None = None,
+            pool_metrics: PoolMetrics | None = None
+    ):
+        self.handlers = HandlerRegistry(handler_manifest)
+        self.container = container
+        # handler -> handler compiled with dependencies of container
+        self._compiled_handlers: dict[typing.Callable, typing.Callable] = {}
+        self.metrics = Metrics(sinks=metrics_sinks)
+        self.pool_metrics = pool_metrics if pool_metrics is not None else PoolMetrics()
+        self.cache = query_cache if query_cache is not None else QueryCache()
+        self.replicas = replica_router if replica_router is not None else ReplicaRouter()
 
-        for module in self.modules:
-            module_handlers = inspect.getmembers(module, inspect.isfunction)
+    def stats(self) -> dict[str, ActionStats]:
+        return self.metrics.snapshot()
 
-            _handlers = dict()
-            for _, handler in module_handlers:
-                handler_action_class = get_action_class(handler)
-                if handler_action_class:
-                    _handlers[handler_action_class] = handler
+    def cache_stats(self) -> CacheStats:
+        return self.cache.stats()
 
-            handlers.update(_handlers)
+    def pool_stats(self) -> PoolStats:
+        return self.pool_metrics.snapshot()
 
-        return handlers
+    def registry_stats(self) -> RegistryStats:
+        return self.handlers.stats()
 
     async def execute(
             self,
             action: typing.Type[Command | Query],
             session_maker: async_sessionmaker
     ):
-        async with session_maker() as session:
+        uow = _current_uow.get()
+        if uow is not None:
+            # nested action - joins the unit of work of the caller,
+            # errors are handled by the outermost execute
+            with self.metrics.measure(action):
+                return await self._handle(action, uow)
+
+        cache_key = self._cache_key(action)
+        if cache_key is not None:
+            is_cached, cached_result = self.cache.get(cache_key)
+            if is_cached:
+                return cached_result
+            cache_version = self.cache.version
+
+        primary = session_maker
+        session_maker = self.replicas.session_maker_for(action, primary)
+        # replica result may miss changes, which were committed (and invalidated cache) within the window
+        is_cacheable = session_maker is primary or not self.replicas.may_lag()
+        async with self._open_session(action, session_maker) as session:
+            uow = _UnitOfWork(session)
+            token = _current_uow.set(uow)
             try:
-                handler = self.handlers[type(action)]
-                result = await handler(action, session)
-                await session.commit()
+                with self.metrics.measure(action):
+                    await self._acquire_connection(session, read_only=isinstance(action, Query))
+                    result = await self._handle(action, uow)
+                    if isinstance(action, Command):
+                        await session.commit()
+                self._invalidate_cache(uow)
+                if isinstance(action, Command):
+                    self.replicas.record_write(action, result)
+
+                if cache_key is not None and is_cacheable:
+                    tags = action.cache_tags(result)
+                    if tags is not None:
+                        self.cache.put(cache_key, result, tags, cache_version)
                 return result
             except IntegrityError as db_error:
                 await session.rollback()
+            finally:
+                _current_uow.reset(token)
+
+    async def _acquire_connection(self, session: AsyncSession, read_only: bool = False):
+        started = time.perf_counter()
+        await session.connection(execution_options=READ_ONLY_EXECUTION_OPTIONS if read_only else None)
+        self.pool_metrics.record_checkout_wait(time.perf_counter() - started)
+
+    @staticmethod
+    def _open_session(action: Command | Query, session_maker: async_sessionmaker) -> AsyncSession:
+        if isinstance(action, Query):
+            # nothing is written by queries: there is nothing to flush before statements,
+            # and loaded objects are not expired, as session is closed (transaction released) without commit
+            return session_maker(autoflush=False, expire_on_commit=False)
+        return session_maker()
+
+    def _get_handler(self, action: Command | Query) -> typing.Callable:
+        handler = self.handlers[type(action)]
+        if self.container is None:
+            return handler
+
+        compiled = self._compiled_handlers.get(handler)
+        if compiled is None:
+            compiled = self._compiled_handlers[handler] = compile_handler(handler, self.container)
+        return compiled
+
+    async def _handle(self, action: Command | Query, uow: _UnitOfWork):
+        handler = self._get_handler(action)
+        result = await handler(action, uow.session)
+        if isinstance(action, Command):
+            uow.invalidate(action.invalidates(result))
+        return result
+
+    def _invalidate_cache(self, uow: _UnitOfWork):
+        if uow.invalidated_tags is None or uow.invalidated_tags:
+            self.cache.invalidate(uow.invalidated_tags)
+
+    def _cache_key(self, action: Command | Query) -> typing.Hashable | None:
+        # queries opt in to caching by declaring cache tags
+        if not isinstance(action, Query) or type(action).cache_tags is Query.cache_tags or not self.cache.enabled:
+            return None
+
+        key = (type(action), tuple(getattr(action, field.name) for field in dataclasses.fields(action)))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    async def stream(
+            self,
+            query: Query,
+            session_maker: async_sessionmaker
+    ) -> typing.AsyncIterator:
+        """
+        Executes query and yields its result items one by one.
+        Handlers, which return async iterator (e.g. rows of server-side cursor), are streamed lazily:
+        session stays open until iterator is exhausted or closed (`aclose()`, break out of `async for`),
+        so only one batch of rows is kept in memory.
+        Results of other handlers are yielded from the returned collection.
+
+        Streamed query does not become ambient unit of work: actions executed
+        while result is being consumed use their own sessions.
+        """
+        async with contextlib.AsyncExitStack() as stack:
+            # latency - until stream is exhausted or closed; statements of streamed query are not counted:
+            # they would be mixed up with statements of the consumer, executed between items
+            stack.enter_context(self.metrics.measure(query, count_statements=False))
+            # nested stream reads through the session of the caller
+            uow = _current_uow.get()
+            if uow:
+                session = uow.session
+            else:
+                session_maker = self.replicas.session_maker_for(query, session_maker)
+                session = await stack.enter_async_context(self._open_session(query, session_maker))
+                await self._acquire_connection(session, read_only=True)
+
+            result = await self._get_handler(query)(query, session)
+            if hasattr(result, 'aclose'):
+                stack.push_async_callback(result.aclose)
+
+            async for item in self._iterate(result):
+                yield item
+
+    @staticmethod
+    async def _iterate(result) -> typing.AsyncIterator:
+        if hasattr(result, '__aiter__'):
+            async for item in result:
+                yield item
+        else:
+            for item in result or ():
+                yield item
+
+    async def execute_many(
+            self,
+            actions: typing.Iterable[Command | Query],
+            session_maker: async_sessionmaker,
+            chunk_size: int = 500
+    ) -> list[ExecutionResult]:
+        """
+        Executes actions in chunks, every chunk is handled with one Session and one DB transaction:
+         - actions of the chunk run one by one, changes are committed once, after the last action of the chunk
+         - if any action (or the chunk commit) fails, the chunk transaction is rolled back and the chunk is
+           executed again, every action inside its own SAVEPOINT: failed action is rolled back alone
+           and its error is reported in ExecutionResult, the rest of the chunk goes on.
+           Savepoint round trips are paid by failed chunks only
+         - if commit of such chunk fails, all actions of the chunk are reported as failed
+         - nested actions, executed by handlers, join the chunk session
+
+        Results are returned in the same order as actions.
+        """
+        assert chunk_size > 0, 'chunk_size must be positive'
+
+        results = []
+        actions = iter(actions)
+        while chunk := list(itertools.islice(actions, chunk_size)):
+            async with session_maker() as session:
+                chunk_results = await self._execute_chunk(chunk, session, in_savepoints=False)
+                if chunk_results is None:
+                    await session.rollback()
+                    chunk_results = await self._execute_chunk(chunk, session, in_savepoints=True)
+
+            results.extend(chunk_results)
+
+        return results
+
+    async def _execute_chunk(
+            self,
+            chunk: list[Command | Query],
+            session: AsyncSession,
+            in_savepoints: bool
+    ) -> list[ExecutionResult] | None:
+        """Results of chunk actions, None - action or commit of chunk without savepoints failed"""
+        uow = _UnitOfWork(session)
+        token = _current_uow.set(uow)
+        try:
+            await self._acquire_connection(session)
+            if in_savepoints:
+                chunk_results = [await self._execute_in_savepoint(action, uow) for action in chunk]
+            else:
+                chunk_results = []
+                for action in chunk:
+                    try:
+                        with self.metrics.measure(action):
+                            result = await self._handle(action, uow)
+                    except Exception:
+                        return None
+                    chunk_results.append(ExecutionResult(action=action, result=result))
+
+            try:
+                await session.commit()
+            except Exception as commit_error:
+                if not in_savepoints:
+                    return None
+                await session.rollback()
+                for chunk_result in chunk_results:
+                    if chunk_result.is_success:
+                        chunk_result.result, chunk_result.error = None, commit_error
+                return chunk_results
+
+            self._invalidate_cache(uow)
+            for chunk_result in chunk_results:
+                if chunk_result.is_success and isinstance(chunk_result.action, Command):
+                    self.replicas.record_write(chunk_result.action, chunk_result.result)
+            return chunk_results
+        finally:
+            _current_uow.reset(token)
+
+    async def _execute_in_savepoint(self, action: Command | Query, uow: _UnitOfWork) -> ExecutionResult:
+        session = uow.session
+        savepoint = await session.begin_nested()
+        try:
+            with self.metrics.measure(action):
+                result = await self._handle(action, uow)
+            if savepoint.is_active:
+                await savepoint.commit()
+            return ExecutionResult(action=action, result=result)
+        except Exception as error:
+            if savepoint.is_active:
+                await savepoint.rollback()
+            else:
+                # handler committed the chunk transaction by itself, savepoint is gone
+                await session.rollback()
+            return ExecutionResult(action=action, error=error)
@@ -0,0 +1,125 @@
+import pickle
+import time
+import typing
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # entries dropped because of size limit or TTL
+    invalidations: int = 0  # entries dropped by tags
+    size: int = 0
+
+
+@dataclass
+class _Entry:
+    snapshot: bytes  # pickled value
+    expires_at: float
+    tags: frozenset[str]
+
+
+class QueryCache:
+    """
+    Size-bounded LRU cache of query results with TTL.
+    Every entry carries dependency tags (e.g. `user:<id>`, `account:<number>`),
+    entries are dropped by tags, which are invalidated by commands.
+
+    `version` is increased by every invalidation: result of query, which was being executed
+    while invalidation happened, may be stale, so it is not stored (see `put`).
+
+    Results are stored as immutable pickled snapshots: every hit gets its own copy of the result, which callers
+    may change, unpickled by C code - several times cheaper than deep copy of entities. Not picklable results
+    are not cached.
+    """
+
+    def __init__(
+            self,
+            maxsize: int = 1024,
+            ttl: float = 30.0,
+            timer: typing.Callable[[], float] = time.monotonic
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = 0
+        self._timer = timer
+        self._entries: OrderedDict[typing.Hashable, _Entry] = OrderedDict()
+        self._keys_by_tag: dict[str, set[typing.Hashable]] = {}
+        self._stats = CacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: typing.Hashable) -> tuple[bool, typing.Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._timer():
+            self._drop(key)
+            self._stats.evictions += 1
+            entry = None
+
+        if entry is None:
+            self._stats.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return True, pickle.loads(entry.snapshot)
+
+    def put(self, key: typing.Hashable, value: typing.Any, tags: typing.Iterable[str], version: int):
+        if not self.enabled or version != self.version:
+            return
+
+        try:
+            snapshot = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+
+        self._drop(key)
+        entry = _Entry(snapshot=snapshot, expires_at=self._timer() + self.ttl, tags=frozenset(tags))
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.maxsize:
+            self._drop(next(iter(self._entries)))
+            self._stats.evictions += 1
+
+    def invalidate(self, tags: typing.Iterable[str] | None):
+        """Drops entries with any of tags, None - drops all entries"""
+        self.version += 1
+        if tags is None:
+            self._stats.invalidations += len(self._entries)
+            self.clear()
+            return
+
+        for tag in set(tags):
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._drop(key)
+                self._stats.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            invalidations=self._stats.invalidations,
+            size=len(self._entries)
+        )
+
+    def _drop(self, key: typing.Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
@@ -1,8 +1,11 @@
 from dependency_injector import providers, containers
 from pydantic_core import MultiHostUrl
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
 
 from core.app import Application
+from core.cache import QueryCache
+from core.metrics import PoolMetrics
+from core.replicas import ReplicaRouter
 from storage.account import AccountSqlalchemyRepository
 from storage.category import CategorySqlAlchemyRepository
 from storage.transaction import TransactionSqlAlchemyRepository
@@ -23,26 +26,86 @@ def dumps(d):
     return json.dumps(d, default=_default)
 
 
-def create_engine_once(db_url: MultiHostUrl):
-    engine = create_async_engine(db_url.unicode_string(), json_serializer=dumps)
+def create_engine(db_url: str, pool_options: dict | None = None) -> AsyncEngine:
+    # options, which are not configured, have SQLAlchemy defaults
+    pool_options = {name: value for name, value in (pool_options or {}).items() if value is not None}
+    statement_cache_size = pool_options.pop('statement_cache_size', None)
+    connect_args = {}
+    if db_url.startswith('postgresql+asyncpg') and statement_cache_size is not None:
+        connect_args['prepared_statement_cache_size'] = statement_cache_size
+
+    return create_async_engine(db_url, json_serializer=dumps, connect_args=connect_args, **pool_options)
+
+
+def create_engine_once(db_url: MultiHostUrl, pool_options: dict | None = None):
+    engine = create_engine(db_url.unicode_string(), pool_options)
     from shared.database import Base
     Base.metadata.bind = engine
     return engine
 
 
+def create_replica_session_factories(
+        db_urls: list[str] | None,
+        pool_options: dict | None = None,
+        pool_metrics: PoolMetrics | None = None
+) -> list[async_sessionmaker]:
+    session_factories = []
+    for db_url in db_urls or ():
+        engine = create_engine(db_url, pool_options)
+        if pool_metrics is not None:
+            pool_metrics.instrument(engine)
+        session_factories.append(async_sessionmaker(bind=engine))
+    return session_factories
+
+
 class Container(containers.DeclarativeContainer):
     __self__ = providers.Self()
 
 
     # Singletons
     config = providers.Configuration()
-    engine = providers.Singleton(create_engine_once, db_url=config.SQLALCHEMY_DATABASE_URI)
+    pool_options = providers.Dict(
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        statement_cache_size=config.DB_STATEMENT_CACHE_SIZE
+    )
+    engine = providers.Singleton(create_engine_once, db_url=config.SQLALCHEMY_DATABASE_URI, pool_options=pool_options)
+    pool_metrics = providers.Singleton(PoolMetrics, engine=engine)
 
     async_session_factory = providers.Singleton(
         async_sessionmaker,
         bind=engine
     )
-    app = providers.Singleton(Application)
+    query_cache = providers.Singleton(
+        QueryCache,
+        maxsize=config.QUERY_CACHE_SIZE,
+        ttl=config.QUERY_CACHE_TTL
+    )
+    replica_session_factories = providers.Singleton(
+        create_replica_session_factories,
+        db_urls=config.SQLALCHEMY_REPLICA_URIS,
+        pool_options=pool_options,
+        pool_metrics=pool_metrics
+    )
+    replica_router = providers.Singleton(
+        ReplicaRouter,
+        session_makers=replica_session_factories,
+        read_your_writes_window=config.READ_YOUR_WRITES_WINDOW
+    )
+    app = providers.Singleton(
+        Application,
+        query_cache=query_cache,
+        replica_router=replica_router,
+        pool_metrics=pool_metrics,
+        container=providers.Callable(
+            lambda container, compiled_wiring: container if compiled_wiring else None,
+            __self__,
+            config.COMPILED_WIRING
+        )
+    )
 
     # Factories
     db_session = providers.Callable(
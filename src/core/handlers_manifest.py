@@ -0,0 +1,36 @@
+# Generated by `python -m core.registry > core/handlers_manifest.py`, do not edit manually:
+# regenerate it after handler of Command or Query is added, renamed or moved.
+
+HANDLERS = {
+    'domain.account.commands.add_transaction.AddCorrectionTransactionDTO': 'domain.account.commands.add_transaction:add_correction_transaction',
+    'domain.account.commands.add_transaction.AddTransactionDTO': 'domain.account.commands.add_transaction:add_transaction_for_user',
+    'domain.account.commands.add_transaction.UpdateAccountBalanceDTO': 'domain.account.commands.add_transaction:update_account_balance',
+    'domain.account.commands.create_account.CreateAccountDTO': 'domain.account.commands.create_account:create_account',
+    'domain.account.commands.delete_account.DeleteAccountDTO': 'domain.account.commands.delete_account:delete_account',
+    'domain.account.commands.share_account_access.ShareAccountAccessDTO': 'domain.account.commands.share_account_access:share_account_access',
+    'domain.account.commands.update_account.UpdateAccountDTO': 'domain.account.commands.update_account:update_account',
+    'domain.account.queries.get_accounts.GetAccountByIdDTO': 'domain.account.queries.get_accounts:get_account_by_id',
+    'domain.account.queries.get_accounts.GetAccountByNumberDTO': 'domain.account.queries.get_accounts:get_account_by_number',
+    'domain.account.queries.get_accounts.GetAllUserAccountsDTO': 'domain.account.queries.get_accounts:get_all_user_accounts',
+    'domain.account.queries.get_balances.GetAccountBalanceAtDTO': 'domain.account.queries.get_balances:get_account_balance_at',
+    'domain.category.commands.create_category.CreateCustomCategoryDTO': 'domain.category.commands.create_category:create_custom_category',
+    'domain.category.commands.create_category.CreateGeneralCategoryDTO': 'domain.category.commands.create_category:create_general_category',
+    'domain.category.commands.delete_category.DeleteCategoryByIdDTO': 'domain.category.commands.delete_category:delete_category',
+    'domain.category.commands.update_category.TestCommandDTO': 'domain.category.commands.update_category:test_handler',
+    'domain.category.commands.update_category.UpdateCategoryDTO': 'domain.category.commands.update_category:update_category',
+    'domain.category.queries.get_categories.GetCategoriesDTO': 'domain.category.queries.get_categories:get_categories',
+    'domain.category.queries.get_categories.GetCategoryByIdDTO': 'domain.category.queries.get_categories:get_category_by_id',
+    'domain.category.queries.get_categories.GetCategoryByNameDTO': 'domain.category.queries.get_categories:get_category_by_name',
+    'domain.transaction.commands.create_transaction.CreateTransactionDTO': 'domain.transaction.commands.create_transaction:create_transaction',
+    'domain.transaction.commands.import_transactions.ImportTransactionsDTO': 'domain.transaction.commands.import_transactions:import_transactions',
+    'domain.transaction.queries.export_txs.ExportTransactionsDTO': 'domain.transaction.queries.export_txs:export_transactions',
+    'domain.transaction.queries.get_statement.GetAccountStatementDTO': 'domain.transaction.queries.get_statement:get_account_statement',
+    'domain.transaction.queries.get_txs.GetAccountTransactionsDTO': 'domain.transaction.queries.get_txs:get_account_transactions',
+    'domain.transaction.queries.get_txs.GetUserTransactionsDTO': 'domain.transaction.queries.get_txs:get_user_transactions',
+    'domain.transaction.queries.get_txs.StreamUserTransactionsDTO': 'domain.transaction.queries.get_txs:stream_user_transactions',
+    'domain.user.commands.create_user.CreateUserDTO': 'domain.user.commands.create_user:create_user',
+    'domain.user.commands.update_user.UpdateUserDTO': 'domain.user.commands.update_user:update_user',
+    'domain.user.queries.get_users.GetUserByNameDTO': 'domain.user.queries.get_users:get_user_by_name',
+    'domain.user.queries.get_users.GetUserDTO': 'domain.user.queries.get_users:get_user_by_id',
+    'domain.user.queries.get_users.GetUsersDTO': 'domain.user.queries.get_users:get_all_users',
+}
@@ -0,0 +1,217 @@
+import bisect
+import contextlib
+import dataclasses
+import logging
+import time
+import typing
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# upper bounds (seconds) of latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+# Samples of actions, which are being executed in the current context (asyncio task):
+# nested action statements are counted for the caller as well
+_current_samples: ContextVar[tuple['ExecutionSample', ...]] = ContextVar('current_samples', default=())
+
+
+@dataclass
+class ExecutionSample:
+    """Single action execution: latency, outcome and DB round trips"""
+    action: str  # action (Command, Query) class name
+    duration: float = 0.0  # seconds
+    error: str | None = None  # exception class name, if action failed
+    statements: int = 0  # SQL statements executed
+    rows: int = 0  # rows returned by queries or affected by DML, as reported by DBAPI rowcount
+
+    @property
+    def is_success(self) -> bool:
+        return self.error is None
+
+
+MetricsSink = typing.Callable[[ExecutionSample], None]
+
+
+@dataclass
+class ActionStats:
+    """Aggregated samples of one action class"""
+    calls: int = 0
+    errors: int = 0
+    statements: int = 0
+    rows: int = 0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    # bucket upper bound -> count of executions with latency in (previous bound, bound]
+    latency_histogram: dict[float, int] = field(default_factory=lambda: dict.fromkeys(LATENCY_BUCKETS, 0))
+
+    @property
+    def mean_duration(self) -> float:
+        return self.total_duration / self.calls if self.calls else 0.0
+
+    @property
+    def statements_per_call(self) -> float:
+        return self.statements / self.calls if self.calls else 0.0
+
+    def add(self, sample: ExecutionSample):
+        self.calls += 1
+        self.errors += 0 if sample.is_success else 1
+        self.statements += sample.statements
+        self.rows += sample.rows
+        self.total_duration += sample.duration
+        self.max_duration = max(self.max_duration, sample.duration)
+        self.latency_histogram[LATENCY_BUCKETS[bisect.bisect_left(LATENCY_BUCKETS, sample.duration)]] += 1
+
+
+class Metrics:
+    """
+    Per-action execution metrics, collected by Application.
+    Every sample is aggregated into ActionStats and passed to sinks (callables), e.g. to export
+    samples to monitoring system. Sink errors are logged and do not affect action execution.
+    """
+
+    def __init__(self, sinks: typing.Iterable[MetricsSink] = ()):
+        self.sinks: list[MetricsSink] = list(sinks)
+        self._stats: dict[str, ActionStats] = defaultdict(ActionStats)
+
+    def add_sink(self, sink: MetricsSink):
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink: MetricsSink):
+        self.sinks.remove(sink)
+
+    @contextlib.contextmanager
+    def measure(self, action, count_statements: bool = True):
+        sample = ExecutionSample(action=type(action).__name__)
+        token = _current_samples.set(_current_samples.get() + (sample,)) if count_statements else None
+        started = time.perf_counter()
+        try:
+            yield sample
+        except GeneratorExit:
+            # streamed result is closed by consumer before it is exhausted
+            raise
+        except BaseException as error:
+            sample.error = type(error).__name__
+            raise
+        finally:
+            sample.duration = time.perf_counter() - started
+            if token is not None:
+                _current_samples.reset(token)
+            self.record(sample)
+
+    def record(self, sample: ExecutionSample):
+        self._stats[sample.action].add(sample)
+        for sink in self.sinks:
+            try:
+                sink(sample)
+            except Exception:
+                logger.exception('Metrics sink %r failed', sink)
+
+    def snapshot(self) -> dict[str, ActionStats]:
+        return {
+            action: dataclasses.replace(stats, latency_histogram=dict(stats.latency_histogram))
+            for action, stats in self._stats.items()
+        }
+
+    def reset(self):
+        self._stats.clear()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    samples = _current_samples.get()
+    if not samples:
+        return
+
+    # DBAPI rowcount: rows produced by SELECT (asyncpg, psycopg read them on execute) or affected by DML.
+    # It is -1, where driver cannot determine it - server-side cursors (streams), SELECT of sqlite, executemany
+    rows = max(cursor.rowcount, 0)
+
+    for sample in samples:
+        sample.statements += 1
+        sample.rows += rows
+
+
+@dataclass
+class PoolStats:
+    """Connection pool usage: where action latency comes from, database or waiting for connection"""
+    checkouts: int = 0
+    in_use: int = 0  # connections checked out at the moment
+    max_in_use: int = 0
+    connects: int = 0  # new DB connections
+    overflow_connects: int = 0  # connections opened above pool size
+    total_connect_time: float = 0.0  # seconds
+    max_connect_time: float = 0.0
+    checkout_waits: int = 0  # connection acquisitions by Application
+    total_checkout_wait: float = 0.0  # seconds, including connect and pre ping of new / stale connections
+    max_checkout_wait: float = 0.0
+
+    @property
+    def mean_connect_time(self) -> float:
+        return self.total_connect_time / self.connects if self.connects else 0.0
+
+    @property
+    def mean_checkout_wait(self) -> float:
+        return self.total_checkout_wait / self.checkout_waits if self.checkout_waits else 0.0
+
+
+class PoolMetrics:
+    """
+    Connection pool metrics, collected by pool events of instrumented engines
+    (checkouts, connections in use, connects and their latency, overflow)
+    and by Application, which measures connection acquisition of every unit of work (checkout wait).
+    """
+
+    def __init__(self, engine: AsyncEngine | Engine | None = None):
+        self._stats = PoolStats()
+        if engine is not None:
+            self.instrument(engine)
+
+    def instrument(self, engine: AsyncEngine | Engine):
+        engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        pool = engine.pool
+
+        @event.listens_for(engine, 'do_connect')
+        def _before_connect(dialect, connection_record, cargs, cparams):
+            connection_record.info['connect_started'] = time.perf_counter()
+
+        @event.listens_for(pool, 'connect')
+        def _connect(dbapi_connection, connection_record):
+            started = connection_record.info.pop('connect_started', None)
+            duration = time.perf_counter() - started if started is not None else 0.0
+            stats = self._stats
+            stats.connects += 1
+            stats.total_connect_time += duration
+            stats.max_connect_time = max(stats.max_connect_time, duration)
+            # QueuePool: count of connections above pool size, including the new one
+            if callable(getattr(pool, 'overflow', None)) and pool.overflow() > 0:
+                stats.overflow_connects += 1
+
+        @event.listens_for(pool, 'checkout')
+        def _checkout(dbapi_connection, connection_record, connection_proxy):
+            stats = self._stats
+            stats.checkouts += 1
+            stats.in_use += 1
+            stats.max_in_use = max(stats.max_in_use, stats.in_use)
+
+        @event.listens_for(pool, 'checkin')
+        def _checkin(dbapi_connection, connection_record):
+            self._stats.in_use -= 1
+
+    def record_checkout_wait(self, duration: float):
+        self._stats.checkout_waits += 1
+        self._stats.total_checkout_wait += duration
+        self._stats.max_checkout_wait = max(self._stats.max_checkout_wait, duration)
+
+    def snapshot(self) -> PoolStats:
+        return dataclasses.replace(self._stats)
+
+    def reset(self):
+        # connections in use are still checked in later
+        self._stats = dataclasses.replace(PoolStats(), in_use=self._stats.in_use, max_in_use=self._stats.in_use)
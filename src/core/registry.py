@@ -0,0 +1,153 @@
+import inspect
+import time
+import typing
+from dataclasses import dataclass
+from importlib import import_module
+
+# packages with handlers of application Commands and Queries,
+# handler of action class is overridden by the following packages
+DOMAIN_MODULES = (
+    'domain.category.commands',
+    'domain.category.queries',
+
+    'domain.user.commands',
+    'domain.user.queries',
+
+    'domain.transaction.commands',
+    'domain.transaction.queries',
+
+    'domain.account.commands',
+    'domain.account.queries',
+)
+
+Handler = typing.Callable[..., typing.Awaitable]
+
+
+@dataclass
+class RegistryStats:
+    build_time: float = 0.0  # seconds, registry creation: manifest copy or handlers introspection
+    import_time: float = 0.0  # seconds, imports of handler modules resolved lazily
+    imported_modules: int = 0
+    resolved_handlers: int = 0
+
+
+def class_path(cls: type) -> str:
+    return f'{cls.__module__}.{cls.__qualname__}'
+
+
+def handler_path(handler: Handler) -> str:
+    return f'{handler.__module__}:{handler.__qualname__}'
+
+
+def get_action_class(handler: Handler) -> type | None:
+    """Action class of handler - type of its `command` or `query` parameter"""
+    params_with_types = typing.get_type_hints(handler)
+    return params_with_types.get('command') or params_with_types.get('query')
+
+
+def introspect(modules: typing.Iterable[str] = DOMAIN_MODULES) -> dict[type, Handler]:
+    """Imports all modules and finds handlers among their functions"""
+    handlers = dict()
+    for module_name in modules:
+        module = import_module(module_name)
+        for _, handler in inspect.getmembers(module, inspect.isfunction):
+            action_class = get_action_class(handler)
+            if action_class:
+                handlers[action_class] = handler
+
+    return handlers
+
+
+def build_manifest(modules: typing.Iterable[str] = DOMAIN_MODULES) -> dict[str, str]:
+    """Action class path -> handler path (`module:function`) of all handlers found by introspection"""
+    return {
+        class_path(action_class): handler_path(handler)
+        for action_class, handler in sorted(introspect(modules).items(), key=lambda item: class_path(item[0]))
+    }
+
+
+class HandlerRegistry:
+    """
+    Handlers of application actions by action class.
+
+    Registry, built from manifest (action class path -> handler path, see core.handlers_manifest),
+    imports module of handler on the first dispatch of its action, warm_up() imports all of them.
+    Without manifest handlers of DOMAIN_MODULES are introspected eagerly.
+
+    Manifest is regenerated by `python -m core.registry > core/handlers_manifest.py`.
+    """
+
+    def __init__(
+            self,
+            manifest: typing.Mapping[str, str] | None = None,
+            modules: typing.Iterable[str] = DOMAIN_MODULES
+    ):
+        started = time.perf_counter()
+        self._manifest = dict(manifest) if manifest is not None else {}
+        self._handlers: dict[type, Handler] = introspect(modules) if manifest is None else {}
+        self._imported_modules: set[str] = set()
+        self._stats = RegistryStats(resolved_handlers=len(self._handlers))
+        self._stats.build_time = time.perf_counter() - started
+
+    def __getitem__(self, action_class: type) -> Handler:
+        handler = self._handlers.get(action_class)
+        if handler is None:
+            handler = self._resolve(action_class)
+        return handler
+
+    def __setitem__(self, action_class: type, handler: Handler):
+        self._handlers[action_class] = handler
+
+    def __contains__(self, action_class: type) -> bool:
+        return action_class in self._handlers or class_path(action_class) in self._manifest
+
+    def pop(self, action_class: type, *default):
+        return self._handlers.pop(action_class, *default)
+
+    def warm_up(self) -> RegistryStats:
+        """Imports all handlers of manifest, e.g. before worker starts taking requests"""
+        for path in self._manifest:
+            module_name, _, class_name = path.rpartition('.')
+            self[self._import(module_name, class_name)]
+        return self.stats()
+
+    def stats(self) -> RegistryStats:
+        return RegistryStats(
+            build_time=self._stats.build_time,
+            import_time=self._stats.import_time,
+            imported_modules=len(self._imported_modules),
+            resolved_handlers=len(self._handlers)
+        )
+
+    def _resolve(self, action_class: type) -> Handler:
+        path = self._manifest.get(class_path(action_class))
+        if path is None:
+            raise KeyError(action_class)
+
+        module_name, _, function_name = path.partition(':')
+        handler = self._import(module_name, function_name)
+        self._handlers[action_class] = handler
+        return handler
+
+    def _import(self, module_name: str, name: str):
+        started = time.perf_counter()
+        module = import_module(module_name)
+        self._stats.import_time += time.perf_counter() - started
+        self._imported_modules.add(module_name)
+        return getattr(module, name)
+
+
+def render_manifest(manifest: typing.Mapping[str, str]) -> str:
+    lines = [
+        '# Generated by `python -m core.registry > core/handlers_manifest.py`, do not edit manually:',
+        '# regenerate it after handler of Command or Query is added, renamed or moved.',
+        '',
+        'HANDLERS = {',
+        *(f"    '{action}': '{handler}'," for action, handler in manifest.items()),
+        '}',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == '__main__':
+    print(render_manifest(build_manifest()), end='')
@@ -0,0 +1,82 @@
+import itertools
+import time
+import typing
+import uuid
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from shared.interfaces import Command, Query
+
+
+class ReplicaRouter:
+    """
+    Routes queries to read replicas: every query gets session maker of the next replica (round robin).
+
+    Read your writes: after a command is committed, queries of users it affects (Command.affected_user_ids)
+    are sent to the primary during `read_your_writes_window` seconds, while replicas catch up with the change.
+    Queries, which do not know their users in advance (Query.affected_user_ids is None), are sent to the primary
+    while any command is within the window.
+    Without replicas all actions use the primary.
+    """
+
+    def __init__(
+            self,
+            session_makers: typing.Iterable[async_sessionmaker] = (),
+            read_your_writes_window: float = 5.0,
+            timer: typing.Callable[[], float] = time.monotonic
+    ):
+        self.session_makers = list(session_makers)
+        self.read_your_writes_window = read_your_writes_window
+        self._timer = timer
+        self._replicas = itertools.cycle(self.session_makers)
+        # user id -> moment, until which user reads from the primary
+        self._pinned_until: dict[uuid.UUID, float] = {}
+        # moment, until which replicas may not have the last committed change
+        self._lagging_until = float('-inf')
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.session_makers)
+
+    def session_maker_for(self, action: Command | Query, primary: async_sessionmaker) -> async_sessionmaker:
+        if not self.enabled or not isinstance(action, Query):
+            return primary
+
+        user_ids = action.affected_user_ids()
+        if user_ids is None:
+            is_pinned = self.may_lag()
+        else:
+            is_pinned = any(self.is_pinned(user_id) for user_id in user_ids)
+        return primary if is_pinned else next(self._replicas)
+
+    def record_write(self, action: Command, result=None):
+        if not self.enabled or self.read_your_writes_window <= 0:
+            return
+
+        now = self._timer()
+        self._lagging_until = now + self.read_your_writes_window
+        for user_id in action.affected_user_ids(result):
+            # window length is the same for all users: pins are ordered by expiration, expired ones are in front
+            self._pinned_until.pop(user_id, None)
+            self._pinned_until[user_id] = self._lagging_until
+        while self._pinned_until:
+            pinned_user_id, pinned_until = next(iter(self._pinned_until.items()))
+            if pinned_until > now:
+                break
+            del self._pinned_until[pinned_user_id]
+
+    def may_lag(self) -> bool:
+        """Replicas may not have the last committed change yet: it was committed within the window"""
+        return self._lagging_until > self._timer()
+
+    def is_pinned(self, user_id: uuid.UUID | None) -> bool:
+        if user_id is None:
+            return False
+
+        pinned_until = self._pinned_until.get(user_id)
+        if pinned_until is None:
+            return False
+        if pinned_until <= self._timer():
+            del self._pinned_until[user_id]
+            return False
+        return True
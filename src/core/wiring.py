@@ -0,0 +1,99 @@
+import inspect
+import typing
+
+from dependency_injector import containers, providers
+from dependency_injector.wiring import Provide
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.repositories import SqlAlchemyRepository
+
+
+class RepositoryPool:
+    """
+    Repositories bound to session: every repository provider is called once per session,
+    so actions of one unit of work (nested actions, execute_many chunk) share repository objects.
+    Lives in `session.info`.
+    """
+    INFO_KEY = 'repositories'
+
+    @classmethod
+    def get(cls, session: AsyncSession, name: str, provider: providers.Provider) -> SqlAlchemyRepository:
+        repositories = session.info.get(cls.INFO_KEY)
+        if repositories is None:
+            repositories = session.info[cls.INFO_KEY] = {}
+
+        repository = repositories.get(name)
+        if repository is None:
+            repository = repositories[name] = provider()
+            repository.session = session
+        return repository
+
+
+class CompiledHandler:
+    """
+    Handler, which dependencies (Provide markers of its parameters) are resolved once, at compilation:
+     - repositories (factories of SqlAlchemyRepository) - taken from RepositoryPool of session
+     - singletons, objects - provided once
+     - other providers - called on every call, as @inject does
+    """
+    __slots__ = ('function', 'values', 'repositories', 'factories')
+
+    def __init__(
+            self,
+            function: typing.Callable[..., typing.Awaitable],
+            values: dict[str, typing.Any],
+            repositories: dict[str, tuple[str, providers.Provider]],  # parameter -> (pool key, provider)
+            factories: dict[str, providers.Provider]
+    ):
+        self.function = function
+        self.values = values
+        self.repositories = repositories
+        self.factories = factories
+
+    def __call__(self, action, session: AsyncSession) -> typing.Awaitable:
+        kwargs = dict(self.values)
+        for name, (key, provider) in self.repositories.items():
+            kwargs[name] = RepositoryPool.get(session, key, provider)
+        for name, provider in self.factories.items():
+            kwargs[name] = provider()
+        return self.function(action, session, **kwargs)
+
+
+def compile_handler(handler: typing.Callable, container: containers.Container) -> typing.Callable:
+    """
+    Compiled handler, which gets dependencies from container without @inject resolution on every call.
+    Handler is returned as is, if any of its markers cannot be compiled (markers with modifiers,
+    Closing, providers which are not attributes of container, not coroutine functions).
+    """
+    function = inspect.unwrap(handler)
+    if not inspect.iscoroutinefunction(function):
+        return handler
+
+    # markers refer to providers of declarative container class, dependencies are provided by container instance
+    declarative_container = getattr(container, 'declarative_parent', None) or container
+    container_providers = {provider: name for name, provider in declarative_container.providers.items()}
+    values, repositories, factories = {}, {}, {}
+    for name, parameter in inspect.signature(function).parameters.items():
+        marker = parameter.default
+        if not isinstance(marker, Provide):
+            continue
+        if type(marker) is not Provide or marker.modifier is not None:
+            return handler
+
+        provider_name = marker.provider if isinstance(marker.provider, str) \
+            else container_providers.get(marker.provider)
+        provider = container.providers.get(provider_name)
+        if provider is None:
+            return handler
+
+        if provider.overridden:
+            factories[name] = provider
+        elif isinstance(provider, providers.Factory) and isinstance(provider.cls, type) \
+                and issubclass(provider.cls, SqlAlchemyRepository):
+            repositories[name] = (provider_name, provider)
+        elif isinstance(provider, (providers.Singleton, providers.Object)):
+            values[name] = provider()
+        else:
+            factories[name] = provider
+
+    return CompiledHandler(function, values, repositories, factories)
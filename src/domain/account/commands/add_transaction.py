@@ -1,6 +1,5 @@
 import uuid
 from dataclasses import dataclass
-from decimal import Decimal
 
 from dependency_injector.wiring import inject, Provide
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,6 +11,9 @@ from domain.account.repositories import AccountRepository
 
 from domain.transaction.commands import CreateTransactionDTO
 from domain.transaction.entities import TransactionType
+from shared import tags
+from shared.interfaces import Command
+from shared.money import Money
 
 
 @dataclass
@@ -28,6 +30,7 @@ async def add_transaction_for_user(
 ):
     assert isinstance(command, AddTransactionDTO)
 
+    # account balances are updated by transaction creation, in the same DB transaction
     tx = await app.execute(
         CreateTransactionDTO(
             user_id=command.user_id,
@@ -39,27 +42,19 @@ async def add_transaction_for_user(
         session_maker
     )
 
-    if command.credit_account:
-        await app.execute(
-            UpdateAccountBalanceDTO(command.user_id, command.credit_account),
-            session_maker
-        )
-
-    if command.debit_account:
-        await app.execute(
-            UpdateAccountBalanceDTO(command.user_id, command.debit_account),
-            session_maker
-        )
-
     return tx
 
 
 @dataclass
-class AddCorrectionTransactionDTO:
+class AddCorrectionTransactionDTO(Command):
     user_id: uuid.UUID
     account_number: AccountNumber
-    current_balance: Decimal
-    new_balance: Decimal
+    current_balance: Money
+    new_balance: Money
+
+    def invalidates(self, result):
+        # changes are made by nested CreateTransactionDTO
+        return ()
 
 
 @inject
@@ -74,7 +69,7 @@ async def add_correction_transaction(
     balance_delta = command.new_balance - command.current_balance
 
     debit_account, credit_account = None, None
-    if balance_delta < Decimal(0.00):
+    if balance_delta < Money.ZERO:
         # balances decreases
         credit_account = command.account_number
     else:
@@ -92,19 +87,17 @@ async def add_correction_transaction(
         session_maker
     )
 
-    await app.execute(
-        UpdateAccountBalanceDTO(command.user_id, command.account_number),
-        session_maker
-    )
-
     return tx
 
 
 @dataclass
-class UpdateAccountBalanceDTO:
+class UpdateAccountBalanceDTO(Command):
     user_id: uuid.UUID
     account_number: AccountNumber
 
+    def invalidates(self, result):
+        return [tags.account(self.account_number)]
+
 
 @inject
 async def update_account_balance(
@@ -112,14 +105,15 @@ async def update_account_balance(
         session: AsyncSession,
         account_repo: AccountRepository = Provide[Container.account_repo]
 ):
+    # Verification mode: balance is maintained incrementally on every transaction,
+    # here it is recomputed from the whole account history and fixed, if it drifted
     account_repo.session = session
 
     account = await account_repo.get_by_number(command.account_number, command.user_id)
-    balance_delta = await account_repo.calculate_balance(account.id)
+    balance = await account_repo.calculate_balance(account.id)
 
-    # if balance changes since last calculation
-    if balance_delta != Decimal(0.00):
-        account.balance = account.balance + balance_delta
+    if balance != account.balance:
+        account.balance = balance
 
         await account_repo.update_balance(account)
 
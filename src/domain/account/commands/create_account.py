@@ -14,14 +14,19 @@ from domain.account.entities import Account
 from domain.account.repositories import AccountRepository
 from domain.user.repositories import UserRepository
 from shared.exceptions import IncorrectData
+from shared import tags
 from shared.interfaces import Command
+from shared.money import Money
 
 
 @dataclass
 class CreateAccountDTO(Command):
     user_id: uuid.UUID
     name: None | str
-    balance: Decimal | float = Decimal(0.00)
+    balance: Money | Decimal | float = Money.ZERO
+
+    def invalidates(self, result):
+        return [tags.user(self.user_id), tags.account(result.number)]
 
 
 @inject
@@ -39,14 +44,13 @@ async def create_account(
     # check user exists
     user = await user_repo.get_by_id(command.user_id)
 
-    command.balance = command.balance if isinstance(command.balance, Decimal) \
-        else Decimal(command.balance).quantize(Decimal('0.01'))
+    command.balance = Money.from_decimal(command.balance)
 
     # create account
-    if command.balance < Decimal(0.00):
+    if command.balance < Money.ZERO:
         raise IncorrectData(INCORRECT_BALANCE__MSG)
 
-    init_balance = Decimal(0.00)
+    init_balance = Money.ZERO
     new_account = Account(
         id=Account.next_id(),
         owner_id=user.id,
@@ -1,6 +1,5 @@
 import uuid
 from dataclasses import dataclass
-from decimal import Decimal
 
 from dependency_injector.wiring import inject, Provide
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,7 +8,9 @@ from core.dependencies import Container
 from domain.account.entities import AccountNumber
 from domain.account.repositories import AccountRepository
 from shared.exceptions import EntityNotFoundException, ThisActionIsForbidden
+from shared import tags
 from shared.interfaces import Command
+from shared.money import Money
 
 
 @dataclass
@@ -17,6 +18,10 @@ class DeleteAccountDTO(Command):
     user_id: uuid.UUID
     account_number: AccountNumber
 
+    def invalidates(self, result):
+        # transactions of deleted account disappear from transactions of users with access to it
+        return [tags.account(self.account_number)]
+
 
 @inject
 async def delete_account(
@@ -28,7 +33,7 @@ async def delete_account(
 
     account = await account_repo.get_by_number(command.account_number, command.user_id)
 
-    if account.balance != Decimal(0.00):
+    if account.balance != Money.ZERO:
         raise ThisActionIsForbidden(f'Balance is {account.balance}. Transfer all account balance to other accounts.')
 
     await account_repo.remove(account)
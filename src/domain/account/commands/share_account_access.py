@@ -9,6 +9,7 @@ from domain.account.entities import AccountNumber
 from domain.account.repositories import AccountRepository
 from domain.user.repositories import UserRepository
 from shared.exceptions import IncorrectData
+from shared import tags
 from shared.interfaces import Command
 
 
@@ -18,6 +19,12 @@ class ShareAccountAccessDTO(Command):
     account_owner_id: uuid.UUID
     share_access_with_id: uuid.UUID
 
+    def invalidates(self, result):
+        return [tags.user(self.share_access_with_id), tags.account(self.account_number)]
+
+    def affected_user_ids(self, result):
+        return [self.account_owner_id, self.share_access_with_id]
+
 
 @inject
 async def share_account_access(
@@ -33,8 +40,7 @@ async def share_account_access(
     account_accessor = await user_repo.get_by_id(command.share_access_with_id)
 
     # check account already accessed by target user
-    target_user_accounts = await account_repo.get_all__user(command.share_access_with_id)
-    if command.account_number in [account.number for account in target_user_accounts]:
+    if await account_repo.is_accessible(command.account_number, command.share_access_with_id):
         raise IncorrectData(message='This account already accessed by User.')
 
     # share access
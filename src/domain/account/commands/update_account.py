@@ -12,7 +12,9 @@ from domain.account.entities import AccountNumber
 from domain.account.repositories import AccountRepository
 
 from shared.exceptions import EntityNotFoundException, IncorrectData
+from shared import tags
 from shared.interfaces import Command
+from shared.money import Money
 
 
 @dataclass
@@ -20,7 +22,10 @@ class UpdateAccountDTO(Command):
     user_id: uuid.UUID
     account_number: AccountNumber
     name: None | str
-    balance: None | Decimal
+    balance: None | Money | Decimal
+
+    def invalidates(self, result):
+        return [tags.account(self.account_number)]
 
 
 @inject
@@ -39,15 +44,16 @@ async def update_account(
         account.name = command.name
         await account_repo.update(account)
 
-    if command.balance and command.balance != account.balance:
-        if command.balance < Decimal(0.00):
+    new_balance = Money.from_decimal(command.balance) if command.balance else None
+    if new_balance and new_balance != account.balance:
+        if new_balance < Money.ZERO:
             raise IncorrectData(INCORRECT_BALANCE__MSG)
 
         await app.execute(
             AddCorrectionTransactionDTO(
                 user_id=command.user_id,
                 account_number=command.account_number,
-                new_balance=command.balance,
+                new_balance=new_balance,
                 current_balance=account.balance
             ),
             session_maker
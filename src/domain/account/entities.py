@@ -1,31 +1,43 @@
 import uuid
-from dataclasses import dataclass, field
-from decimal import Decimal
+from dataclasses import dataclass
 from random import random, choices
 from typing import TypeVar
 
-from shared.entities import Entity
+from shared.entities import Entity, Quantized
+from shared.money import Money
 
 AccountNumber: TypeVar = TypeVar('AccountNumber', bound=str)
 ACCOUNT_NUMBER_LENGTH = 16
 
 
-@dataclass
+@dataclass(slots=True)
 class Account(Entity):
     name: None | str
     number: AccountNumber
     owner_id: uuid.UUID
-    balance: Decimal | float
-    _balance: Decimal = field(init=False, repr=False)
+    balance: Money  # numbers are quantized to cents on assignment
 
     @classmethod
     def generate_number(cls) -> AccountNumber:
         return ''.join(choices('0123456789', k=ACCOUNT_NUMBER_LENGTH))
 
-    @property
-    def balance(self):
-        return self._balance
+    @classmethod
+    def trusted(
+            cls,
+            id: uuid.UUID,
+            name: None | str,
+            number: AccountNumber,
+            owner_id: uuid.UUID,
+            balance: Money
+    ) -> 'Account':
+        """Account from trusted values, e.g. database row: balance is Money already"""
+        account = object.__new__(cls)
+        account.id = id
+        account.name = name
+        account.number = number
+        account.owner_id = owner_id
+        cls.balance.set_trusted(account, balance)
+        return account
+
 
-    @balance.setter
-    def balance(self, value: float | Decimal):
-        self._balance = Decimal(value).quantize(Decimal('.01'))
+Account.balance = Quantized(Account.balance)
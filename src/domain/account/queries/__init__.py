@@ -5,4 +5,8 @@ from .get_accounts import (
     GetAccountByIdDTO,
     GetAccountByNumberDTO,
     GetAllUserAccountsDTO
+)
+from .get_balances import (
+    get_account_balance_at,
+    GetAccountBalanceAtDTO
 )
\ No newline at end of file
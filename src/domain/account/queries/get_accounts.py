@@ -8,6 +8,7 @@ from core.dependencies import Container
 from domain.account.entities import AccountNumber
 from domain.account.repositories import AccountRepository
 from shared.exceptions import EntityNotFoundException
+from shared import tags
 from shared.interfaces import Query
 
 
@@ -16,6 +17,9 @@ class GetAccountByIdDTO(Query):
     user_id: uuid.UUID
     account_id: uuid.UUID
 
+    def cache_tags(self, result):
+        return [tags.account(result.number)]
+
 
 @inject
 async def get_account_by_id(
@@ -35,6 +39,9 @@ class GetAccountByNumberDTO(Query):
     user_id: uuid.UUID
     account_number: str
 
+    def cache_tags(self, result):
+        return [tags.account(self.account_number)]
+
 
 @inject
 async def get_account_by_number(
@@ -53,6 +60,9 @@ async def get_account_by_number(
 class GetAllUserAccountsDTO(Query):
     user_id: uuid.UUID
 
+    def cache_tags(self, result):
+        return [tags.user(self.user_id), *(tags.account(account.number) for account in result)]
+
 
 @inject
 async def get_all_user_accounts(
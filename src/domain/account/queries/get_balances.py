@@ -0,0 +1,37 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from dependency_injector.wiring import Provide, inject
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.dependencies import Container
+from domain.account.entities import AccountNumber
+from domain.account.repositories import AccountRepository
+from shared import tags
+from shared.interfaces import Query
+
+
+@dataclass
+class GetAccountBalanceAtDTO(Query):
+    user_id: uuid.UUID
+    account_number: AccountNumber
+    at: datetime
+
+    def cache_tags(self, result):
+        return [tags.account(self.account_number)]
+
+
+@inject
+async def get_account_balance_at(
+        query: GetAccountBalanceAtDTO,
+        session: AsyncSession,
+        account_repo: AccountRepository = Provide[Container.account_repo]
+):
+    account_repo.session = session
+
+    account = await account_repo.get_by_number(query.account_number, query.user_id)
+
+    balance = await account_repo.get_balance_at(account, query.at)
+
+    return balance
@@ -1,7 +1,8 @@
 import uuid
-from decimal import Decimal
+from datetime import datetime
 
 from domain.account.entities import Account
+from shared.money import Money
 from shared.repositories import Repository
 
 
@@ -9,6 +10,9 @@ class AccountRepository(Repository):
     async def share_access(self, account_id: uuid.UUID, user_id: uuid.UUID):
         raise NotImplementedError
 
+    async def is_accessible(self, number: str, user_id: uuid.UUID) -> bool:
+        raise NotImplementedError
+
     async def get_all__user(self, user_id: uuid.UUID) -> list[Account]:
         raise NotImplementedError
 
@@ -18,6 +22,15 @@ class AccountRepository(Repository):
     async def update_balance(self, account: Account):
         raise NotImplementedError
 
+    async def apply_balance_delta(self, account_id: uuid.UUID, delta: Money, at: datetime | None = None) -> Money:
+        raise NotImplementedError
+
+    async def shift_balance_checkpoints(self, account_id: uuid.UUID, deltas: list[tuple[datetime, Money]]):
+        raise NotImplementedError
+
+    async def get_balance_at(self, account: Account, at: datetime) -> Money:
+        raise NotImplementedError
+
     async def get_by_number(self, number: str, user_id: uuid.UUID):
         raise NotImplementedError
 
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.dependencies import Container
 from domain.category.entities import Category
 from domain.category.repositories import CategoryRepository
+from shared import tags
 from shared.interfaces import Command
 
 
@@ -14,6 +15,9 @@ from shared.interfaces import Command
 class CreateGeneralCategoryDTO(Command):
     name: str
 
+    def invalidates(self, result):
+        return [tags.GENERAL_CATEGORIES]
+
 
 @inject
 async def create_general_category(
@@ -41,6 +45,9 @@ async def create_general_category(
 class CreateCustomCategoryDTO(CreateGeneralCategoryDTO):
     user_id: uuid.UUID
 
+    def invalidates(self, result):
+        return [tags.user(self.user_id)]
+
 
 @inject
 async def create_custom_category(
@@ -11,7 +11,7 @@ from shared.interfaces import Command
 
 
 @dataclass
-class UpdateCategoryDTO:
+class UpdateCategoryDTO(Command):
     id: uuid.UUID
     user_id: uuid.UUID
     name: str | None = None
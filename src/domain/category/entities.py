@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from shared.entities import Entity
 
 
-@dataclass
+@dataclass(slots=True)
 class Category(Entity):
     name: str
     user_id: uuid.UUID | None
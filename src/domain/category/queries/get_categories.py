@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.dependencies import Container
 from domain.category.repositories import CategoryRepository
 from shared.exceptions import EntityNotFoundException
+from shared import tags
 from shared.interfaces import Query
 
 
@@ -15,6 +16,9 @@ class GetCategoryByIdDTO(Query):
     id: uuid.UUID
     user_id: uuid.UUID
 
+    def cache_tags(self, result):
+        return [tags.user(self.user_id), tags.GENERAL_CATEGORIES]
+
 
 @inject
 async def get_category_by_id(
@@ -37,6 +41,9 @@ class GetCategoryByNameDTO(Query):
     name: str
     user_id: uuid.UUID
 
+    def cache_tags(self, result):
+        return [tags.user(self.user_id), tags.GENERAL_CATEGORIES]
+
 
 @inject
 async def get_category_by_name(
@@ -60,6 +67,9 @@ class GetCategoriesDTO(Query):
 
     with_general: bool = True
 
+    def cache_tags(self, result):
+        return [tags.user(self.user_id), *([tags.GENERAL_CATEGORIES] if self.with_general else [])]
+
 
 @inject
 async def get_categories(
@@ -1,4 +1,8 @@
 from .create_transaction import (
     CreateTransactionDTO,
     create_transaction
-)
\ No newline at end of file
+)
+from .import_transactions import (
+    ImportTransactionsDTO,
+    import_transactions
+)
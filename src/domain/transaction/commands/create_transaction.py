@@ -9,11 +9,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.dependencies import Container
 from domain.account.entities import AccountNumber
 from domain.account.repositories import AccountRepository
-from domain.category.entities import Category
-from domain.category.repositories import CategoryRepository
 from domain.transaction.entities import Transaction, TransactionType
+from domain.transaction.repositories import TransactionRepository
 from shared.exceptions import EntityNotFoundException, IncorrectData
+from shared import tags
 from shared.interfaces import Command
+from shared.money import Money
 
 
 @dataclass
@@ -21,34 +22,42 @@ class CreateTransactionDTO(Command):
     user_id: uuid.UUID
     credit_account: AccountNumber | None
     debit_account: AccountNumber | None
-    amount: int | float | Decimal
+    amount: int | float | Decimal | Money
     commited_on: datetime | None = None # For adding trx backdated
     category_id: uuid.UUID | None = None
     type: None | TransactionType = None
 
+    def invalidates(self, result):
+        # listings of all users with access to participant accounts are tagged with account tags
+        return [tags.account(number) for number in (result.credit_account, result.debit_account) if number]
+
 
 @inject
 async def create_transaction(
         command: CreateTransactionDTO,
         session: AsyncSession,
-        tx_repo=Provide[Container.tx_repo],
-        account_repo:AccountRepository=Provide[Container.account_repo],
-        category_repo: CategoryRepository=Provide[Container.category_repo]
+        tx_repo: TransactionRepository = Provide[Container.tx_repo],
+        account_repo: AccountRepository = Provide[Container.account_repo]
 ):
     account_repo.session = session
     tx_repo.session = session
-    category_repo.session = session
 
     command.commited_on = command.commited_on if command.commited_on else datetime.utcnow()
 
+    # accounts and category are validated by one query
+    participants = await tx_repo.get_participants(
+        command.user_id,
+        [command.debit_account, command.credit_account],
+        command.category_id
+    )
+
     category = None
     if command.category_id:
-        category = await category_repo.get_by_id(command.category_id)
-        if not category.is_available_for_user(command.user_id):
+        category = participants.category
+        if category is None or not category.is_available_for_user(command.user_id):
             raise EntityNotFoundException(command.category_id)
 
-    command.amount = command.amount if isinstance(command.amount, Decimal) \
-        else Decimal(command.amount).quantize(Decimal('0.01'))
+    command.amount = Money.from_decimal(command.amount)
 
     if command.debit_account is None and command.credit_account is None:
         raise IncorrectData('Credit and Debit accounts cannot Null')
@@ -58,9 +67,9 @@ async def create_transaction(
 
     credit_account, debit_account = None, None
     if command.debit_account:
-        debit_account = await account_repo.get_by_number(command.debit_account, command.user_id)
+        debit_account = participants.get_account(command.debit_account)
     if command.credit_account:
-        credit_account = await account_repo.get_by_number(command.credit_account, command.user_id)
+        credit_account = participants.get_account(command.credit_account)
 
     if credit_account and credit_account.owner_id != command.user_id \
             or debit_account and debit_account.owner_id != command.user_id:
@@ -72,12 +81,7 @@ async def create_transaction(
         raise IncorrectData(f'User tries to transfer from {command.amount} from account with balance {credit_account.balance}')
 
     if not command.type:
-        if credit_account and debit_account:
-            command.type = TransactionType.TRANSFER
-        elif debit_account:
-            command.type = TransactionType.INCOME
-        else:
-            command.type = TransactionType.EXPENSE
+        command.type = TransactionType.for_accounts(credit_account, debit_account)
 
     tx = Transaction(
         id=Transaction.next_id(),
@@ -86,11 +90,21 @@ async def create_transaction(
         amount=command.amount,
         user_id=command.user_id,
         type=command.type,
-        category_id=category.id if category else None
+        category_id=category.id if category else None,
+        created_at=datetime.utcnow()
     )
 
     await tx_repo.add(tx)
 
+    # balances are maintained incrementally, in the same DB transaction as the transaction itself
+    if credit_account:
+        credit_account.balance = await account_repo.apply_balance_delta(credit_account.id, -tx.amount, tx.created_at)
+        if credit_account.balance < Money.ZERO:
+            # concurrent transaction has spent account money since balance check
+            raise IncorrectData(f'Not enough money on account {credit_account.number} for transfer of {tx.amount}')
+    if debit_account:
+        debit_account.balance = await account_repo.apply_balance_delta(debit_account.id, tx.amount, tx.created_at)
+
     return tx
 
 
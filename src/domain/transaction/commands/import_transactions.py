@@ -0,0 +1,176 @@
+import contextlib
+import csv
+import itertools
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import TextIO
+
+from dependency_injector.wiring import inject, Provide
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.dependencies import Container
+from domain.account.entities import Account, AccountNumber
+from domain.account.repositories import AccountRepository
+from domain.category.entities import Category
+from domain.category.repositories import CategoryRepository
+from domain.transaction.entities import Transaction, TransactionType, ImportResult, RejectedRow
+from domain.transaction.repositories import TransactionRepository
+from shared.exceptions import IncorrectData
+from shared.interfaces import Command
+from shared.money import Money
+
+
+MAX_AMOUNT = Decimal('1e12')  # transaction amount column is Numeric(14, 2)
+
+
+@dataclass
+class ImportTransactionsDTO(Command):
+    """
+    Transactions import from CSV file with header row. Columns:
+     - credit_account, debit_account - account numbers, one of them can be empty
+     - amount
+     - category - category name, optional
+     - created_at - ISO date/datetime, optional, import time if empty
+    """
+    user_id: uuid.UUID
+    file: str | Path | TextIO
+    batch_size: int = 1000  # rows inserted with one statement
+
+
+@inject
+async def import_transactions(
+        command: ImportTransactionsDTO,
+        session: AsyncSession,
+        tx_repo: TransactionRepository = Provide[Container.tx_repo],
+        account_repo: AccountRepository = Provide[Container.account_repo],
+        category_repo: CategoryRepository = Provide[Container.category_repo]
+) -> ImportResult:
+    tx_repo.session = session
+    account_repo.session = session
+    category_repo.session = session
+
+    if command.batch_size < 1:
+        raise IncorrectData('Batch size should be positive.')
+
+    # accounts and categories are resolved once for the whole file
+    accounts = {
+        account.number: account
+        for account in await account_repo.get_all__user(command.user_id)
+        if account.owner_id == command.user_id
+    }
+    categories = {
+        # custom category of user overrides general one with the same name
+        category.name: category
+        for category in sorted(
+            await category_repo.get_categories(command.user_id),
+            key=lambda category: category.user_id is not None
+        )
+    }
+
+    account_ids = {number: account.id for number, account in accounts.items()}
+
+    imported_at = datetime.utcnow()
+    balances = {number: account.balance for number, account in accounts.items()}
+    balance_deltas: dict[AccountNumber, list[tuple[datetime, Money]]] = defaultdict(list)
+    result = ImportResult()
+
+    with _open_csv(command.file) as csv_file:
+        rows = enumerate(csv.DictReader(csv_file), start=2)
+        while batch := list(itertools.islice(rows, command.batch_size)):
+            txs = []
+            for line, row in batch:
+                try:
+                    tx = _row_to_transaction(row, command.user_id, accounts, categories, imported_at)
+                    if tx.credit_account and balances[tx.credit_account] < tx.amount:
+                        raise IncorrectData(
+                            f'Not enough money on account {tx.credit_account} for transfer of {tx.amount}'
+                        )
+                except IncorrectData as error:
+                    result.rejected.append(RejectedRow(line=line, reason=str(error)))
+                    continue
+
+                for account_number, delta in ((tx.credit_account, -tx.amount), (tx.debit_account, tx.amount)):
+                    if account_number:
+                        balances[account_number] += delta
+                        balance_deltas[account_number].append((tx.created_at, delta))
+                txs.append(tx)
+
+            await tx_repo.add_many(txs, account_ids)
+            result.imported += len(txs)
+
+    # every touched account balance is updated once, by the total delta of imported transactions
+    for account_number, deltas in balance_deltas.items():
+        account = accounts[account_number]
+        await account_repo.shift_balance_checkpoints(account.id, deltas)
+        balance = await account_repo.apply_balance_delta(account.id, Money.sum(delta for _, delta in deltas), imported_at)
+        if balance < Money.ZERO:
+            # concurrent transaction has spent account money during import
+            raise IncorrectData(f'Not enough money on account {account_number} for imported transactions')
+
+    return result
+
+
+def _open_csv(file: str | Path | TextIO):
+    if isinstance(file, (str, Path)):
+        return open(file, newline='')
+    return contextlib.nullcontext(file)
+
+
+def _row_to_transaction(
+        row: dict[str, str],
+        user_id: uuid.UUID,
+        accounts: dict[AccountNumber, Account],
+        categories: dict[str, Category],
+        imported_at: datetime
+) -> Transaction:
+    credit_account = (row.get('credit_account') or '').strip() or None
+    debit_account = (row.get('debit_account') or '').strip() or None
+
+    if debit_account is None and credit_account is None:
+        raise IncorrectData('Credit and Debit accounts cannot Null')
+    if debit_account == credit_account:
+        raise IncorrectData('Credit and Debit accounts cannot be the same.')
+    for account_number in (credit_account, debit_account):
+        if account_number and account_number not in accounts:
+            raise IncorrectData(f'Account {account_number} not found.')
+
+    try:
+        amount = Decimal((row.get('amount') or '').strip()).quantize(Decimal('0.01'))
+        is_correct_amount = Decimal(0.00) < amount < MAX_AMOUNT
+    except InvalidOperation:
+        is_correct_amount = False
+    if not is_correct_amount:
+        raise IncorrectData(f'Incorrect amount {row.get("amount")!r}.')
+
+    category = None
+    category_name = (row.get('category') or '').strip()
+    if category_name:
+        category = categories.get(category_name)
+        if category is None:
+            raise IncorrectData(f'Category {category_name} not found.')
+
+    created_at = imported_at
+    if (row.get('created_at') or '').strip():
+        try:
+            created_at = datetime.fromisoformat(row['created_at'].strip())
+        except ValueError:
+            raise IncorrectData(f'Incorrect date {row["created_at"]!r}.')
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        if created_at > imported_at:
+            raise IncorrectData('Transaction date cannot be in the future.')
+
+    return Transaction(
+        id=Transaction.next_id(),
+        credit_account=credit_account,
+        debit_account=debit_account,
+        amount=amount,
+        user_id=user_id,
+        type=TransactionType.for_accounts(credit_account, debit_account),
+        category_id=category.id if category else None,
+        created_at=created_at
+    )
@@ -1,11 +1,15 @@
+import typing
 import uuid
 from dataclasses import dataclass, field
-from decimal import Decimal
+from datetime import datetime
 from enum import Enum
 
-from domain.account.entities import AccountNumber
+from domain.account.entities import AccountNumber, Account
 from domain.category.entities import Category
-from shared.entities import Entity
+from shared.entities import Entity, Quantized
+from shared.money import Money
+from shared.exceptions import EntityNotFoundException
+from shared.pagination import Page
 
 
 class TransactionType(str, Enum):
@@ -14,22 +18,94 @@ class TransactionType(str, Enum):
     INCOME = 'income'
     EXPENSE = 'expense'
 
+    @classmethod
+    def for_accounts(cls, credit_account: AccountNumber | None, debit_account: AccountNumber | None) -> 'TransactionType':
+        if credit_account and debit_account:
+            return cls.TRANSFER
+        elif debit_account:
+            return cls.INCOME
+        return cls.EXPENSE
 
-@dataclass
+
+@dataclass(slots=True)
 class Transaction(Entity):
     user_id: uuid.UUID
     credit_account: AccountNumber | None  # from
     debit_account: AccountNumber | None   # to
-    amount: float
-    _amount: Decimal = field(init=False, repr=False)
+    amount: Money  # numbers are quantized to cents on assignment
     type: None | TransactionType = None
     category_id: uuid.UUID | None = None
     category: None | Category = None
+    created_at: datetime | None = None
+
+    @classmethod
+    def trusted(
+            cls,
+            id: uuid.UUID,
+            user_id: uuid.UUID,
+            credit_account: AccountNumber | None,
+            debit_account: AccountNumber | None,
+            amount: Money,
+            type: None | TransactionType = None,
+            category_id: uuid.UUID | None = None,
+            category: None | Category = None,
+            created_at: datetime | None = None
+    ) -> 'Transaction':
+        """Transaction from trusted values, e.g. database row: amount is Money already"""
+        transaction = object.__new__(cls)
+        transaction.id = id
+        transaction.user_id = user_id
+        transaction.credit_account = credit_account
+        transaction.debit_account = debit_account
+        cls.amount.set_trusted(transaction, amount)
+        transaction.type = type
+        transaction.category_id = category_id
+        transaction.category = category
+        transaction.created_at = created_at
+        return transaction
+
+
+Transaction.amount = Quantized(Transaction.amount)
+
+
+@dataclass
+class TransactionParticipants:
+    """Accounts and category of new transaction, loaded for its validation by one query"""
+    accounts: dict[AccountNumber, Account] = field(default_factory=dict)
+    accessible: set[AccountNumber] = field(default_factory=set)  # numbers of accounts accessible by user
+    category: Category | None = None
+
+    def get_account(self, number: AccountNumber) -> Account:
+        if number not in self.accessible or number not in self.accounts:
+            raise EntityNotFoundException(entity_id=number)
+        return self.accounts[number]
+
 
-    @property
-    def amount(self):
-        return self._amount
+class UserTransactionsPage(Page[Transaction]):
+    """Page of user transactions with numbers of all accounts accessible by user, which the listing spans"""
 
-    @amount.setter
-    def amount(self, value: float | Decimal):
-        self._amount = Decimal(value).quantize(Decimal('.01'))
+    def __init__(self, items=(), next_cursor: str | None = None, account_numbers: typing.Iterable[AccountNumber] = ()):
+        super().__init__(items, next_cursor)
+        self.account_numbers = list(account_numbers)
+
+
+@dataclass
+class AccountStatement:
+    account_number: AccountNumber
+    start: datetime
+    end: datetime
+    opening_balance: Money
+    closing_balance: Money
+    transactions: list[Transaction]
+
+
+@dataclass
+class RejectedRow:
+    line: int  # line number in imported file, header is line 1
+    reason: str
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    rejected: list[RejectedRow] = field(default_factory=list)
@@ -1,6 +1,16 @@
 from .get_txs import (
     get_user_transactions,
     get_account_transactions,
+    stream_user_transactions,
     GetUserTransactionsDTO,
-    GetAccountTransactionsDTO
-)
\ No newline at end of file
+    GetAccountTransactionsDTO,
+    StreamUserTransactionsDTO
+)
+from .get_statement import (
+    get_account_statement,
+    GetAccountStatementDTO
+)
+from .export_txs import (
+    export_transactions,
+    ExportTransactionsDTO
+)
@@ -0,0 +1,98 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dependency_injector.wiring import Provide, inject
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.dependencies import Container
+from domain.transaction.entities import Transaction, TransactionType
+from domain.transaction.repositories import TransactionRepository
+from shared.exceptions import IncorrectData
+from shared.interfaces import Query
+
+_dictionary = pa.dictionary(pa.int32(), pa.string())
+
+TRANSACTIONS_SCHEMA = pa.schema([
+    pa.field('id', pa.string(), nullable=False),
+    pa.field('created_at', pa.timestamp('us'), nullable=False),
+    pa.field('type', _dictionary),
+    pa.field('credit_account', _dictionary),
+    pa.field('debit_account', _dictionary),
+    pa.field('amount', pa.decimal128(14, 2), nullable=False),
+    pa.field('category', _dictionary),
+])
+
+
+@dataclass
+class ExportTransactionsDTO(Query):
+    """
+    Export of user transactions created in [from_, to) to Parquet file,
+    every batch of `batch_size` transactions is written as separate row group
+    """
+    user_id: uuid.UUID
+    from_: datetime
+    to: datetime
+    path: str | Path
+    batch_size: int = 10000
+
+
+@inject
+async def export_transactions(
+        query: ExportTransactionsDTO,
+        session: AsyncSession,
+        tx_repo: TransactionRepository = Provide[Container.tx_repo]
+) -> int:
+    tx_repo.session = session
+
+    if query.from_ > query.to:
+        raise IncorrectData('Export period start cannot be after its end.')
+    if query.batch_size < 1:
+        raise IncorrectData('Batch size should be positive.')
+
+    exported = 0
+    path = Path(query.path)
+    try:
+        with pq.ParquetWriter(path, TRANSACTIONS_SCHEMA) as writer:
+            batch = []
+            async for tx in tx_repo.stream_user_transactions(
+                    query.user_id,
+                    batch_size=query.batch_size,
+                    start=query.from_,
+                    end=query.to
+            ):
+                batch.append(tx)
+                if len(batch) == query.batch_size:
+                    writer.write_batch(_to_record_batch(batch))
+                    exported += len(batch)
+                    batch = []
+            if batch:
+                writer.write_batch(_to_record_batch(batch))
+                exported += len(batch)
+    except Exception:
+        # partially written file is not valid Parquet
+        path.unlink(missing_ok=True)
+        raise
+
+    return exported
+
+
+def _to_record_batch(transactions: list[Transaction]) -> pa.RecordBatch:
+    def dictionary_column(values):
+        return pa.array(values, type=pa.string()).dictionary_encode()
+
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([str(tx.id) for tx in transactions], type=pa.string()),
+            pa.array([tx.created_at for tx in transactions], type=pa.timestamp('us')),
+            dictionary_column([TransactionType(tx.type).value if tx.type else None for tx in transactions]),
+            dictionary_column([tx.credit_account for tx in transactions]),
+            dictionary_column([tx.debit_account for tx in transactions]),
+            pa.array([tx.amount.to_decimal() for tx in transactions], type=pa.decimal128(14, 2)),
+            dictionary_column([tx.category.name if tx.category else None for tx in transactions]),
+        ],
+        schema=TRANSACTIONS_SCHEMA
+    )
@@ -0,0 +1,59 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from dependency_injector.wiring import Provide, inject
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.dependencies import Container
+from domain.account.entities import AccountNumber
+from domain.account.repositories import AccountRepository
+from domain.transaction.entities import AccountStatement
+from domain.transaction.repositories import TransactionRepository
+from shared.exceptions import IncorrectData
+from shared import tags
+from shared.interfaces import Query
+from shared.money import Money
+
+
+@dataclass
+class GetAccountStatementDTO(Query):
+    user_id: uuid.UUID
+    account_number: AccountNumber
+    from_: datetime
+    to: datetime
+
+    def cache_tags(self, result):
+        return [tags.account(self.account_number)]
+
+
+@inject
+async def get_account_statement(
+        query: GetAccountStatementDTO,
+        session: AsyncSession,
+        tx_repo: TransactionRepository = Provide[Container.tx_repo],
+        account_repo: AccountRepository = Provide[Container.account_repo]
+):
+    tx_repo.session = session
+    account_repo.session = session
+
+    if query.from_ > query.to:
+        raise IncorrectData('Statement period start cannot be after its end.')
+
+    account = await account_repo.get_by_number(query.account_number, query.user_id)
+
+    # opening balance starts from the nearest balance checkpoint, only period transactions are scanned
+    opening_balance = await account_repo.get_balance_at(account, query.from_)
+    transactions = await tx_repo.get_account_transactions_between(account.number, query.from_, query.to)
+
+    turnover = Money.sum(tx.amount if tx.debit_account == account.number else -tx.amount for tx in transactions)
+    closing_balance = opening_balance + turnover
+
+    return AccountStatement(
+        account_number=account.number,
+        start=query.from_,
+        end=query.to,
+        opening_balance=opening_balance,
+        closing_balance=closing_balance,
+        transactions=transactions
+    )
@@ -1,5 +1,6 @@
 import uuid
 from dataclasses import dataclass
+from typing import AsyncIterator
 
 from dependency_injector.wiring import Provide, inject
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,33 +8,79 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.dependencies import Container
 from domain.account.entities import AccountNumber
 from domain.account.repositories import AccountRepository
+from domain.transaction.entities import Transaction, UserTransactionsPage
 from domain.transaction.repositories import TransactionRepository
-from shared.exceptions import EntityNotFoundException
+from shared.exceptions import EntityNotFoundException, IncorrectData
+from shared import tags
 from shared.interfaces import Query
+from shared.pagination import Cursor
+
+
+def _page_params(query) -> tuple[int | None, Cursor | None]:
+    if query.limit is not None and query.limit < 1:
+        raise IncorrectData('Page limit should be positive.')
+    cursor = Cursor.decode(query.cursor) if query.cursor else None
+    return query.limit, cursor
 
 
 @dataclass
 class GetUserTransactionsDTO(Query):
     user_id: uuid.UUID
+    limit: int | None = None  # all transactions if not set
+    cursor: str | None = None  # `next_cursor` of the previous page
+
+    def cache_tags(self, result):
+        # transactions of any account accessible by user, including shared ones, change the listing
+        return [tags.user(self.user_id), *(tags.account(number) for number in result.account_numbers)]
 
 
 @inject
 async def get_user_transactions(
         query: GetUserTransactionsDTO,
         session: AsyncSession,
+        tx_repo: TransactionRepository = Provide[Container.tx_repo],
+        account_repo: AccountRepository = Provide[Container.account_repo]
+) -> UserTransactionsPage:
+    tx_repo.session = session
+    account_repo.session = session
+
+    limit, cursor = _page_params(query)
+    accounts = await account_repo.get_all__user(query.user_id)
+    user_txs = await tx_repo.get_user_transactions(query.user_id, limit=limit, cursor=cursor)
+
+    return UserTransactionsPage(user_txs, user_txs.next_cursor, [account.number for account in accounts])
+
+
+@dataclass
+class StreamUserTransactionsDTO(Query):
+    """Full history of user transactions, should be executed with Application.stream"""
+    user_id: uuid.UUID
+    batch_size: int = 1000  # rows fetched from DB at once
+
+
+@inject
+async def stream_user_transactions(
+        query: StreamUserTransactionsDTO,
+        session: AsyncSession,
         tx_repo: TransactionRepository = Provide[Container.tx_repo]
-):
+) -> AsyncIterator[Transaction]:
     tx_repo.session = session
 
-    user_txs = await tx_repo.get_user_transactions(query.user_id)
+    if query.batch_size < 1:
+        raise IncorrectData('Batch size should be positive.')
 
-    return user_txs
+    return tx_repo.stream_user_transactions(query.user_id, batch_size=query.batch_size)
 
 
 @dataclass
 class GetAccountTransactionsDTO(Query):
     user_id: uuid.UUID
     account_number: AccountNumber
+    limit: int | None = None
+    cursor: str | None = None
+
+    def cache_tags(self, result):
+        return [tags.account(self.account_number)]
 
 
 @inject
@@ -46,8 +93,9 @@ async def get_account_transactions(
     tx_repo.session = session
     account_repo.session = session
 
+    limit, cursor = _page_params(query)
     account = await account_repo.get_by_number(query.account_number, query.user_id)
 
-    account_txs = await tx_repo.get_account_transactions(account.number)
+    account_txs = await tx_repo.get_account_transactions(account.number, limit=limit, cursor=cursor)
 
     return account_txs
@@ -1,14 +1,55 @@
 import uuid
+from datetime import datetime
+from typing import AsyncIterator
 
 from domain.account.entities import AccountNumber
-from domain.transaction.entities import Transaction
+from domain.transaction.entities import Transaction, TransactionParticipants
+from shared.pagination import Page, Cursor
 from shared.repositories import Repository
 
 
 class TransactionRepository(Repository):
 
-    async def get_user_transactions(self, user_id: uuid.UUID) -> list[Transaction]:
+    async def add_many(self, transactions: list[Transaction], account_ids: dict[AccountNumber, uuid.UUID]):
         raise NotImplementedError
 
-    async def get_account_transactions(self, account_number: AccountNumber) -> list[Transaction]:
-        raise NotImplementedError
\ No newline at end of file
+    async def get_participants(
+            self,
+            user_id: uuid.UUID,
+            account_numbers: list[AccountNumber],
+            category_id: uuid.UUID | None = None
+    ) -> TransactionParticipants:
+        raise NotImplementedError
+
+    async def get_user_transactions(
+            self,
+            user_id: uuid.UUID,
+            limit: int | None = None,
+            cursor: Cursor | None = None
+    ) -> Page[Transaction]:
+        raise NotImplementedError
+
+    def stream_user_transactions(
+            self,
+            user_id: uuid.UUID,
+            batch_size: int = 1000,
+            start: datetime | None = None,
+            end: datetime | None = None
+    ) -> AsyncIterator[Transaction]:
+        raise NotImplementedError
+
+    async def get_account_transactions(
+            self,
+            account_number: AccountNumber,
+            limit: int | None = None,
+            cursor: Cursor | None = None
+    ) -> Page[Transaction]:
+        raise NotImplementedError
+
+    async def get_account_transactions_between(
+            self,
+            account_number: AccountNumber,
+            start: datetime,
+            end: datetime
+    ) -> list[Transaction]:
+        raise NotImplementedError
@@ -14,6 +14,12 @@ class CreateUserDTO(Command):
     name: str
     email: str | None = None
 
+    def invalidates(self, result):
+        return ()
+
+    def affected_user_ids(self, result):
+        return [result.id]
+
 
 @inject
 async def create_user(
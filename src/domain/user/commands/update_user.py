@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.dependencies import Container
 from domain.user.repositories import UserRepository
+from shared import tags
 from shared.interfaces import Command
 
 
@@ -15,6 +16,12 @@ class UpdateUserDTO(Command):
     name: str | None = None
     email: str | None = None
 
+    def invalidates(self, result):
+        return [tags.user(self.id)]
+
+    def affected_user_ids(self, result):
+        return [self.id]
+
 
 @inject
 async def update_user(
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from shared.entities import Entity
 
 
-@dataclass
+@dataclass(slots=True)
 class User(Entity):
     name: str
     email: str | None
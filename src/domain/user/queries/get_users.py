@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.dependencies import Container
 from domain.user.repositories import UserRepository
+from shared import tags
 from shared.interfaces import Query
 
 
@@ -13,6 +14,12 @@ from shared.interfaces import Query
 class GetUserDTO(Query):
     id: uuid.UUID
 
+    def cache_tags(self, result):
+        return [tags.user(self.id)]
+
+    def affected_user_ids(self):
+        return [self.id]
+
 
 @inject
 async def get_user_by_id(
@@ -34,6 +41,10 @@ async def get_user_by_id(
 class GetUserByNameDTO(Query):
     name: str
 
+    def affected_user_ids(self):
+        # user is known only after lookup
+        return None
+
 
 @inject
 async def get_user_by_name(
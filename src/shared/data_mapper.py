@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Generic, Any, TypeVar
+from typing import Generic, Any, TypeVar, Iterable
+
+from sqlalchemy import Row
 
 from shared.entities import Entity
 
@@ -8,8 +10,24 @@ MapperModel = TypeVar('MapperModel', bound=Any)
 
 
 class DataMapper(Generic[MapperEntity, MapperModel], ABC):
+    """
+    Mappers are stateless: one instance per mapper class is shared by all repositories (see instance()).
+    Bulk methods (models_to_entities, rows_to_entities) map lists, mappers may specialize them
+    to avoid per-item overhead.
+    """
     entity_class: type[MapperEntity]
     model_class: type[MapperModel]
+    # Core read mode: columns, which entity is built from (see row_to_entity),
+    # are selected without ORM instances, identity map and relationship loading
+    columns: tuple = ()
+
+    @classmethod
+    def instance(cls) -> 'DataMapper[MapperEntity, MapperModel]':
+        mapper = cls.__dict__.get('_instance')
+        if mapper is None:
+            mapper = cls()
+            cls._instance = mapper
+        return mapper
 
     @abstractmethod
     def model_to_entity(self, instance: MapperModel) -> MapperEntity:
@@ -18,3 +36,15 @@ class DataMapper(Generic[MapperEntity, MapperModel], ABC):
     @abstractmethod
     def entity_to_model(self, entity: MapperEntity) -> MapperModel:
         raise NotImplementedError()
+
+    def row_to_entity(self, row: Row) -> MapperEntity:
+        """Entity from row of `columns`"""
+        raise NotImplementedError()
+
+    def models_to_entities(self, instances: Iterable[MapperModel]) -> list[MapperEntity]:
+        model_to_entity = self.model_to_entity
+        return [model_to_entity(instance) for instance in instances]
+
+    def rows_to_entities(self, rows: Iterable[Row]) -> list[MapperEntity]:
+        row_to_entity = self.row_to_entity
+        return [row_to_entity(row) for row in rows]
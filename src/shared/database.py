@@ -1,11 +1,13 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import MetaData, UUID, DateTime
+from sqlalchemy import MetaData, UUID, DateTime, Numeric, TypeDecorator
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy_easy_softdelete.mixin import generate_soft_delete_mixin_class
 from sqlalchemy_utils import force_auto_coercion
 
+from shared.money import Money
+
 force_auto_coercion()
 
 
@@ -25,4 +27,23 @@ class Base(DeclarativeBase, SoftDeleteMixin):
         }
     )
     id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    created_at: Mapped[datetime] = mapped_column(DateTime,  default=datetime.utcnow)
\ No newline at end of file
+    created_at: Mapped[datetime] = mapped_column(DateTime,  default=datetime.utcnow)
+
+
+class MoneyNumeric(TypeDecorator):
+    """
+    Numeric(14, 2) column of Money: values are read as Money.
+    Money is written as exact Decimal, other numbers (Decimal, int) are currency units, written as is.
+    """
+    impl = Numeric(14, 2)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, Money):
+            return value.to_decimal()
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Money.from_decimal(value)
@@ -1,11 +1,38 @@
 import uuid
 from dataclasses import dataclass
+from decimal import Decimal
 
+from shared.money import Money
 
-@dataclass
+
+@dataclass(slots=True)
 class Entity:
     id: uuid.UUID
 
     @classmethod
     def next_id(cls):
-        return uuid.uuid4()
\ No newline at end of file
+        return uuid.uuid4()
+
+
+class Quantized:
+    """
+    Money attribute of slotted entity, converted to Money on every assignment (constructor included):
+    numbers are currency units, quantized to cents by Money.from_decimal (`balance=100` is 100.00).
+    Wraps slot of dataclass field: `Account.balance = Quantized(Account.balance)`.
+    set_trusted() stores Money as is - for values read from Numeric(14, 2) column.
+    """
+    __slots__ = ('slot',)
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return self.slot.__get__(instance, owner)
+
+    def __set__(self, instance, value: Money | Decimal | int | float):
+        self.slot.__set__(instance, Money.from_decimal(value))
+
+    def set_trusted(self, instance, value: Money):
+        self.slot.__set__(instance, value)
@@ -1,9 +1,40 @@
+import typing
+import uuid
 from dataclasses import dataclass
 
 @dataclass
 class Command:
-    pass
+
+    def invalidates(self, result) -> typing.Iterable[str] | None:
+        """
+        Cache tags of query results, which become stale after the command is committed.
+        None - all cached query results are stale.
+        """
+        return None
+
+    def affected_user_ids(self, result) -> typing.Iterable[uuid.UUID]:
+        """
+        Users, whose data the command writes: their queries read own writes from the primary (see core.replicas).
+        By default - user of action `user_id`.
+        """
+        user_id = getattr(self, 'user_id', None)
+        return () if user_id is None else (user_id,)
 
 @dataclass
 class Query:
-    pass
\ No newline at end of file
+
+    def cache_tags(self, result) -> typing.Iterable[str] | None:
+        """
+        Dependency tags of query result - result is cached until any of tags is invalidated by command.
+        None - result is not cached.
+        """
+        return None
+
+    def affected_user_ids(self) -> typing.Iterable[uuid.UUID] | None:
+        """
+        Users, whose data the query reads. By default - user of action `user_id`.
+        None - user is not known before execution (e.g. lookup by name): query reads from the primary
+        while any write may not have reached replicas.
+        """
+        user_id = getattr(self, 'user_id', None)
+        return () if user_id is None else (user_id,)
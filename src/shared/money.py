@@ -0,0 +1,166 @@
+import operator
+import typing
+from decimal import Decimal
+
+CENT = Decimal('.01')
+
+DecimalAmount = typing.Union[Decimal, int, float, str]
+
+
+class Money:
+    """
+    Amount of money as integer number of cents (minor units): `Money(1050)` is 10.50.
+    Sums and comparisons of amounts are integer operations on cents, without Decimal rounding drift,
+    their results are Money again.
+
+    Decimal amounts (Decimal, int, float) are currency units, not cents: `Money.from_decimal` is the only
+    conversion of units into Money. Money is compared with and added to them by their decimal value,
+    and is exactly converted to and from Numeric(14, 2) columns (see shared.database.MoneyNumeric).
+    """
+    __slots__ = ('cents',)
+
+    cents: int
+
+    def __init__(self, cents: int = 0):
+        self.cents = cents
+
+    @classmethod
+    def from_decimal(cls, value: typing.Union['Money', DecimalAmount]) -> 'Money':
+        """Money from decimal amount of currency units (`from_decimal(5)` is 5.00), quantized to cents"""
+        if value.__class__ is Money:
+            return value
+        if isinstance(value, int):
+            return _money(value * 100)
+        if not isinstance(value, Decimal):
+            value = Decimal(value)
+        return _money(int(value.quantize(CENT).scaleb(2)))
+
+    @classmethod
+    def sum(cls, amounts: typing.Iterable['Money']) -> 'Money':
+        """Sum of amounts as one builtin integer sum of cents"""
+        return _money(sum(map(_cents, amounts)))
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.cents).scaleb(-2)
+
+    def __add__(self, other: typing.Union['Money', DecimalAmount]) -> 'Money':
+        if other.__class__ is not Money:
+            if not isinstance(other, (Decimal, int, float)):
+                return NotImplemented
+            other = Money.from_decimal(other)
+        result = _new(Money)
+        result.cents = self.cents + other.cents
+        return result
+
+    __radd__ = __add__
+
+    def __sub__(self, other: typing.Union['Money', DecimalAmount]) -> 'Money':
+        if other.__class__ is not Money:
+            if not isinstance(other, (Decimal, int, float)):
+                return NotImplemented
+            other = Money.from_decimal(other)
+        result = _new(Money)
+        result.cents = self.cents - other.cents
+        return result
+
+    def __rsub__(self, other: DecimalAmount) -> 'Money':
+        if not isinstance(other, (Decimal, int, float)):
+            return NotImplemented
+        return _money(Money.from_decimal(other).cents - self.cents)
+
+    def __mul__(self, other: int | Decimal | float) -> 'Money | Decimal':
+        """Money multiplied by integer is Money, by fraction - exact Decimal, quantized when it becomes Money"""
+        if isinstance(other, int):
+            return _money(self.cents * other)
+        if isinstance(other, (Decimal, float)):
+            return self.to_decimal() * Decimal(other)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> 'Money':
+        return _money(-self.cents)
+
+    def __pos__(self) -> 'Money':
+        return self
+
+    def __abs__(self) -> 'Money':
+        return _money(abs(self.cents))
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __float__(self) -> float:
+        return self.cents / 100
+
+    # other amounts are compared by their decimal value: Decimal compares exactly with int and float
+    def __eq__(self, other) -> bool:
+        if other.__class__ is Money:
+            return self.cents == other.cents
+        if isinstance(other, (Decimal, int, float)):
+            return self.to_decimal() == other
+        return NotImplemented
+
+    def __lt__(self, other) -> bool:
+        if other.__class__ is Money:
+            return self.cents < other.cents
+        if isinstance(other, (Decimal, int, float)):
+            return self.to_decimal() < other
+        return NotImplemented
+
+    def __le__(self, other) -> bool:
+        if other.__class__ is Money:
+            return self.cents <= other.cents
+        if isinstance(other, (Decimal, int, float)):
+            return self.to_decimal() <= other
+        return NotImplemented
+
+    def __gt__(self, other) -> bool:
+        if other.__class__ is Money:
+            return self.cents > other.cents
+        if isinstance(other, (Decimal, int, float)):
+            return self.to_decimal() > other
+        return NotImplemented
+
+    def __ge__(self, other) -> bool:
+        if other.__class__ is Money:
+            return self.cents >= other.cents
+        if isinstance(other, (Decimal, int, float)):
+            return self.to_decimal() >= other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # equal to hash of the same Decimal amount, as Money is equal to it
+        return hash(self.to_decimal())
+
+    def __str__(self) -> str:
+        return str(self.to_decimal())
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.to_decimal(), format_spec)
+
+    def __repr__(self) -> str:
+        return f'Money({self.cents})'
+
+    def __reduce__(self):
+        return Money, (self.cents,)
+
+    def __copy__(self) -> 'Money':
+        return self
+
+    def __deepcopy__(self, memo) -> 'Money':
+        return self
+
+
+_new = object.__new__
+_cents = operator.attrgetter('cents')
+
+
+def _money(cents: int) -> Money:
+    """Money of operation result, created without __init__ call"""
+    money = _new(Money)
+    money.cents = cents
+    return money
+
+
+Money.ZERO = Money(0)
@@ -0,0 +1,43 @@
+import base64
+import binascii
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, TypeVar
+
+from shared.exceptions import IncorrectData
+
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Keyset position: (created_at, id) of the last row of the page.
+    Next page starts strictly after it in `created_at desc, id desc` order.
+    """
+    created_at: datetime
+    id: uuid.UUID
+
+    def encode(self) -> str:
+        raw = f'{self.created_at.isoformat()}|{self.id}'
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @classmethod
+    def decode(cls, value: str) -> 'Cursor':
+        try:
+            created_at, entity_id = base64.urlsafe_b64decode(value.encode()).decode().split('|')
+            return cls(created_at=datetime.fromisoformat(created_at), id=uuid.UUID(entity_id))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise IncorrectData('Incorrect page cursor.')
+
+
+class Page(list, Generic[T]):
+    """
+    List of page items with opaque cursor of the next page (None for the last page).
+    Behaves as plain list, so callers without pagination are not affected.
+    """
+
+    def __init__(self, items=(), next_cursor: str | None = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
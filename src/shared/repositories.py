@@ -1,6 +1,8 @@
+import asyncio
+import typing
 from abc import ABC
 
-from sqlalchemy import select
+from sqlalchemy import select, inspect
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -55,6 +57,85 @@ class InMemoryRepository(Repository):
         self.entities.pop(id)
 
 
+Key = typing.Hashable
+BatchLoad = typing.Callable[[AsyncSession, list], typing.Awaitable[dict]]
+
+
+class DataLoader:
+    """
+    Coalesces lookups of entities by key (id, number) in session: keys, requested in the same event loop tick,
+    are loaded by one batch query (`WHERE key IN (...)`), which is dispatched by `loop.call_soon`
+    after the first lookup. Lookup of key, which is being loaded, waits for the same load (single flight).
+    One batch is loaded at a time, as session cannot run concurrent queries: keys, requested during the load,
+    make the next batch. Loaded entities are not kept - loader coalesces concurrent lookups only.
+    Lives in `session.info`, one per repository lookup (see SqlAlchemyRepository._loader).
+    """
+    INFO_KEY = 'loaders'
+
+    def __init__(self, session: AsyncSession, batch_load: BatchLoad):
+        self.session = session
+        self.batch_load = batch_load  # (session, keys) -> {key: entity}, missing keys are not found
+        self._in_flight: dict[Key, asyncio.Future] = {}
+        self._batch: list[Key] = []
+        self._loading: asyncio.Task | None = None
+
+    @classmethod
+    def of(cls, session: AsyncSession, name: str, batch_load: BatchLoad) -> 'DataLoader':
+        loaders = session.info.get(cls.INFO_KEY)
+        if loaders is None:
+            loaders = session.info[cls.INFO_KEY] = {}
+
+        loader = loaders.get(name)
+        if loader is None:
+            loader = loaders[name] = cls(session, batch_load)
+        return loader
+
+    def load(self, key: Key) -> typing.Awaitable:
+        """
+        Entity of key, None if it is not found.
+        Lookups of key share one future - every lookup waits for it shielded, so cancelled lookup
+        does not cancel the others.
+        """
+        future = self._in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._in_flight[key] = loop.create_future()
+            if not self._batch and self._loading is None:
+                loop.call_soon(self._dispatch)
+            self._batch.append(key)
+        return asyncio.shield(future)
+
+    def _dispatch(self):
+        keys, self._batch = self._batch, []
+        self._loading = asyncio.ensure_future(self._load_batch(keys))
+        self._loading.add_done_callback(self._loaded)
+
+    def _loaded(self, task: asyncio.Task):
+        self._loading = None
+        if self._batch:
+            self._dispatch()
+
+    async def _load_batch(self, keys: list[Key]):
+        # keys stay in flight until their batch is loaded: lookups of them during the load wait for it
+        try:
+            entities = await self.batch_load(self.session, keys)
+        except asyncio.CancelledError:
+            for key in keys:
+                self._in_flight.pop(key).cancel()
+            raise
+        except Exception as error:
+            for key in keys:
+                future = self._in_flight.pop(key)
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for key in keys:
+            future = self._in_flight.pop(key)
+            if not future.done():
+                future.set_result(entities.get(key))
+
+
 class SqlAlchemyRepository(Repository):
     mapper_class: type[DataMapper[Entity, Base]]
     model_class: type[Base]
@@ -78,17 +159,20 @@ class SqlAlchemyRepository(Repository):
         self._session.add(instance)
 
     async def get_by_id(self, entity_id):
-        instance = await self._session.get(self.get_model_class(), entity_id)
+        entity = self._loaded_entity(entity_id)
+        if entity is None:
+            # concurrent lookups in session are loaded by one query
+            entity = await self._loader('id', self._load_by_ids).load(entity_id)
 
-        if instance is None:
+        if entity is None:
             raise EntityNotFoundException(entity_id=entity_id)
-        return self._get_entity(instance)
+        return entity
 
     async def get_all(self):
         stmt = select(self.get_model_class()).order_by(self.get_model_class().created_at.desc())
         instances = (await self._session.scalars(stmt)).all()
 
-        return [self._get_entity(instance) for instance in instances]
+        return self.data_mapper.models_to_entities(instances)
 
     async def update(self, entity):
         instance = self.map_entity_to_model(entity)
@@ -116,12 +200,35 @@ class SqlAlchemyRepository(Repository):
         return self.data_mapper.model_to_entity(instance)
 
     @property
-    def data_mapper(self):
-        return self.mapper_class()
+    def data_mapper(self) -> DataMapper:
+        return self.mapper_class.instance()
 
     def get_model_class(self):
         return self.model_class
 
+    def _loaded_entity(self, entity_id) -> Entity | None:
+        """
+        Entity of instance, which is already loaded in session (identity map) - it is returned without query,
+        as by session.get. Instances, expired by commit, are loaded again.
+        """
+        instance = self._session.identity_map.get(self._session.identity_key(self.get_model_class(), entity_id))
+        if instance is None or inspect(instance).expired_attributes:
+            return None
+        return self.map_model_to_entity(instance)
+
+    def _loader(self, name: str, batch_load: BatchLoad) -> DataLoader:
+        return DataLoader.of(self._session, f'{self.__class__.__name__}.{name}', batch_load)
+
+    @classmethod
+    async def _load_by_ids(cls, session: AsyncSession, ids: list) -> dict:
+        model_class = cls.model_class
+        instances = (await session.scalars(select(model_class).where(model_class.id.in_(ids)))).all()
+        entities = cls.mapper_class.instance().models_to_entities(instances)
+        return {entity.id: entity for entity in entities}
+
+    def _rows_to_entities(self, rows) -> list:
+        return self.data_mapper.rows_to_entities(rows)
+
     def _get_entity(self, instance):
         if instance is None:
             return None
@@ -0,0 +1,14 @@
+"""
+Dependency tags of cached query results (Query.cache_tags), invalidated by commands (Command.invalidates)
+"""
+import uuid
+
+GENERAL_CATEGORIES = 'categories:general'
+
+
+def user(user_id: uuid.UUID) -> str:
+    return f'user:{user_id}'
+
+
+def account(account_number: str) -> str:
+    return f'account:{account_number}'
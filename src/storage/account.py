@@ -1,22 +1,81 @@
+import bisect
+import itertools
 import uuid
-from datetime import datetime
-from decimal import Decimal
+from datetime import datetime, timedelta
 
 from requests import session
-from sqlalchemy import select, func, and_, or_, update
+from sqlalchemy import select, func, and_, update, bindparam
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from domain.account.entities import Account
 from domain.account.repositories import AccountRepository
 from shared.data_mapper import DataMapper
 from shared.exceptions import EntityAlreadyCreatedException, EntityNotFoundException
+from shared.money import Money
 from shared.repositories import SqlAlchemyRepository
-from storage.models import AccountModel, TransactionModel, AccountBalanceModel, AccountAccessModel
+from storage.models import AccountModel, AccountBalanceModel, AccountAccessModel, AccountBalanceCheckpointModel, \
+    LedgerEntryModel
+
+
+def balance_period_end(moment: datetime) -> datetime:
+    """End (exclusive) of balance checkpoint period - month, which moment belongs to"""
+    month_start = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return (month_start + timedelta(days=32)).replace(day=1)
+
+
+class AccountCache:
+    """
+    Identity cache of accounts, loaded in session (by id and number),
+    and numbers of accounts, which are accessible by users - loaded once per user.
+    Lives in `session.info`, dropped on commit and rollback (as ORM identity map is expired).
+    """
+    INFO_KEY = 'account_cache'
+
+    def __init__(self):
+        self.by_id: dict[uuid.UUID, Account] = {}
+        self.by_number: dict[str, Account] = {}
+        # user id -> numbers of accessible accounts, in load order
+        self.accessible: dict[uuid.UUID, dict[str, None]] = {}
+
+    @classmethod
+    def of(cls, session: AsyncSession) -> 'AccountCache':
+        return session.info.setdefault(cls.INFO_KEY, cls())
+
+    def put(self, account: Account):
+        self.evict(account.id)
+        self.by_id[account.id] = account
+        self.by_number[account.number] = account
+
+    def evict(self, account_id: uuid.UUID):
+        account = self.by_id.pop(account_id, None)
+        if account is not None:
+            self.by_number.pop(account.number, None)
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_account_cache(session, *args):
+    session.info.pop(AccountCache.INFO_KEY, None)
 
 
 class AccountDataMapper(DataMapper):
+    columns = (
+        AccountModel.id,
+        AccountModel.name,
+        AccountModel.owner_id,
+        AccountModel.number,
+        AccountBalanceModel.balance,
+    )
+
+    def row_to_entity(self, row) -> Account:
+        id_, name, owner_id, number, balance = row
+        return Account.trusted(id=id_, name=name, owner_id=owner_id, number=number, balance=balance)
+
     def model_to_entity(self, instance: AccountModel) -> Account:
-        return Account(
+        return Account.trusted(
             id=instance.id,
             name=instance.name,
             owner_id=instance.owner_id,
@@ -33,211 +92,349 @@ class AccountDataMapper(DataMapper):
         )
 
 
+# Hot statements are built once per process and executed with bound parameters:
+# statement construction is not repeated on every call, compiled SQL is taken from SQLAlchemy cache.
+
+_accounts_stmt = select(
+    *AccountDataMapper.columns
+).select_from(
+    AccountModel
+).join(
+    AccountBalanceModel,
+    AccountBalanceModel.account_id == AccountModel.id
+)
+
+_accounts_by_ids_stmt = _accounts_stmt.where(AccountModel.id.in_(bindparam('ids', expanding=True)))
+
+_accounts_by_numbers_stmt = _accounts_stmt.where(AccountModel.number.in_(bindparam('numbers', expanding=True)))
+
+# accounts accessible by users: user id, then account columns
+_users_accounts_stmt = select(
+    AccountAccessModel.user_id,
+    *AccountDataMapper.columns
+).select_from(
+    AccountModel
+).join(
+    AccountBalanceModel,
+    AccountBalanceModel.account_id == AccountModel.id
+).join(
+    AccountAccessModel,
+    and_(
+        AccountAccessModel.account_id == AccountModel.id,
+        AccountAccessModel.user_id.in_(bindparam('user_ids', expanding=True))
+    )
+)
+
+_ledger_balance_stmt = select(
+    func.coalesce(func.sum(LedgerEntryModel.amount), 0)
+).where(
+    and_(
+        LedgerEntryModel.account_id == bindparam('account_id'),
+        LedgerEntryModel.deleted_at.is_(None)
+    )
+)
+
+_ledger_balance_between_stmt = _ledger_balance_stmt.where(
+    and_(
+        LedgerEntryModel.created_at >= bindparam('start'),
+        LedgerEntryModel.created_at < bindparam('end')
+    )
+)
+
+# names of bound parameters of UPDATE differ from column names, which are reserved for SET clause
+_apply_balance_delta_stmt = update(AccountBalanceModel).where(
+    AccountBalanceModel.account_id == bindparam('target_account_id')
+).values(
+    balance=AccountBalanceModel.balance + bindparam('delta'),
+    updated_at=bindparam('updated_at')
+).returning(
+    AccountBalanceModel.balance
+).execution_options(synchronize_session=False)
+
+_update_checkpoint_stmt = update(AccountBalanceCheckpointModel).where(
+    and_(
+        AccountBalanceCheckpointModel.account_id == bindparam('target_account_id'),
+        AccountBalanceCheckpointModel.period_end == bindparam('target_period_end')
+    )
+).values(
+    balance=bindparam('checkpoint_balance', type_=AccountBalanceCheckpointModel.balance.type)
+).execution_options(synchronize_session=False)
+
+_last_checkpoint_stmt = select(
+    AccountBalanceCheckpointModel.period_end,
+    AccountBalanceCheckpointModel.balance
+).where(
+    and_(
+        AccountBalanceCheckpointModel.account_id == bindparam('account_id'),
+        AccountBalanceCheckpointModel.period_end <= bindparam('at')
+    )
+).order_by(
+    AccountBalanceCheckpointModel.period_end.desc()
+).limit(1)
+
+
 class AccountSqlalchemyRepository(AccountRepository, SqlAlchemyRepository):
     model_class = AccountModel
     mapper_class = AccountDataMapper
 
     def accounts__stmt(self):
-        stmt = select(
-            AccountModel,
-            AccountBalanceModel.balance
-        ).join(
-            AccountBalanceModel,
-            AccountBalanceModel.account_id == AccountModel.id
-        )
-
-        return stmt
+        return _accounts_stmt
 
     async def add(self, account: Account):
         instance = self.map_entity_to_model(account)
         try:
-            async with self._session:
-                self._session.add(instance)
-                await self._session.flush()
+            self._session.add(instance)
+            await self._session.flush()
 
-                # add related objects - account balances, account access
-                self._session.add(AccountBalanceModel(account_id=instance.id, balance=account.balance))
-                self._session.add(AccountAccessModel(account_id=instance.id, user_id=instance.owner_id))
+            # add related objects - account balances, account access
+            self._session.add(AccountBalanceModel(account_id=instance.id, balance=account.balance))
+            self._session.add(AccountAccessModel(account_id=instance.id, user_id=instance.owner_id))
 
-                await self._session.commit()
+            await self._session.flush()
 
         except IntegrityError as err:
             raise EntityAlreadyCreatedException()
 
+        cache = self._cache
+        cache.put(account)
+        if account.owner_id in cache.accessible:
+            cache.accessible[account.owner_id][account.number] = None
+
     async def share_access(self, account_id: uuid.UUID, user_id: uuid.UUID):
         access = AccountAccessModel(account_id=account_id, user_id=user_id)
 
-        async with self._session:
-            self._session.add(access)
-            await self._session.commit()
+        self._session.add(access)
+        await self._session.flush()
+
+        # accessible accounts of user are reloaded on next lookup
+        self._cache.accessible.pop(user_id, None)
+
+    @property
+    def _cache(self) -> AccountCache:
+        return AccountCache.of(self._session)
+
+    async def _accessible_accounts(self, user_id: uuid.UUID) -> dict[str, None]:
+        """
+        Numbers of accounts accessible by user, loaded with accounts once per session.
+        Concurrent lookups of several users are loaded by one query.
+        """
+        accessible = self._cache.accessible.get(user_id)
+        if accessible is None:
+            accessible = await self._loader('accessible', self._load_accessible).load(user_id)
+
+        return accessible
+
+    async def _get_cached_by_number(self, number: str) -> Account:
+        account = self._cache.by_number.get(number)
+        if account is None:
+            # evicted after account update
+            account = await self._loader('number', self._load_by_numbers).load(number)
+            if account is None:
+                raise EntityNotFoundException(entity_id=number)
+            self._cache.put(account)
+
+        return account
+
+    @classmethod
+    async def _load_accessible(cls, session: AsyncSession, user_ids: list[uuid.UUID]) -> dict:
+        cache = AccountCache.of(session)
+        row_to_entity = cls.mapper_class.instance().row_to_entity
+        accessible = {user_id: {} for user_id in user_ids}
+        for user_id, *columns in (await session.execute(_users_accounts_stmt, {'user_ids': user_ids})).all():
+            account = row_to_entity(columns)
+            cache.put(account)
+            accessible[user_id][account.number] = None
+
+        cache.accessible.update(accessible)
+        return accessible
+
+    @classmethod
+    async def _load_by_numbers(cls, session: AsyncSession, numbers: list[str]) -> dict:
+        rows = (await session.execute(_accounts_by_numbers_stmt, {'numbers': numbers})).all()
+        return {account.number: account for account in cls.mapper_class.instance().rows_to_entities(rows)}
+
+    @classmethod
+    async def _load_by_ids(cls, session: AsyncSession, ids: list[uuid.UUID]) -> dict:
+        cache = AccountCache.of(session)
+        rows = (await session.execute(_accounts_by_ids_stmt, {'ids': ids})).all()
+        accounts = cls.mapper_class.instance().rows_to_entities(rows)
+        for account in accounts:
+            cache.put(account)
+        return {account.id: account for account in accounts}
+
+    def _loaded_entity(self, account_id: uuid.UUID) -> Account | None:
+        # accounts are loaded as rows with balances, not ORM instances: session cache is their identity map
+        return self._cache.by_id.get(account_id)
+
+    async def is_accessible(self, number: str, user_id: uuid.UUID) -> bool:
+        return number in await self._accessible_accounts(user_id)
 
 
 
     async def get_user_account_by_id(self, entity_id, user_id):
-        async with self._session:
-            instance = (await self._session.execute(
-                self.accounts__stmt().join(
-                    AccountAccessModel,
-                    and_(
-                        AccountAccessModel.account_id == AccountModel.id,
-                        AccountAccessModel.user_id == user_id
-                    )
-                ).where(AccountModel.id == entity_id).limit(1)
-            )).first()
+        accessible = await self._accessible_accounts(user_id)
 
-        if instance is None:
+        account = self._cache.by_id.get(entity_id)
+        if account is None or account.number not in accessible:
             raise EntityNotFoundException(entity_id=entity_id)
-        return self.convert_to_account(instance[0], instance[1])
+        return account
 
     async def get_by_number(self, number: str, user_id: uuid.UUID):
-        async with self._session:
-            instance = (await self._session.execute(
-                self.accounts__stmt().join(
-                    AccountAccessModel,
-                    and_(
-                        AccountAccessModel.account_id == AccountModel.id,
-                        AccountAccessModel.user_id == user_id
-                    )
-                ).where(
-                    AccountModel.number == number
-                ).limit(1)
-            )).first()
-
-        if instance is None:
+        if number not in await self._accessible_accounts(user_id):
             raise EntityNotFoundException(entity_id=number)
-        return self.convert_to_account(instance[0], instance[1])
+
+        return await self._get_cached_by_number(number)
+
+    async def update(self, account: Account):
+        await super().update(account)
+        self._cache.put(account)
 
     async def update_balance(self, account: Account):
-        async with self._session:
-            account_balance = (
-                await self._session.scalars(
-                    select(AccountBalanceModel).where(AccountBalanceModel.account_id == account.id)
-                )
-            ).first()
+        account_balance = (
+            await self._session.scalars(
+                select(AccountBalanceModel).where(AccountBalanceModel.account_id == account.id)
+            )
+        ).first()
 
-            if not account_balance:
-                raise EntityNotFoundException(account.id)
+        if not account_balance:
+            raise EntityNotFoundException(account.id)
 
-            account_balance.balance = account.balance
-            await self._session.merge(account_balance)
-            await self._session.commit()
+        account_balance.balance = account.balance
+        await self._session.merge(account_balance)
+        await self._session.flush()
+
+        cached = self._cache.by_id.get(account.id)
+        if cached is not None:
+            cached.balance = account.balance
 
 
     async def remove(self, entity):
-        async with self._session:
-            instance = await self._session.get(AccountModel, entity.id)
-            if instance is None:
-                raise EntityNotFoundException(entity_id=entity.id)
-            balance = (await self._session.scalars(
-                select(AccountBalanceModel).where(AccountBalanceModel.account_id == entity.id).limit(1))).first()
-
-            # delete account and relate objects
-            soft_delete_stmt = (update(AccountAccessModel).where(
-                AccountAccessModel.account_id == entity.id
-            ).values(deleted_at = datetime.utcnow()))
-            await self._session.execute(soft_delete_stmt)
-            balance.delete()
-            instance.delete()
-
-            await self._session.commit()
+        instance = await self._session.get(AccountModel, entity.id)
+        if instance is None:
+            raise EntityNotFoundException(entity_id=entity.id)
+        balance = (await self._session.scalars(
+            select(AccountBalanceModel).where(AccountBalanceModel.account_id == entity.id).limit(1))).first()
 
-    async def get_all__user(self, user_id: uuid.UUID):
-        stmt = select(
-            AccountModel,
-            AccountBalanceModel.balance
-        ).join(
-            AccountBalanceModel, AccountBalanceModel.account_id == AccountModel.id
-        ).join(
-            AccountAccessModel,
-            and_(
-                AccountAccessModel.account_id == AccountModel.id,
-                AccountAccessModel.user_id == user_id
-            )
-        )
+        # delete account and relate objects
+        soft_delete_stmt = (update(AccountAccessModel).where(
+            AccountAccessModel.account_id == entity.id
+        ).values(deleted_at = datetime.utcnow()))
+        await self._session.execute(soft_delete_stmt)
+        balance.delete()
+        instance.delete()
 
-        async with self._session:
-            instances = (await self._session.execute(stmt)).all()
+        await self._session.flush()
 
-        return [self.convert_to_account(account, balance) for account, balance in instances]
+        cache = self._cache
+        cache.evict(entity.id)
+        for accessible in cache.accessible.values():
+            accessible.pop(entity.number, None)
+
+    async def get_all__user(self, user_id: uuid.UUID):
+        accessible = await self._accessible_accounts(user_id)
+        return [await self._get_cached_by_number(number) for number in accessible]
 
     async def calculate_balance(self, account_id: uuid.UUID):
+        """
+        Full recompute of account balance from all account ledger entries.
+        Balance is maintained incrementally (apply_balance_delta), so it is used for verification only.
+        """
+        return await self._session.scalar(_ledger_balance_stmt, {'account_id': account_id})
+
+    async def apply_balance_delta(self, account_id: uuid.UUID, delta: Money, at: datetime | None = None) -> Money:
+        """
+        Atomically adds signed delta to stored account balance, returns new balance.
+        Single UPDATE ... RETURNING: cost does not depend on account history size,
+        row lock serializes concurrent transactions of the account.
+
+        Balance checkpoint of the period of `at` (transaction creation time) is set to the new balance.
+        """
+        balance = (await self._session.execute(
+            _apply_balance_delta_stmt,
+            {'target_account_id': account_id, 'delta': delta, 'updated_at': datetime.utcnow()}
+        )).scalar_one_or_none()
+
+        if balance is None:
+            raise EntityNotFoundException(account_id)
+
+        cached = self._cache.by_id.get(account_id)
+        if cached is not None:
+            cached.balance = balance
+
+        await self._save_balance_checkpoint(account_id, balance_period_end(at or datetime.utcnow()), balance)
 
-        income__subquery = select(
-            TransactionModel.debit_account,
-            func.coalesce(func.sum(TransactionModel.amount), 0).label('income')
-        ).select_from(
-            TransactionModel
-        ).join(
-            AccountModel,
-            and_(
-                AccountModel.id == account_id,
-                or_(
-                    AccountModel.number == TransactionModel.credit_account,
-                    AccountModel.number == TransactionModel.debit_account
-                )
-            )
-        ).join(
-            AccountBalanceModel,
-            AccountBalanceModel.account_id == AccountModel.id
-        ).where(
-            and_(
-                TransactionModel.created_at > AccountBalanceModel.updated_at,
-                TransactionModel.deleted_at.is_(None)
-            )
-        ).group_by(
-            TransactionModel.debit_account
-        ).subquery()
-
-        outcome__subquery = select(
-            TransactionModel.credit_account,
-            func.coalesce(func.sum(TransactionModel.amount), 0).label('outcome')
-        ).select_from(
-            TransactionModel
-        ).join(
-            AccountModel,
-            and_(
-                AccountModel.id == account_id,
-                or_(
-                    AccountModel.number == TransactionModel.credit_account,
-                    AccountModel.number == TransactionModel.debit_account
+        return balance
+
+    async def _save_balance_checkpoint(self, account_id: uuid.UUID, period_end: datetime, balance: Money):
+        # checkpoint row is inserted by the first transaction of the period, then updated
+        # account balance row is locked by this moment, so checkpoint writes of account are serialized
+        result = await self._session.execute(
+            _update_checkpoint_stmt,
+            {'target_account_id': account_id, 'target_period_end': period_end, 'checkpoint_balance': balance}
+        )
+
+        if result.rowcount == 0:
+            self._session.add(AccountBalanceCheckpointModel(account_id=account_id, period_end=period_end, balance=balance))
+            await self._session.flush()
+
+    async def shift_balance_checkpoints(self, account_id: uuid.UUID, deltas: list[tuple[datetime, Money]]):
+        """
+        Adds backdated balance deltas - (created_at, signed amount) of transactions inserted into
+        the account history - to checkpoints of the periods ended after them.
+        Stored account balance is not changed, apply_balance_delta is used for it.
+        """
+        if not deltas:
+            return
+
+        deltas = sorted(deltas)
+        moments = [moment for moment, _ in deltas]
+        cumulative_deltas = list(itertools.accumulate(delta for _, delta in deltas))
+
+        checkpoints = (await self._session.execute(
+            select(
+                AccountBalanceCheckpointModel.id,
+                AccountBalanceCheckpointModel.period_end
+            ).where(
+                and_(
+                    AccountBalanceCheckpointModel.account_id == account_id,
+                    AccountBalanceCheckpointModel.period_end > moments[0]
                 )
             )
-        ).join(
-            AccountBalanceModel,
-            AccountBalanceModel.account_id == AccountModel.id
-        ).where(
-            and_(
-                TransactionModel.created_at > AccountBalanceModel.updated_at,
-                TransactionModel.deleted_at.is_(None)
+        )).all()
+
+        shifts = []
+        for checkpoint in checkpoints:
+            # number of deltas created before checkpoint period end
+            deltas_count = bisect.bisect_left(moments, checkpoint.period_end)
+            if deltas_count:
+                shifts.append({'checkpoint_id': checkpoint.id, 'delta': cumulative_deltas[deltas_count - 1]})
+
+        if shifts:
+            checkpoints_table = AccountBalanceCheckpointModel.__table__
+            await self._session.execute(
+                update(checkpoints_table).where(
+                    checkpoints_table.c.id == bindparam('checkpoint_id')
+                ).values(
+                    balance=checkpoints_table.c.balance + bindparam('delta')
+                ),
+                shifts
             )
-        ).group_by(
-            TransactionModel.credit_account
-        ).subquery()
-
-        stmt = select(
-            (func.coalesce(income__subquery.c.income, 0) - func.coalesce(outcome__subquery.c.outcome, 0)).label('balance')
-        ).select_from(
-            AccountModel
-        ).join(
-            income__subquery, income__subquery.c.debit_account == AccountModel.number, isouter=True
-        ).join(
-            outcome__subquery, outcome__subquery.c.credit_account == AccountModel.number, isouter=True
-        ).where(AccountModel.id == account_id)
-
-        async with self._session:
-            balance = await self._session.scalar(stmt)
 
-        return balance
-
-    def convert_to_account(
-            self,
-            account: AccountModel,
-            balance: Decimal
-    ):
-        return Account(
-            id=account.id,
-            number=account.number,
-            name=account.name,
-            owner_id=account.owner_id,
-            balance=balance
+    async def get_balance_at(self, account: Account, at: datetime) -> Money:
+        """
+        Account balance at the moment `at`:
+        the latest checkpoint before `at` + transactions created between the checkpoint and `at`,
+        so at most one period of transactions is scanned.
+        """
+        checkpoint = (await self._session.execute(
+            _last_checkpoint_stmt,
+            {'account_id': account.id, 'at': at}
+        )).first()
+
+        tail_delta = await self._session.scalar(
+            _ledger_balance_between_stmt,
+            {'account_id': account.id, 'start': checkpoint.period_end if checkpoint else datetime.min, 'end': at}
         )
+
+        opening_balance = checkpoint.balance if checkpoint else Money.ZERO
+        return opening_balance + tail_delta
@@ -12,6 +12,12 @@ from storage.models import CategoryModel
 
 
 class CategoryDataMapper(DataMapper):
+    columns = (CategoryModel.id, CategoryModel.name, CategoryModel.user_id)
+
+    def row_to_entity(self, row) -> Category:
+        id_, name, user_id = row
+        return Category(id=id_, name=name, user_id=user_id)
+
     def model_to_entity(self, instance: CategoryModel) -> Category:
         return Category(
             id=instance.id,
@@ -45,13 +51,6 @@ class CategorySqlAlchemyRepository(CategoryRepository, SqlAlchemyRepository):
             )
         ).limit(1)
 
-        # async with self._session:
-        #     instance = (await self._session.scalars(stmt)).first()
-        #     if instance is None:
-        #         raise EntityNotFoundException(entity_id=name)
-        #
-        #     return self._get_entity(instance)
-
         instance = (await self._session.scalars(stmt)).first()
         return self._get_entity(instance)
 
@@ -61,7 +60,7 @@ class CategorySqlAlchemyRepository(CategoryRepository, SqlAlchemyRepository):
         if with_general:
             where_clause.append((self.model_class.user_id.is_(None)))
 
-        stmt = select(self.model_class).where(
+        stmt = select(*CategoryDataMapper.columns).where(
             or_(
                 *where_clause
             )
@@ -69,9 +68,8 @@ class CategorySqlAlchemyRepository(CategoryRepository, SqlAlchemyRepository):
             self.model_class.name
         )
 
-        # async with self._session:
-        instances = (await self._session.scalars(stmt)).all()
+        rows = (await self._session.execute(stmt)).all()
 
-        return [self._get_entity(instance) for instance in instances]
+        return self._rows_to_entities(rows)
 
 
@@ -1,10 +1,10 @@
 from datetime import datetime
-from decimal import Decimal
 
-from sqlalchemy import String, ForeignKey, Numeric, DateTime, UniqueConstraint
+from sqlalchemy import String, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 
-from shared.database import Base
+from shared.database import Base, MoneyNumeric
+from shared.money import Money
 
 
 class UserModel(Base):
@@ -29,10 +29,25 @@ class AccountBalanceModel(Base):
     __tablename__ = 'account_balance'
 
     account_id: Mapped[str] = mapped_column(ForeignKey('account.id'), unique=True)
-    balance: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    balance: Mapped[Money] = mapped_column(MoneyNumeric, nullable=False, default=0)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class AccountBalanceCheckpointModel(Base):
+    """
+    Account balance at the end of period (month): balance after all transactions created before period_end.
+    Checkpoint of current period is updated by every transaction of the account.
+    """
+    __tablename__ = 'account_balance_checkpoint'
+    __table_args__ = (
+        UniqueConstraint('account_id', 'period_end', name='account_balance_checkpoint_account_id_period_end_key'),
+    )
+
+    account_id: Mapped[str] = mapped_column(ForeignKey('account.id'), nullable=False)
+    period_end: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    balance: Mapped[Money] = mapped_column(MoneyNumeric, nullable=False, default=0)
+
+
 class CategoryModel(Base):
     __tablename__ = 'category'
     __table_args__ = (
@@ -47,8 +62,25 @@ class TransactionModel(Base):
     user_id: Mapped[str] = mapped_column(ForeignKey('user.id'))
     credit_account: Mapped[str] = mapped_column(String(128), index=True, unique=False, nullable=True)
     debit_account: Mapped[str] = mapped_column(String(128), index=True, unique=False, nullable=True)
-    amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    amount: Mapped[Money] = mapped_column(MoneyNumeric, nullable=False, default=0)
     category_id: Mapped['str'] = mapped_column(ForeignKey('category.id'), nullable=True)
     type: Mapped[str] = mapped_column(String(128), nullable=True, index=True, unique=False)
 
     category: Mapped["CategoryModel"] = relationship(lazy='joined')
+
+
+class LedgerEntryModel(Base):
+    """
+    Account leg of transaction: one row per account, which transaction touches.
+    Amount is signed - positive for debit (income) leg, negative for credit (outcome) leg,
+    so account balance is the sum of its entries.
+    """
+    __tablename__ = 'ledger_entry'
+    __table_args__ = (
+        # account history and balances: created_at desc, transaction_id desc
+        Index('ledger_entry_account_id_created_at_idx', 'account_id', 'created_at', 'transaction_id'),
+    )
+
+    account_id: Mapped[str] = mapped_column(ForeignKey('account.id'), nullable=False)
+    transaction_id: Mapped[str] = mapped_column(ForeignKey('transaction.id'), nullable=False, index=True)
+    amount: Mapped[Money] = mapped_column(MoneyNumeric, nullable=False)
@@ -1,20 +1,148 @@
 import uuid
+from datetime import datetime
+from typing import AsyncIterator
 from unicodedata import category
 
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, tuple_, Select, insert, literal, union_all, UUID, DateTime, exists, null, true, \
+    bindparam, or_
 
-from domain.account.entities import AccountNumber
+from domain.account.entities import AccountNumber, Account
 from domain.category.entities import Category
-from domain.transaction.entities import Transaction, TransactionType
+from domain.transaction.entities import Transaction, TransactionType, TransactionParticipants
 from domain.transaction.repositories import TransactionRepository
 from shared.data_mapper import DataMapper
+from shared.pagination import Page, Cursor
 from shared.repositories import SqlAlchemyRepository
-from storage.models import TransactionModel, AccountModel, AccountAccessModel
+from storage.models import TransactionModel, AccountModel, AccountAccessModel, LedgerEntryModel, AccountBalanceModel, \
+    CategoryModel
+
+
+def _ledger_entries_insert(legs_count: int):
+    """
+    INSERT ... SELECT of transaction legs: +amount for debit account, -amount for credit account.
+    Account ids are resolved by the same statement, so legs are written with one statement.
+    Parameters of leg i: entry_id_i, account_number_i, amount_i; transaction_id, created_at are shared.
+    """
+    legs = [
+        select(
+            bindparam(f'entry_id_{i}', type_=UUID),
+            AccountModel.id,
+            bindparam('transaction_id', type_=UUID),
+            bindparam(f'amount_{i}', type_=LedgerEntryModel.amount.type),
+            bindparam('created_at', type_=DateTime)
+        ).where(
+            AccountModel.number == bindparam(f'account_number_{i}')
+        )
+        for i in range(legs_count)
+    ]
+
+    # Core insert: parameters of ORM insert would be taken for rows of bulk insert
+    return insert(LedgerEntryModel.__table__).from_select(
+        ['id', 'account_id', 'transaction_id', 'amount', 'created_at'],
+        union_all(*legs) if len(legs) > 1 else legs[0]
+    )
+
+
+# Hot statements are built once per process and executed with bound parameters.
+# Soft delete filters of prebuilt selects are explicit: soft delete rewriter modifies selects of UNION in place,
+# so filters would be added to the shared statement on every execution.
+_ledger_entries_inserts = {legs_count: _ledger_entries_insert(legs_count) for legs_count in (1, 2)}
+
+_participant_accounts_stmt = select(
+    literal('account').label('kind'),
+    AccountModel.id,
+    AccountModel.number,
+    AccountModel.name,
+    AccountModel.owner_id,
+    AccountBalanceModel.balance,
+    exists().where(
+        and_(
+            AccountAccessModel.account_id == AccountModel.id,
+            AccountAccessModel.user_id == bindparam('user_id'),
+            AccountAccessModel.deleted_at.is_(None)
+        )
+    ).label('is_accessible')
+).join(
+    AccountBalanceModel,
+    AccountBalanceModel.account_id == AccountModel.id
+).where(
+    and_(
+        AccountModel.number.in_(bindparam('account_numbers', expanding=True)),
+        AccountModel.deleted_at.is_(None),
+        AccountBalanceModel.deleted_at.is_(None)
+    )
+).execution_options(include_deleted=True)
+
+_participant_category_stmt = select(
+    literal('category'),
+    CategoryModel.id,
+    null(),
+    CategoryModel.name,
+    CategoryModel.user_id,
+    null(),
+    true()
+).where(
+    and_(
+        CategoryModel.id == bindparam('category_id'),
+        CategoryModel.deleted_at.is_(None)
+    )
+).execution_options(include_deleted=True)
+
+_participants_stmt = union_all(_participant_accounts_stmt, _participant_category_stmt)
 
 
 class TransactionDataMapper(DataMapper):
+    columns = (
+        TransactionModel.id,
+        TransactionModel.credit_account,
+        TransactionModel.debit_account,
+        TransactionModel.user_id,
+        TransactionModel.amount,
+        TransactionModel.type,
+        TransactionModel.category_id,
+        TransactionModel.created_at,
+        CategoryModel.name.label('category_name'),
+        CategoryModel.user_id.label('category_user_id'),
+    )
+
+    def row_to_entity(self, row) -> Transaction:
+        id_, credit_account, debit_account, user_id, amount, type_, category_id, created_at, \
+            category_name, category_user_id = row
+        return Transaction.trusted(
+            id=id_,
+            credit_account=credit_account,
+            debit_account=debit_account,
+            user_id=user_id,
+            amount=amount,
+            type=type_,
+            category_id=category_id,
+            created_at=created_at,
+            category=Category(id=category_id, name=category_name, user_id=category_user_id)
+            if category_name is not None else None
+        )
+
+    def rows_to_entities(self, rows) -> list[Transaction]:
+        # row_to_entity inlined: constructors are looked up once per list, not per row
+        transaction, category = Transaction.trusted, Category
+        return [
+            transaction(
+                id=id_,
+                credit_account=credit_account,
+                debit_account=debit_account,
+                user_id=user_id,
+                amount=amount,
+                type=type_,
+                category_id=category_id,
+                created_at=created_at,
+                category=category(id=category_id, name=category_name, user_id=category_user_id)
+                if category_name is not None else None
+            )
+            for id_, credit_account, debit_account, user_id, amount, type_, category_id, created_at,
+            category_name, category_user_id in rows
+        ]
+
     def model_to_entity(self, instance: TransactionModel) -> Transaction:
-        return Transaction(
+        return Transaction.trusted(
             id=instance.id,
             credit_account=instance.credit_account,
             debit_account=instance.debit_account,
@@ -22,6 +150,7 @@ class TransactionDataMapper(DataMapper):
             amount=instance.amount,
             type=instance.type,
             category_id=instance.category_id,
+            created_at=instance.created_at,
             category=Category(
                 id=instance.category_id,
                 name=instance.category.name,
@@ -37,7 +166,8 @@ class TransactionDataMapper(DataMapper):
             user_id=entity.user_id,
             amount=entity.amount,
             type=entity.type,
-            category_id=entity.category_id
+            category_id=entity.category_id,
+            created_at=entity.created_at or datetime.utcnow()
         )
 
 
@@ -45,9 +175,177 @@ class TransactionSqlAlchemyRepository(TransactionRepository, SqlAlchemyRepositor
     model_class = TransactionModel
     mapper_class = TransactionDataMapper
 
+    async def add(self, entity: Transaction):
+        instance = self.map_entity_to_model(entity)
+        self._session.add(instance)
+        await self._session.flush()
+
+        await self._add_ledger_entries(instance)
+
+    async def add_many(self, transactions: list[Transaction], account_ids: dict[AccountNumber, uuid.UUID]):
+        """
+        Multi-row INSERTs of transactions and their ledger entries, bypassing ORM unit of work:
+        rows are sent to DB by batches, no model instances are created.
+        Ledger entries reference accounts by account_ids (number -> id), already resolved by the caller.
+        """
+        if not transactions:
+            return
+
+        await self._session.execute(
+            insert(TransactionModel),
+            [
+                dict(
+                    id=tx.id,
+                    credit_account=tx.credit_account,
+                    debit_account=tx.debit_account,
+                    user_id=tx.user_id,
+                    amount=tx.amount,
+                    type=tx.type,
+                    category_id=tx.category_id,
+                    created_at=tx.created_at or datetime.utcnow()
+                )
+                for tx in transactions
+            ]
+        )
+
+        await self._session.execute(
+            insert(LedgerEntryModel),
+            [
+                dict(
+                    id=uuid.uuid4(),
+                    account_id=account_ids[account_number],
+                    transaction_id=tx.id,
+                    amount=amount,
+                    created_at=tx.created_at
+                )
+                for tx in transactions
+                for account_number, amount in ((tx.debit_account, tx.amount), (tx.credit_account, -tx.amount))
+                if account_number is not None
+            ]
+        )
+
+    async def _add_ledger_entries(self, instance: TransactionModel):
+        legs = [
+            (account_number, amount)
+            for account_number, amount in (
+                (instance.debit_account, instance.amount),
+                (instance.credit_account, -instance.amount)
+            )
+            if account_number is not None
+        ]
+        params = {'transaction_id': instance.id, 'created_at': instance.created_at}
+        for i, (account_number, amount) in enumerate(legs):
+            params.update({f'entry_id_{i}': uuid.uuid4(), f'account_number_{i}': account_number, f'amount_{i}': amount})
+
+        await self._session.execute(_ledger_entries_inserts[len(legs)], params)
+
+    async def get_participants(
+            self,
+            user_id: uuid.UUID,
+            account_numbers: list[AccountNumber],
+            category_id: uuid.UUID | None = None
+    ) -> TransactionParticipants:
+        """
+        Accounts (with balances and user access flags) and category of new transaction - one round trip:
+        UNION ALL of account rows and category row.
+        """
+        participants = TransactionParticipants()
+        account_numbers = [number for number in account_numbers if number]
+
+        if account_numbers and category_id:
+            stmt = _participants_stmt
+        elif account_numbers:
+            stmt = _participant_accounts_stmt
+        elif category_id:
+            stmt = _participant_category_stmt
+        else:
+            return participants
+
+        rows = (await self._session.execute(
+            stmt,
+            {'user_id': user_id, 'account_numbers': account_numbers, 'category_id': category_id}
+        )).all()
+        for kind, id_, number, name, owner_id, balance, is_accessible in rows:
+            if kind == 'category':
+                participants.category = Category(id=id_, name=name, user_id=owner_id)
+                continue
+
+            participants.accounts[number] = Account(
+                id=id_,
+                number=number,
+                name=name,
+                owner_id=owner_id,
+                balance=balance
+            )
+            if is_accessible:
+                participants.accessible.add(number)
+
+        return participants
 
-    async def get_user_transactions(self, user_id: uuid.UUID) -> list[Transaction]:
-        user_accounts__subquery = select(
+    async def get_user_transactions(
+            self,
+            user_id: uuid.UUID,
+            limit: int | None = None,
+            cursor: Cursor | None = None
+    ) -> Page[Transaction]:
+        stmt = self._user_transactions_stmt(user_id)
+
+        return await self._get_page(stmt, limit, cursor)
+
+    async def stream_user_transactions(
+            self,
+            user_id: uuid.UUID,
+            batch_size: int = 1000,
+            start: datetime | None = None,
+            end: datetime | None = None
+    ) -> AsyncIterator[Transaction]:
+        """
+        User transactions (created in [start, end), if period is set) in `created_at desc, id desc` order,
+        fetched from server-side cursor by batches of `batch_size` rows
+        """
+        stmt = self._user_transactions_stmt(user_id)
+        if start is not None:
+            stmt = stmt.where(LedgerEntryModel.created_at >= start)
+        if end is not None:
+            stmt = stmt.where(LedgerEntryModel.created_at < end)
+
+        stmt = stmt.order_by(
+            LedgerEntryModel.created_at.desc(),
+            LedgerEntryModel.transaction_id.desc()
+        ).execution_options(yield_per=batch_size)
+
+        row_to_entity = self.data_mapper.row_to_entity
+        rows = await self._session.stream(stmt)
+        try:
+            async for row in rows:
+                yield row_to_entity(row)
+        finally:
+            await rows.close()
+
+    @staticmethod
+    def _transactions_stmt() -> Select:
+        """
+        Columns of transaction entities - rows, not ORM instances, with category columns of outer join.
+        Soft delete filters are explicit: rewriter would filter out transactions of deleted categories,
+        which are shown, as ORM loads them. Statement opts out of rewriting together with its subqueries,
+        so statements built on it filter deleted rows of their subqueries too.
+        """
+        return select(
+            *TransactionDataMapper.columns
+        ).select_from(
+            TransactionModel
+        ).outerjoin(
+            CategoryModel,
+            CategoryModel.id == TransactionModel.category_id
+        ).where(
+            TransactionModel.deleted_at.is_(None)
+        ).execution_options(include_deleted=True)
+
+    @staticmethod
+    def _user_transactions_stmt(user_id: uuid.UUID) -> Select:
+        """Transactions of accounts accessible by user, one per ledger entry of these accounts - as account history"""
+        user_accounts = select(
+            AccountModel.id,
             AccountModel.number
         ).join(
             AccountAccessModel,
@@ -57,41 +355,109 @@ class TransactionSqlAlchemyRepository(TransactionRepository, SqlAlchemyRepositor
             )
         ).where(
             and_(
-                AccountModel.deleted_at.is_(None)
+                AccountModel.deleted_at.is_(None),
+                AccountAccessModel.deleted_at.is_(None)
             )
+        ).cte('user_accounts')
+
+        return TransactionSqlAlchemyRepository._transactions_stmt().join(
+            LedgerEntryModel,
+            LedgerEntryModel.transaction_id == TransactionModel.id
+        ).join(
+            user_accounts,
+            user_accounts.c.id == LedgerEntryModel.account_id
+        ).where(
+            and_(
+                LedgerEntryModel.deleted_at.is_(None),
+                TransactionModel.type != TransactionType.CORRECTION.value,
+                # transfer between user accounts has two legs of user accounts - its debit leg is kept
+                or_(
+                    TransactionModel.debit_account == user_accounts.c.number,
+                    TransactionModel.debit_account.is_(None),
+                    TransactionModel.debit_account.not_in(select(user_accounts.c.number))
+                )
+            )
+        )
+
+    async def get_account_transactions(
+            self,
+            account_number: AccountNumber,
+            limit: int | None = None,
+            cursor: Cursor | None = None
+    ) -> Page[Transaction]:
+        stmt = self._account_ledger_stmt(account_number).where(
+            TransactionModel.type != TransactionType.CORRECTION.value
         )
 
-        stmt = select(TransactionModel).where(
-            or_(
-                TransactionModel.debit_account.in_(user_accounts__subquery),
-                TransactionModel.credit_account.in_(user_accounts__subquery),
+        return await self._get_page(stmt, limit, cursor)
+
+    @staticmethod
+    def _account_ledger_stmt(account_number: AccountNumber) -> Select:
+        """Transactions of account, one per account ledger entry"""
+        account_id__subquery = select(
+            AccountModel.id
+        ).where(
+            and_(
+                AccountModel.number == account_number,
+                AccountModel.deleted_at.is_(None)
             )
+        ).scalar_subquery()
+
+        return TransactionSqlAlchemyRepository._transactions_stmt().join(
+            LedgerEntryModel,
+            LedgerEntryModel.transaction_id == TransactionModel.id
         ).where(
-            TransactionModel.type != TransactionType.CORRECTION.value
-        ).order_by(
-            TransactionModel.created_at.desc()
+            and_(
+                LedgerEntryModel.account_id == account_id__subquery,
+                LedgerEntryModel.deleted_at.is_(None)
+            )
         )
 
-        async with self._session:
-            instances = (await self._session.scalars(stmt)).all()
+    async def _get_page(
+            self,
+            stmt: Select,
+            limit: int | None,
+            cursor: Cursor | None
+    ) -> Page[Transaction]:
+        """
+        Keyset pagination in `created_at desc, id desc` order of ledger entries of listed transactions,
+        so pages are read through ledger entry (account_id, created_at, transaction_id) index.
+        One extra row is fetched to find out whether the next page exists.
+        """
+        created_at, transaction_id = LedgerEntryModel.created_at, LedgerEntryModel.transaction_id
+        if cursor is not None:
+            stmt = stmt.where(tuple_(created_at, transaction_id) < tuple_(cursor.created_at, cursor.id))
+        stmt = stmt.order_by(created_at.desc(), transaction_id.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)
+
+        rows = (await self._session.execute(stmt)).all()
 
-        return [self._get_entity(instance) for instance in instances]
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = Cursor(created_at=last.created_at, id=last.id).encode()
 
-    async def get_account_transactions(self, account_number: AccountNumber) -> list[Transaction]:
-        stmt = select(TransactionModel).where(
+        return Page(self._rows_to_entities(rows), next_cursor=next_cursor)
+
+    async def get_account_transactions_between(
+            self,
+            account_number: AccountNumber,
+            start: datetime,
+            end: datetime
+    ) -> list[Transaction]:
+        """All account transactions (corrections included) created in [start, end), oldest first"""
+        stmt = self._account_ledger_stmt(account_number).where(
             and_(
-                or_(
-                    TransactionModel.debit_account == account_number,
-                    TransactionModel.credit_account == account_number
-                ),
-                TransactionModel.type != TransactionType.CORRECTION.value
+                LedgerEntryModel.created_at >= start,
+                LedgerEntryModel.created_at < end,
+                LedgerEntryModel.deleted_at.is_(None)
             )
         ).order_by(
-            TransactionModel.created_at.desc()
+            LedgerEntryModel.created_at
         )
 
-        async with self._session:
-            instances = (await self._session.scalars(stmt)).all()
-
-        return [self._get_entity(instance) for instance in instances]
+        rows = (await self._session.execute(stmt)).all()
 
+        return self._rows_to_entities(rows)
@@ -34,8 +34,7 @@ class UserSqlAlchemyRepository(UserRepository, SqlAlchemyRepository):
     async def get_by_name(self, name: str):
         stmt = select(UserModel).filter_by(username=name).limit(1)
 
-        async with self._session:
-            instance = (await self._session.scalars(stmt)).first()
+        instance = (await self._session.scalars(stmt)).first()
 
         return self._get_entity(instance)
 
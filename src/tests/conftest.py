@@ -64,6 +64,7 @@ async def clean_db(container):
     yield
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    container.query_cache().clear()
 
 
 @pytest_asyncio.fixture
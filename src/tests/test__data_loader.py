@@ -0,0 +1,141 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from shared.exceptions import EntityNotFoundException
+from shared.repositories import DataLoader
+from storage.models import CategoryModel
+
+
+@pytest.fixture
+def statements(container):
+    executed = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = container.engine().sync_engine
+    event.listen(engine, 'before_cursor_execute', on_execute)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', on_execute)
+
+
+@pytest.mark.asyncio
+async def test__data_loader__get_by_id__one_query(
+        clean_db, container, statements, existing_custom_category, existing_general_category
+):
+    category_ids = [existing_custom_category.id, existing_general_category.id]
+
+    async with container.db_session()() as session:
+        repo = container.category_repo()
+        repo.session = session
+        statements.clear()
+
+        categories = await asyncio.gather(*(repo.get_by_id(category_id) for category_id in category_ids * 2))
+
+    assert [category.id for category in categories] == category_ids * 2
+    # identical lookups share one load
+    assert categories[0] is categories[2]
+    assert len([statement for statement in statements if statement.lstrip().upper().startswith('SELECT')]) == 1
+
+
+@pytest.mark.asyncio
+async def test__data_loader__get_by_number__one_query(clean_db, container, statements, user_accounts):
+    user, accounts = user_accounts
+
+    async with container.db_session()() as session:
+        repo = container.account_repo()
+        repo.session = session
+        statements.clear()
+
+        found = await asyncio.gather(*(repo.get_by_number(account.number, user.id) for account in accounts))
+        by_id = await repo.get_by_id(accounts[0].id)
+
+    assert [account.id for account in found] == [account.id for account in accounts]
+    assert [account.balance for account in found] == [account.balance for account in accounts]
+    assert by_id == found[0]
+    # accessible accounts of user are loaded with accounts, lookup by id is served by session cache
+    assert len([statement for statement in statements if statement.lstrip().upper().startswith('SELECT')]) == 1
+
+
+@pytest.mark.asyncio
+async def test__data_loader__get_by_id__identity_map(clean_db, container, statements, existing_custom_category):
+    async with container.db_session()() as session:
+        repo = container.category_repo()
+        repo.session = session
+        instance = await session.get(CategoryModel, existing_custom_category.id)
+        statements.clear()
+
+        category = await repo.get_by_id(existing_custom_category.id)
+
+    assert category.id == instance.id
+    # instance loaded in session is mapped without query
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test__data_loader__not_found(clean_db, container, existing_general_category):
+    async with container.db_session()() as session:
+        repo = container.category_repo()
+        repo.session = session
+
+        missing_id = uuid.uuid4()
+        results = await asyncio.gather(
+            repo.get_by_id(existing_general_category.id),
+            repo.get_by_id(missing_id),
+            return_exceptions=True
+        )
+
+    assert results[0].id == existing_general_category.id
+    assert isinstance(results[1], EntityNotFoundException)
+
+
+@pytest.mark.asyncio
+async def test__data_loader__batches():
+    batches = []
+
+    async def batch_load(session, keys):
+        batches.append(list(keys))
+        await asyncio.sleep(0)
+        if 'fail' in keys:
+            raise ValueError('batch failed')
+        return {key: key.upper() for key in keys if key != 'missing'}
+
+    loader = DataLoader(session=None, batch_load=batch_load)
+
+    assert await asyncio.gather(loader.load('a'), loader.load('b'), loader.load('a'), loader.load('missing')) \
+        == ['A', 'B', 'A', None]
+    assert batches == [['a', 'b', 'missing']]
+
+    # keys requested during the load make the next batch, keys in flight are not loaded again
+    first = asyncio.gather(loader.load('c'), loader.load('d'))
+    await asyncio.sleep(0)
+    second = asyncio.gather(loader.load('c'), loader.load('e'))
+    assert await first == ['C', 'D'] and await second == ['C', 'E']
+    assert batches[1:] == [['c', 'd'], ['e']]
+
+    with pytest.raises(ValueError):
+        await asyncio.gather(loader.load('fail'), loader.load('f'))
+    assert await loader.load('f') == 'F'
+
+
+@pytest.mark.asyncio
+async def test__data_loader__cancelled_lookup():
+    async def batch_load(session, keys):
+        await asyncio.sleep(0)
+        return {key: key.upper() for key in keys}
+
+    async def lookup(key):
+        return await loader.load(key)
+
+    loader = DataLoader(session=None, batch_load=batch_load)
+
+    cancelled, waiting = asyncio.create_task(lookup('a')), asyncio.create_task(lookup('a'))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    # cancellation of one lookup does not cancel another lookup of the same key
+    assert await waiting == 'A'
+    assert cancelled.cancelled()
@@ -0,0 +1,82 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from domain.account.commands import CreateAccountDTO
+from domain.category.commands import CreateCustomCategoryDTO
+from domain.category.queries import GetCategoriesDTO
+from domain.user.commands import CreateUserDTO
+from domain.user.queries import GetUsersDTO
+from shared.exceptions import EntityNotFoundException
+
+
+@pytest.mark.asyncio
+async def test__execute_many__users(clean_db, container):
+    app = container.app()
+    names = [f'user {i}' for i in range(5)]
+
+    results = await app.execute_many(
+        [CreateUserDTO(name=name) for name in names],
+        container.db_session(),
+        chunk_size=2
+    )
+    db_users = await app.execute(GetUsersDTO(), container.db_session())
+
+    assert all(result.is_success for result in results)
+    assert [result.result.name for result in results] == names
+    assert sorted(user.name for user in db_users) == sorted(names)
+
+
+@pytest.mark.asyncio
+async def test__execute_many__failed_action_is_reported(clean_db, container, user):
+    app = container.app()
+    actions = [
+        CreateCustomCategoryDTO(name='books', user_id=user.id),
+        CreateAccountDTO(user_id=uuid.uuid4(), name='account of unknown user'),
+        CreateCustomCategoryDTO(name='games', user_id=user.id),
+    ]
+
+    results = await app.execute_many(actions, container.db_session())
+    categories = await app.execute(GetCategoriesDTO(user_id=user.id, with_general=False), container.db_session())
+
+    assert [result.action for result in results] == actions
+    assert results[0].is_success and results[2].is_success
+    assert isinstance(results[1].error, EntityNotFoundException)
+    assert results[1].result is None
+    assert sorted(category.name for category in categories) == ['books', 'games']
+
+
+@pytest.mark.asyncio
+async def test__execute_many__savepoints_for_failed_chunk_only(clean_db, container, user):
+    executed = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement.upper())
+
+    app = container.app()
+    engine = container.engine().sync_engine
+    event.listen(engine, 'before_cursor_execute', on_execute)
+    try:
+        results = await app.execute_many(
+            [CreateCustomCategoryDTO(name=name, user_id=user.id) for name in ('books', 'games')],
+            container.db_session()
+        )
+        savepoints_of_successful_chunk = sum('SAVEPOINT' in statement for statement in executed)
+
+        results += await app.execute_many(
+            [
+                CreateCustomCategoryDTO(name='music', user_id=user.id),
+                CreateAccountDTO(user_id=uuid.uuid4(), name='account of unknown user'),
+            ],
+            container.db_session()
+        )
+    finally:
+        event.remove(engine, 'before_cursor_execute', on_execute)
+    categories = await app.execute(GetCategoriesDTO(user_id=user.id, with_general=False), container.db_session())
+
+    assert savepoints_of_successful_chunk == 0
+    # failed chunk is executed again, action by action in savepoints
+    assert any('SAVEPOINT' in statement for statement in executed)
+    assert [result.is_success for result in results] == [True, True, True, False]
+    assert sorted(category.name for category in categories) == ['books', 'games', 'music']
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from domain.transaction.queries import ExportTransactionsDTO, GetUserTransactionsDTO
+from shared.exceptions import IncorrectData
+from tests.conftest import user_accounts_transactions, another_user_transactions
+
+
+@pytest.mark.asyncio
+async def test__export_transactions(
+        clean_db,
+        container,
+        tmp_path,
+        user_accounts_transactions,
+        another_user_transactions
+):
+    app = container.app()
+    user, _, transactions = user_accounts_transactions
+    path = tmp_path / 'transactions.parquet'
+
+    exported = await app.execute(
+        ExportTransactionsDTO(
+            user_id=user.id,
+            from_=datetime(2000, 1, 1),
+            to=datetime.utcnow() + timedelta(minutes=1),
+            path=path,
+            batch_size=3
+        ),
+        container.db_session()
+    )
+    db_transactions = await app.execute(GetUserTransactionsDTO(user_id=user.id), container.db_session())
+    parquet_file = pq.ParquetFile(path)
+    table = parquet_file.read()
+
+    assert exported == len(transactions) == table.num_rows
+    assert parquet_file.num_row_groups == -(-len(transactions) // 3)
+    assert table.schema.field('amount').type == pa.decimal128(14, 2)
+    assert pa.types.is_dictionary(table.schema.field('credit_account').type)
+    assert pa.types.is_dictionary(table.schema.field('category').type)
+    assert table.column('id').to_pylist() == [str(tx.id) for tx in db_transactions]
+    assert table.column('amount').to_pylist() == [tx.amount for tx in db_transactions]
+    assert sum(table.column('amount').to_pylist()) == sum(tx.amount for tx in transactions)
+
+
+@pytest.mark.asyncio
+async def test__export_transactions__empty_period(clean_db, container, tmp_path, user_accounts_transactions):
+    app = container.app()
+    user, _, _ = user_accounts_transactions
+    path = tmp_path / 'transactions.parquet'
+
+    exported = await app.execute(
+        ExportTransactionsDTO(user_id=user.id, from_=datetime(2000, 1, 1), to=datetime(2001, 1, 1), path=path),
+        container.db_session()
+    )
+
+    assert exported == 0
+    assert pq.read_table(path).num_rows == 0
+
+
+@pytest.mark.asyncio
+async def test__export_transactions__incorrect_period(clean_db, container, tmp_path, user):
+    app = container.app()
+
+    with pytest.raises(IncorrectData):
+        await app.execute(
+            ExportTransactionsDTO(
+                user_id=user.id,
+                from_=datetime(2001, 1, 1),
+                to=datetime(2000, 1, 1),
+                path=tmp_path / 'transactions.parquet'
+            ),
+            container.db_session()
+        )
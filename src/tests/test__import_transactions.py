@@ -0,0 +1,90 @@
+import io
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from domain.account.commands import UpdateAccountBalanceDTO
+from domain.account.queries import GetAccountByIdDTO, GetAccountBalanceAtDTO
+from domain.transaction.commands import ImportTransactionsDTO
+from domain.transaction.queries import GetAccountTransactionsDTO
+from domain.transaction.entities import TransactionType
+from shared.exceptions import IncorrectData
+
+
+def _csv(rows: list[str]) -> io.StringIO:
+    return io.StringIO('\n'.join(['credit_account,debit_account,amount,category,created_at', *rows]))
+
+
+@pytest.mark.asyncio
+async def test__import_transactions(clean_db, container, user_accounts, existing_general_category):
+    app = container.app()
+    user, accounts = user_accounts
+    first, second = accounts[0], accounts[1]
+
+    result = await app.execute(
+        ImportTransactionsDTO(
+            user_id=user.id,
+            file=_csv([
+                f',{first.number},100.00,,',
+                f'{first.number},{second.number},30.50,{existing_general_category.name},',
+                f',{second.number},5,,2020-01-15',
+                f'unknown,{second.number},5,,',
+                f',{second.number},five,,',
+                f'{first.number},,1000000,,',
+                f',{second.number},5,unknown category,',
+            ]),
+            batch_size=2
+        ),
+        container.db_session()
+    )
+    db_first = await app.execute(GetAccountByIdDTO(user.id, first.id), container.db_session())
+    db_second = await app.execute(GetAccountByIdDTO(user.id, second.id), container.db_session())
+    second_txs = await app.execute(GetAccountTransactionsDTO(user.id, second.number), container.db_session())
+
+    assert result.imported == 3
+    assert [rejected.line for rejected in result.rejected] == [5, 6, 7, 8]
+    assert db_first.balance == first.balance + Decimal('69.50')
+    assert db_second.balance == second.balance + Decimal('35.50')
+    assert [tx.type for tx in second_txs] == [TransactionType.TRANSFER, TransactionType.INCOME]
+    assert second_txs[0].category_id == existing_general_category.id
+
+
+@pytest.mark.asyncio
+async def test__import_transactions__backdated(clean_db, container, user_accounts):
+    app = container.app()
+    user, accounts = user_accounts
+    account = accounts[0]
+
+    await app.execute(
+        ImportTransactionsDTO(
+            user_id=user.id,
+            file=_csv([
+                f',{account.number},5,,2020-01-15',
+                f',{account.number},7,,2020-03-01T10:00:00',
+            ])
+        ),
+        container.db_session()
+    )
+    balance_2020_02 = await app.execute(
+        GetAccountBalanceAtDTO(user.id, account.number, datetime(2020, 2, 1)),
+        container.db_session()
+    )
+    balance_now = await app.execute(
+        GetAccountBalanceAtDTO(user.id, account.number, datetime.utcnow()),
+        container.db_session()
+    )
+    verified_account = await app.execute(UpdateAccountBalanceDTO(user.id, account.number), container.db_session())
+
+    assert balance_2020_02 == Decimal('5.00')
+    assert balance_now == account.balance + Decimal('12.00')
+    # incremental balance matches full recompute
+    assert verified_account.balance == account.balance + Decimal('12.00')
+
+
+@pytest.mark.asyncio
+async def test__import_transactions__incorrect_batch_size(clean_db, container, user):
+    app = container.app()
+
+    with pytest.raises(IncorrectData):
+        await app.execute(ImportTransactionsDTO(user_id=user.id, file=_csv([]), batch_size=0), container.db_session())
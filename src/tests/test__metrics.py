@@ -0,0 +1,110 @@
+import uuid
+
+import pytest
+from sqlalchemy import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.metrics import PoolMetrics
+
+from domain.account.commands import AddTransactionDTO
+from domain.user.commands import CreateUserDTO
+from domain.user.queries import GetUserDTO, GetUsersDTO
+from shared.exceptions import EntityNotFoundException
+
+
+@pytest.mark.asyncio
+async def test__metrics__calls_and_statements(clean_db, container):
+    app = container.app()
+    app.metrics.reset()
+
+    await app.execute(CreateUserDTO(name='user 1'), container.db_session())
+    await app.execute(CreateUserDTO(name='user 2'), container.db_session())
+    await app.execute(GetUsersDTO(), container.db_session())
+    stats = app.stats()
+
+    assert stats['CreateUserDTO'].calls == 2
+    assert stats['CreateUserDTO'].errors == 0
+    assert stats['CreateUserDTO'].statements >= 2
+    assert stats['CreateUserDTO'].rows >= 2
+    assert stats['GetUsersDTO'].calls == 1
+    assert stats['GetUsersDTO'].statements == 1
+    assert stats['GetUsersDTO'].rows == 2
+    assert sum(stats['GetUsersDTO'].latency_histogram.values()) == 1
+
+
+@pytest.mark.asyncio
+async def test__metrics__errors_and_sink(clean_db, container):
+    app = container.app()
+    app.metrics.reset()
+    samples = []
+    app.metrics.add_sink(samples.append)
+
+    try:
+        with pytest.raises(EntityNotFoundException):
+            await app.execute(GetUserDTO(id=uuid.uuid4()), container.db_session())
+    finally:
+        app.metrics.remove_sink(samples.append)
+    stats = app.stats()
+
+    assert stats['GetUserDTO'].calls == 1
+    assert stats['GetUserDTO'].errors == 1
+    assert [(sample.action, sample.error) for sample in samples] == [('GetUserDTO', 'EntityNotFoundException')]
+
+
+@pytest.mark.asyncio
+async def test__metrics__nested_actions(clean_db, container, user_accounts):
+    app = container.app()
+    user, accounts = user_accounts
+    app.metrics.reset()
+
+    await app.execute(
+        AddTransactionDTO(user_id=user.id, credit_account=None, debit_account=accounts[0].number, amount=10),
+        container.db_session()
+    )
+    stats = app.stats()
+
+    # statements of nested CreateTransactionDTO are counted for AddTransactionDTO as well
+    assert stats['CreateTransactionDTO'].calls == 1
+    assert 0 < stats['CreateTransactionDTO'].statements <= stats['AddTransactionDTO'].statements
+
+
+@pytest.mark.asyncio
+async def test__pool_metrics__application(clean_db, container):
+    app = container.app()
+    stats_before = app.pool_stats()
+
+    await app.execute(CreateUserDTO(name='user'), container.db_session())
+    await app.execute(GetUsersDTO(), container.db_session())
+    stats = app.pool_stats()
+
+    # one connection per unit of work
+    assert stats.checkouts == stats_before.checkouts + 2
+    assert stats.checkout_waits == stats_before.checkout_waits + 2
+    assert stats.in_use == 0
+    assert stats.connects > stats_before.connects
+
+
+@pytest.mark.asyncio
+async def test__pool_metrics__overflow(tmp_path):
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path / "pool.db"}',
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=1
+    )
+    metrics = PoolMetrics(engine)
+
+    try:
+        async with engine.connect(), engine.connect():
+            in_use = metrics.snapshot().in_use
+        async with engine.connect():
+            pass
+    finally:
+        await engine.dispose()
+    stats = metrics.snapshot()
+
+    assert in_use == 2
+    assert (stats.checkouts, stats.in_use, stats.max_in_use) == (3, 0, 2)
+    # overflow connection is closed on checkin, pooled one is reused
+    assert (stats.connects, stats.overflow_connects) == (2, 1)
+    assert stats.max_connect_time > 0
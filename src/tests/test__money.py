@@ -0,0 +1,47 @@
+import copy
+from decimal import Decimal
+
+from shared.money import Money
+
+
+def test__money__conversions():
+    assert Money.from_decimal(Decimal('10.005')) == Money(1000)  # quantized as Decimal: half even
+    assert Money.from_decimal(Decimal('10.015')) == Money(1002)
+    assert Money.from_decimal(10) == Money(1000)
+    assert Money.from_decimal('0.1') == Money(10)
+    assert Money.from_decimal(Money(10)) == Money(10)
+
+    assert Money.from_decimal(Decimal('-123456789012.34')).cents == -12345678901234
+    assert str(Money(-5)) == '-0.05'
+    assert f'{Money(1050)}' == '10.50'
+    assert float(Money(1050)) == 10.5
+    assert Money(1050).to_decimal().as_tuple() == Decimal('10.50').as_tuple()
+
+
+def test__money__arithmetic():
+    amount = Money(1050)
+
+    assert amount + Money(50) == Money(1100)
+    assert Money(2000) - amount == Money(950)
+    assert amount * 2 == Money(2100)
+    assert amount * Decimal('0.5') == Decimal('5.25')
+    assert Money.sum([amount, amount]) == sum([amount, amount]) == Money(2100)
+    assert -amount < Money.ZERO and abs(-amount) == amount
+    assert not Money.ZERO
+    assert copy.deepcopy(amount) == amount
+    # results of arithmetic are Money, numbers are currency units
+    assert type(amount + amount) is Money and type(-amount) is Money
+    assert amount + 1 == Money(1150) and 20 - amount == Money(950)
+
+
+def test__money__decimal_comparisons():
+    amount = Money.from_decimal('10.50')
+
+    assert amount == Decimal('10.50') and Decimal('10.50') == amount
+    assert amount != 1050 and amount == 10.5
+    assert hash(amount) == hash(Decimal('10.50'))
+    assert Money(1000) == 10 and hash(Money(1000)) == hash(10)
+
+    assert Money(1050) < Decimal(20) and not Money(1050) > Decimal(20)
+    assert Decimal(20) > Money(1050) and Decimal('10.49') < amount <= Decimal('10.50')
+    assert 10 < amount < 11 and amount >= 10.5
@@ -0,0 +1,163 @@
+from decimal import Decimal
+
+import pytest
+
+from core.cache import QueryCache
+from domain.account.commands import AddTransactionDTO, ShareAccountAccessDTO
+from domain.account.queries import GetAllUserAccountsDTO
+from domain.category.commands import CreateCustomCategoryDTO
+from domain.category.queries import GetCategoriesDTO
+from domain.transaction.queries import GetUserTransactionsDTO
+from domain.user.queries import GetUsersDTO
+
+
+@pytest.mark.asyncio
+async def test__query_cache__hit(clean_db, container, user_accounts):
+    app = container.app()
+    user, accounts = user_accounts
+    app.metrics.reset()
+    stats_before = app.cache_stats()
+
+    first = await app.execute(GetAllUserAccountsDTO(user.id), container.db_session())
+    first[0].name = 'changed by caller'
+    second = await app.execute(GetAllUserAccountsDTO(user.id), container.db_session())
+    stats = app.cache_stats()
+
+    assert app.stats()['GetAllUserAccountsDTO'].calls == 1
+    assert stats.hits == stats_before.hits + 1
+    assert stats.misses == stats_before.misses + 1
+    # cached result is not affected by changes of returned one
+    assert sorted(account.name for account in second) == sorted(account.name for account in accounts)
+
+
+@pytest.mark.asyncio
+async def test__query_cache__not_cached_query(clean_db, container, user):
+    app = container.app()
+    app.metrics.reset()
+
+    await app.execute(GetUsersDTO(), container.db_session())
+    await app.execute(GetUsersDTO(), container.db_session())
+
+    assert app.stats()['GetUsersDTO'].calls == 2
+
+
+@pytest.mark.asyncio
+async def test__query_cache__invalidated_by_command(clean_db, container, user_accounts):
+    app = container.app()
+    user, accounts = user_accounts
+
+    await app.execute(GetAllUserAccountsDTO(user.id), container.db_session())
+    await app.execute(GetCategoriesDTO(user.id), container.db_session())
+    await app.execute(
+        AddTransactionDTO(user_id=user.id, credit_account=None, debit_account=accounts[0].number, amount=10),
+        container.db_session()
+    )
+    await app.execute(CreateCustomCategoryDTO(name='books', user_id=user.id), container.db_session())
+    db_accounts = await app.execute(GetAllUserAccountsDTO(user.id), container.db_session())
+    categories = await app.execute(GetCategoriesDTO(user.id), container.db_session())
+
+    db_account = next(account for account in db_accounts if account.id == accounts[0].id)
+    assert db_account.balance == accounts[0].balance + Decimal('10.00')
+    assert 'books' in [category.name for category in categories]
+
+
+@pytest.mark.asyncio
+async def test__query_cache__shared_account(clean_db, container, user_accounts, another_user):
+    app = container.app()
+    user, accounts = user_accounts
+    await app.execute(
+        ShareAccountAccessDTO(
+            account_number=accounts[0].number,
+            account_owner_id=user.id,
+            share_access_with_id=another_user.id
+        ),
+        container.db_session()
+    )
+
+    await app.execute(GetAllUserAccountsDTO(another_user.id), container.db_session())
+    # owner adds transaction to shared account, cached accounts of another user are stale
+    await app.execute(
+        AddTransactionDTO(user_id=user.id, credit_account=None, debit_account=accounts[0].number, amount=10),
+        container.db_session()
+    )
+    shared_accounts = await app.execute(GetAllUserAccountsDTO(another_user.id), container.db_session())
+
+    assert [account.balance for account in shared_accounts] == [accounts[0].balance + Decimal('10.00')]
+
+
+@pytest.mark.asyncio
+async def test__query_cache__user_transactions(clean_db, container, user_accounts, another_user_account):
+    app = container.app()
+    user, accounts = user_accounts
+    another_user, another_account = another_user_account
+    await app.execute(
+        ShareAccountAccessDTO(
+            account_number=accounts[0].number,
+            account_owner_id=user.id,
+            share_access_with_id=another_user.id
+        ),
+        container.db_session()
+    )
+    await app.execute(GetUserTransactionsDTO(user.id), container.db_session())
+    another_user_txs = await app.execute(GetUserTransactionsDTO(another_user.id), container.db_session())
+    app.metrics.reset()
+
+    # transaction of another user does not drop cached transactions of user
+    await app.execute(
+        AddTransactionDTO(user_id=another_user.id, credit_account=None, debit_account=another_account.number, amount=10),
+        container.db_session()
+    )
+    await app.execute(GetUserTransactionsDTO(user.id), container.db_session())
+    assert 'GetUserTransactionsDTO' not in app.stats()
+
+    # owner adds transaction to shared account, cached transactions of another user are stale
+    tx = await app.execute(
+        AddTransactionDTO(user_id=user.id, credit_account=None, debit_account=accounts[0].number, amount=10),
+        container.db_session()
+    )
+    shared_txs = await app.execute(GetUserTransactionsDTO(another_user.id), container.db_session())
+
+    assert len(shared_txs) == len(another_user_txs) + 2
+    assert tx.id in [shared_tx.id for shared_tx in shared_txs]
+
+
+def test__query_cache__lru_and_ttl():
+    now = [0.0]
+    cache = QueryCache(maxsize=2, ttl=10, timer=lambda: now[0])
+
+    cache.put('a', 1, ['tag:a'], cache.version)
+    cache.put('b', 2, ['tag:b'], cache.version)
+    cache.get('a')
+    cache.put('c', 3, ['tag:a'], cache.version)
+
+    assert cache.get('b') == (False, None)  # least recently used
+    assert cache.get('a') == (True, 1)
+
+    cache.invalidate(['tag:a'])
+    assert cache.get('a') == (False, None)
+    assert cache.get('c') == (False, None)
+
+    cache.put('d', 4, [], cache.version)
+    now[0] = 10
+    assert cache.get('d') == (False, None)
+
+    # result of query, which was being executed while invalidation happened, is not stored
+    version = cache.version
+    cache.invalidate(None)
+    cache.put('e', 5, [], version)
+    assert cache.get('e') == (False, None)
+    assert cache.stats().size == 0
+
+
+def test__query_cache__snapshots():
+    cache = QueryCache()
+    result = [{'name': 'a'}]
+
+    cache.put('a', result, [], cache.version)
+    result[0]['name'] = 'changed after put'
+    cache.get('a')[1][0]['name'] = 'changed after hit'
+    assert cache.get('a') == (True, [{'name': 'a'}])
+
+    # not picklable result is not cached
+    cache.put('b', lambda: None, [], cache.version)
+    assert cache.get('b') == (False, None)
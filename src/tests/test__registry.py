@@ -0,0 +1,40 @@
+import pytest
+
+from core.handlers_manifest import HANDLERS
+from core.registry import HandlerRegistry, build_manifest, introspect
+from domain.user.commands import CreateUserDTO, create_user
+from shared.interfaces import Command
+
+
+def test__handlers_manifest__up_to_date():
+    # regenerate with `python -m core.registry > core/handlers_manifest.py`
+    assert HANDLERS == build_manifest()
+
+
+def test__registry__lazy_resolution():
+    registry = HandlerRegistry(HANDLERS)
+
+    assert registry.stats().resolved_handlers == 0
+    assert CreateUserDTO in registry
+    assert registry[CreateUserDTO] is create_user
+    assert registry.stats().resolved_handlers == 1
+
+
+def test__registry__warm_up():
+    registry = HandlerRegistry(HANDLERS)
+
+    stats = registry.warm_up()
+
+    assert stats.resolved_handlers == len(HANDLERS)
+    assert {action: registry[action] for action in introspect()} == introspect()
+
+
+def test__registry__unknown_action():
+    class UnknownDTO(Command):
+        pass
+
+    registry = HandlerRegistry(HANDLERS)
+
+    assert UnknownDTO not in registry
+    with pytest.raises(KeyError):
+        registry[UnknownDTO]
@@ -0,0 +1,132 @@
+from decimal import Decimal
+
+import pytest
+
+from core.app import Application
+from core.cache import QueryCache
+from core.replicas import ReplicaRouter
+from domain.account.commands import CreateAccountDTO, ShareAccountAccessDTO
+from domain.account.queries import GetAllUserAccountsDTO
+from domain.user.commands import CreateUserDTO, UpdateUserDTO
+from domain.user.queries import GetUsersDTO, GetUserDTO, GetUserByNameDTO
+
+
+class CountingSessionMaker:
+    def __init__(self, session_maker):
+        self.session_maker = session_maker
+        self.calls = 0
+
+    def __call__(self, **kwargs):
+        self.calls += 1
+        return self.session_maker(**kwargs)
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def replicated_app(container):
+    # replicas are emulated by session makers of the test database
+    primary = CountingSessionMaker(container.db_session())
+    replicas = [CountingSessionMaker(container.db_session()) for _ in range(2)]
+    timer = FakeTimer()
+    app = Application(
+        query_cache=QueryCache(maxsize=0),
+        replica_router=ReplicaRouter(replicas, read_your_writes_window=5.0, timer=timer)
+    )
+    return app, primary, replicas, timer
+
+
+@pytest.mark.asyncio
+async def test__replicas__queries_round_robin(clean_db, container, user, replicated_app):
+    app, primary, replicas, _ = replicated_app
+
+    for _ in range(4):
+        await app.execute(GetUsersDTO(), primary)
+
+    assert primary.calls == 0
+    assert [replica.calls for replica in replicas] == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test__replicas__read_your_writes(clean_db, container, user, replicated_app):
+    app, primary, replicas, timer = replicated_app
+
+    account = await app.execute(CreateAccountDTO(user.id, 'account', Decimal(10.00)), primary)
+    assert primary.calls == 1
+
+    # reads of the writer are pinned to the primary during the window
+    accounts = await app.execute(GetAllUserAccountsDTO(user.id), primary)
+    assert primary.calls == 2
+    assert [account.id for account in accounts] == [account.id]
+
+    # reads of other actions are not pinned
+    await app.execute(GetUsersDTO(), primary)
+    assert sum(replica.calls for replica in replicas) == 1
+
+    timer.now += 5.0
+    await app.execute(GetAllUserAccountsDTO(user.id), primary)
+    assert primary.calls == 2
+    assert sum(replica.calls for replica in replicas) == 2
+
+
+@pytest.mark.asyncio
+async def test__replicas__read_your_writes__affected_users(clean_db, container, user, another_user, replicated_app):
+    app, primary, replicas, timer = replicated_app
+
+    await app.execute(UpdateUserDTO(id=user.id, name='renamed'), primary)
+    # user is read by `id`
+    db_user = await app.execute(GetUserDTO(id=user.id), primary)
+    assert primary.calls == 2
+    assert db_user.name == 'renamed'
+
+    account = await app.execute(CreateAccountDTO(user.id, 'account', Decimal(10.00)), primary)
+    timer.now += 5.0
+    await app.execute(
+        ShareAccountAccessDTO(
+            account_number=account.number,
+            account_owner_id=user.id,
+            share_access_with_id=another_user.id
+        ),
+        primary
+    )
+    # both the owner and the user, whom access is shared with, read own writes
+    await app.execute(GetAllUserAccountsDTO(user.id), primary)
+    await app.execute(GetAllUserAccountsDTO(another_user.id), primary)
+    assert primary.calls == 6
+    assert sum(replica.calls for replica in replicas) == 0
+
+    # user of lookup by name is not known in advance: primary is read while any write is within the window
+    new_user = await app.execute(CreateUserDTO(name='new user'), primary)
+    await app.execute(GetUserByNameDTO(name='new user'), primary)
+    assert primary.calls == 8
+    await app.execute(GetUserDTO(id=new_user.id), primary)
+    assert primary.calls == 9
+
+    timer.now += 5.0
+    await app.execute(GetUserByNameDTO(name='new user'), primary)
+    assert primary.calls == 9
+
+
+@pytest.mark.asyncio
+async def test__replicas__replica_results_cached_after_window(clean_db, container, user, another_user):
+    primary = CountingSessionMaker(container.db_session())
+    replicas = [CountingSessionMaker(container.db_session())]
+    timer = FakeTimer()
+    app = Application(replica_router=ReplicaRouter(replicas, read_your_writes_window=5.0, timer=timer))
+
+    await app.execute(UpdateUserDTO(id=user.id, name='renamed'), primary)
+    # replica may not have the update yet, its result is not cached
+    await app.execute(GetUserDTO(id=another_user.id), primary)
+    await app.execute(GetUserDTO(id=another_user.id), primary)
+    assert replicas[0].calls == 2
+
+    timer.now += 5.0
+    await app.execute(GetUserDTO(id=another_user.id), primary)
+    await app.execute(GetUserDTO(id=another_user.id), primary)
+    assert replicas[0].calls == 3
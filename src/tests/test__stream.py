@@ -0,0 +1,55 @@
+import pytest
+
+from domain.transaction.queries import GetUserTransactionsDTO, StreamUserTransactionsDTO
+from domain.user.queries import GetUsersDTO
+from shared.exceptions import IncorrectData
+from tests.conftest import user_accounts_transactions, another_user_transactions
+
+
+@pytest.mark.asyncio
+async def test__stream__user_transactions(
+        clean_db,
+        container,
+        user_accounts_transactions,
+        another_user_transactions
+):
+    app = container.app()
+    user, _, transactions = user_accounts_transactions
+
+    db_transactions = await app.execute(GetUserTransactionsDTO(user_id=user.id), container.db_session())
+    streamed_transactions = [
+        tx async for tx in app.stream(StreamUserTransactionsDTO(user_id=user.id, batch_size=2), container.db_session())
+    ]
+
+    assert len(streamed_transactions) == len(transactions)
+    assert streamed_transactions == db_transactions
+
+
+@pytest.mark.asyncio
+async def test__stream__closed_before_exhausted(clean_db, container, user_accounts_transactions):
+    app = container.app()
+    user, _, transactions = user_accounts_transactions
+
+    stream = app.stream(StreamUserTransactionsDTO(user_id=user.id, batch_size=1), container.db_session())
+    first_tx = await anext(stream)
+    await stream.aclose()
+
+    assert first_tx.id in {tx.id for tx in transactions}
+
+
+@pytest.mark.asyncio
+async def test__stream__not_streaming_query(clean_db, container, user):
+    app = container.app()
+
+    users = [u async for u in app.stream(GetUsersDTO(), container.db_session())]
+
+    assert [u.id for u in users] == [user.id]
+
+
+@pytest.mark.asyncio
+async def test__stream__incorrect_batch_size(clean_db, container, user):
+    app = container.app()
+
+    with pytest.raises(IncorrectData):
+        async for _ in app.stream(StreamUserTransactionsDTO(user_id=user.id, batch_size=0), container.db_session()):
+            pass
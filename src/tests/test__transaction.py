@@ -1,12 +1,18 @@
 import random
 import uuid
+from datetime import datetime
 from decimal import Decimal
 
 import pytest
+from sqlalchemy import select, event, update
 
+from domain.account.commands import ShareAccountAccessDTO
+from domain.category.commands import DeleteCategoryByIdDTO
 from domain.transaction.commands import CreateTransactionDTO
 from domain.transaction.queries import GetUserTransactionsDTO, GetAccountTransactionsDTO
 from shared.exceptions import EntityNotFoundException, IncorrectData
+from storage.models import AccountModel, AccountAccessModel, LedgerEntryModel, TransactionModel
+from storage.transaction import _participants_stmt, TransactionDataMapper, TransactionSqlAlchemyRepository
 from tests.conftest import user_accounts_transactions, another_user_transactions
 
 
@@ -327,6 +333,101 @@ async def test__create_transaction__with_category_id(
     assert last_tx.amount == amount
 
 
+@pytest.mark.asyncio
+async def test__get_transactions__deleted_category(
+        clean_db,
+        container,
+        user_accounts,
+        existing_custom_category
+):
+    app = container.app()
+    user, accounts = user_accounts
+    debit_account = accounts[0]
+
+    tx = await app.execute(
+        CreateTransactionDTO(
+            user_id=user.id,
+            credit_account=None,
+            debit_account=debit_account.number,
+            amount=Decimal(10.00),
+            category_id=existing_custom_category.id
+        ),
+        container.db_session()
+    )
+    await app.execute(DeleteCategoryByIdDTO(existing_custom_category.id, user.id), container.db_session())
+
+    # transactions of deleted category are still listed together with the category
+    user_txs = await app.execute(GetUserTransactionsDTO(user_id=user.id), container.db_session())
+    account_txs = await app.execute(
+        GetAccountTransactionsDTO(user.id, debit_account.number), container.db_session()
+    )
+    for txs in (user_txs, account_txs):
+        assert [t.id for t in txs] == [tx.id]
+        assert txs[0].category_id == existing_custom_category.id
+        assert txs[0].category.name == existing_custom_category.name
+
+
+@pytest.mark.asyncio
+async def test__create_transaction__validation_round_trip(
+        clean_db,
+        container,
+        user_accounts,
+        existing_general_category
+):
+    app = container.app()
+    user, accounts = user_accounts
+    statements = []
+
+    def collect(conn, cursor, statement, *args):
+        statements.append(statement.lstrip().upper())
+
+    engine = container.engine().sync_engine
+    event.listen(engine, 'before_cursor_execute', collect)
+    try:
+        await app.execute(
+            CreateTransactionDTO(
+                user_id=user.id,
+                credit_account=accounts[0].number,
+                debit_account=accounts[1].number,
+                amount=Decimal(1.00),
+                category_id=existing_general_category.id
+            ),
+            container.db_session()
+        )
+    finally:
+        event.remove(engine, 'before_cursor_execute', collect)
+
+    # both accounts and category are loaded by one query before the transaction is inserted
+    first_insert = next(i for i, statement in enumerate(statements) if statement.startswith('INSERT'))
+    assert len([statement for statement in statements[:first_insert] if statement.startswith('SELECT')]) == 1
+
+
+@pytest.mark.asyncio
+async def test__create_transaction__prebuilt_statement_not_modified(
+        clean_db,
+        container,
+        user_accounts,
+        existing_general_category
+):
+    app = container.app()
+    user, accounts = user_accounts
+    sql = str(_participants_stmt)
+
+    for _ in range(2):
+        await app.execute(
+            CreateTransactionDTO(
+                user_id=user.id,
+                credit_account=None,
+                debit_account=accounts[0].number,
+                amount=Decimal(1.00),
+                category_id=existing_general_category.id
+            ),
+            container.db_session()
+        )
+
+    assert str(_participants_stmt) == sql
+
+
 @pytest.mark.asyncio
 async def test__create_transaction__with_category_id__category_id_does_not_exists(
         clean_db,
@@ -461,3 +562,173 @@ async def test__get_user_transactions__another_user(
 
 
 
+@pytest.mark.asyncio
+async def test__get_user_transactions__pages(
+        clean_db,
+        container,
+        user_accounts_transactions,
+        another_user_transactions
+):
+    app = container.app()
+    user, accounts, transactions = user_accounts_transactions
+    all_txs = await app.execute(GetUserTransactionsDTO(user_id=user.id), container.db_session())
+
+    paged_txs, cursor = [], None
+    while True:
+        page = await app.execute(
+            GetUserTransactionsDTO(user_id=user.id, limit=2, cursor=cursor),
+            container.db_session()
+        )
+        assert len(page) <= 2
+        paged_txs.extend(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert all_txs.next_cursor is None
+    assert [tx.id for tx in paged_txs] == [tx.id for tx in all_txs]
+    assert len(paged_txs) == len(transactions)
+
+
+@pytest.mark.asyncio
+async def test__get_account_transactions__pages(clean_db, container, user_accounts_transactions):
+    app = container.app()
+    user, accounts, transactions = user_accounts_transactions
+    account = accounts[0]
+    all_txs = await app.execute(GetAccountTransactionsDTO(user.id, account.number), container.db_session())
+
+    paged_txs, cursor = [], None
+    while True:
+        page = await app.execute(
+            GetAccountTransactionsDTO(user.id, account.number, limit=1, cursor=cursor),
+            container.db_session()
+        )
+        paged_txs.extend(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert paged_txs == all_txs
+
+
+@pytest.mark.asyncio
+async def test__get_user_transactions__incorrect_page(clean_db, container, user):
+    app = container.app()
+
+    with pytest.raises(IncorrectData):
+        await app.execute(GetUserTransactionsDTO(user_id=user.id, limit=0), container.db_session())
+    with pytest.raises(IncorrectData):
+        await app.execute(GetUserTransactionsDTO(user_id=user.id, cursor='not a cursor'), container.db_session())
+
+
+@pytest.mark.asyncio
+async def test__create_transaction__ledger_entries(clean_db, container, user_accounts_transactions):
+    user, accounts, transactions = user_accounts_transactions
+    transfer = next(tx for tx in transactions if tx.credit_account and tx.debit_account)
+
+    async with container.db_session()() as session:
+        entries = (await session.execute(
+            select(AccountModel.number, LedgerEntryModel.amount, LedgerEntryModel.created_at).join(
+                AccountModel, AccountModel.id == LedgerEntryModel.account_id
+            ).where(LedgerEntryModel.transaction_id == transfer.id)
+        )).all()
+
+    assert sorted((number, amount) for number, amount, _ in entries) == sorted([
+        (transfer.debit_account, transfer.amount),
+        (transfer.credit_account, -transfer.amount)
+    ])
+    assert all(created_at == transfer.created_at for _, _, created_at in entries)
+
+
+@pytest.mark.asyncio
+async def test__transaction_mapper__shared_bulk_mapping(clean_db, container, user_accounts_transactions):
+    user, accounts, transactions = user_accounts_transactions
+    repository, another_repository = container.tx_repo(), container.tx_repo()
+    assert repository.data_mapper is another_repository.data_mapper is TransactionDataMapper.instance()
+
+    async with container.db_session()() as session:
+        rows = (await session.execute(
+            TransactionSqlAlchemyRepository._transactions_stmt().where(TransactionModel.user_id == user.id)
+        )).all()
+
+    mapper = repository.data_mapper
+    assert mapper.rows_to_entities(rows) == [mapper.row_to_entity(row) for row in rows]
+    assert len(rows) >= len(transactions)
+
+
+@pytest.mark.asyncio
+async def test__get_transactions__soft_deleted_access_and_ledger_entries(clean_db, container, user_accounts):
+    app = container.app()
+    user, accounts = user_accounts
+    revoked, account = accounts[0], accounts[1]
+
+    revoked_tx, removed_tx, listed_tx = [
+        await app.execute(
+            CreateTransactionDTO(user_id=user.id, credit_account=None, debit_account=debit.number, amount=Decimal(10)),
+            container.db_session()
+        )
+        for debit in (revoked, account, account)
+    ]
+
+    async with container.db_session()() as session:
+        await session.execute(
+            update(AccountAccessModel).where(
+                AccountAccessModel.account_id == revoked.id
+            ).values(deleted_at=datetime.utcnow())
+        )
+        await session.execute(
+            update(LedgerEntryModel).where(
+                LedgerEntryModel.transaction_id == removed_tx.id
+            ).values(deleted_at=datetime.utcnow())
+        )
+        await session.commit()
+
+    # both read paths skip deleted account access and ledger entries
+    user_txs = await app.execute(GetUserTransactionsDTO(user_id=user.id), container.db_session())
+    account_txs = await app.execute(GetAccountTransactionsDTO(user.id, account.number), container.db_session())
+
+    assert [tx.id for tx in user_txs] == [listed_tx.id]
+    assert [tx.id for tx in account_txs] == [listed_tx.id]
+
+
+@pytest.mark.asyncio
+async def test__account_ledger__soft_deleted_account(clean_db, container, user_accounts_transactions):
+    user, accounts, transactions = user_accounts_transactions
+    account = accounts[0]
+
+    async with container.db_session()() as session:
+        ledger_stmt = TransactionSqlAlchemyRepository._account_ledger_stmt(account.number)
+        assert (await session.execute(ledger_stmt)).all()
+
+        await session.execute(
+            update(AccountModel).where(AccountModel.id == account.id).values(deleted_at=datetime.utcnow())
+        )
+        # history of deleted account is not read by its number
+        assert (await session.execute(ledger_stmt)).all() == []
+
+
+@pytest.mark.asyncio
+async def test__get_user_transactions__transfers_listed_once(clean_db, container, user_accounts, another_user):
+    app = container.app()
+    user, accounts = user_accounts
+    await app.execute(
+        ShareAccountAccessDTO(
+            account_number=accounts[1].number,
+            account_owner_id=user.id,
+            share_access_with_id=another_user.id
+        ),
+        container.db_session()
+    )
+    transfer = await app.execute(
+        CreateTransactionDTO(
+            user_id=user.id, credit_account=accounts[0].number, debit_account=accounts[1].number, amount=Decimal(1)
+        ),
+        container.db_session()
+    )
+
+    # both legs of transfer are ledger entries of user accounts, only debit leg - of shared account
+    user_txs = await app.execute(GetUserTransactionsDTO(user_id=user.id), container.db_session())
+    another_user_txs = await app.execute(GetUserTransactionsDTO(user_id=another_user.id), container.db_session())
+
+    assert [tx.id for tx in user_txs] == [transfer.id]
+    assert [tx.id for tx in another_user_txs] == [transfer.id]
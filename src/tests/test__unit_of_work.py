@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from domain.account.commands import AddTransactionDTO, UpdateAccountBalanceDTO, CreateAccountDTO
+from domain.user.commands import CreateUserDTO
+from domain.user.queries import GetUsersDTO
+from shared.exceptions import IncorrectData
+from shared.interfaces import Command
+
+
+@dataclass
+class CreateUsersDTO(Command):
+    names: list[str]
+    fail: bool = False
+
+
+@pytest.fixture
+def app_with_nested_handler(container):
+    app = container.app()
+
+    async def create_users(command: CreateUsersDTO, session: AsyncSession):
+        users = []
+        for name in command.names:
+            users.append(await app.execute(CreateUserDTO(name=name), container.db_session()))
+        if command.fail:
+            raise IncorrectData('Nested users must be rolled back.')
+        return users
+
+    app.handlers[CreateUsersDTO] = create_users
+    yield app
+    app.handlers.pop(CreateUsersDTO)
+
+
+@pytest.mark.asyncio
+async def test__nested_commands__committed_together(clean_db, container, app_with_nested_handler):
+    app = app_with_nested_handler
+
+    users = await app.execute(CreateUsersDTO(names=['first', 'second']), container.db_session())
+    db_users = await app.execute(GetUsersDTO(), container.db_session())
+
+    assert sorted(user.id for user in users) == sorted(user.id for user in db_users)
+
+
+@pytest.mark.asyncio
+async def test__nested_commands__rolled_back_together(clean_db, container, app_with_nested_handler):
+    app = app_with_nested_handler
+
+    with pytest.raises(IncorrectData):
+        await app.execute(CreateUsersDTO(names=['first', 'second'], fail=True), container.db_session())
+
+    db_users = await app.execute(GetUsersDTO(), container.db_session())
+
+    assert db_users == []
+
+
+@pytest.fixture
+def session_events():
+    events = []
+
+    def on_begin(session, transaction, connection):
+        events.append(('begin', session.autoflush, connection.get_execution_options().get('postgresql_readonly')))
+
+    def on_commit(session):
+        events.append(('commit',))
+
+    event.listen(Session, 'after_begin', on_begin)
+    event.listen(Session, 'after_commit', on_commit)
+    yield events
+    event.remove(Session, 'after_begin', on_begin)
+    event.remove(Session, 'after_commit', on_commit)
+
+
+@pytest.mark.asyncio
+async def test__query__read_only_session(clean_db, container, session_events):
+    app = container.app()
+
+    await app.execute(GetUsersDTO(), container.db_session())
+
+    assert session_events == [('begin', False, True)]
+
+
+@pytest.mark.asyncio
+async def test__command__committed(clean_db, container, session_events):
+    app = container.app()
+
+    await app.execute(CreateUserDTO(name='user'), container.db_session())
+
+    assert session_events[0] == ('begin', True, None)
+    assert ('commit',) in session_events
+
+
+@pytest.fixture
+def connection_checkouts(container):
+    checkouts = []
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.append(dbapi_connection)
+
+    pool = container.engine().sync_engine.pool
+    event.listen(pool, 'checkout', on_checkout)
+    yield checkouts
+    event.remove(pool, 'checkout', on_checkout)
+
+
+@pytest.mark.asyncio
+async def test__command__one_connection_checkout(clean_db, container, user_accounts, connection_checkouts):
+    app = container.app()
+    user, accounts = user_accounts
+    commands = [
+        # handler executes nested commands
+        CreateAccountDTO(user.id, 'account', 10),
+        AddTransactionDTO(
+            user_id=user.id,
+            credit_account=accounts[0].number,
+            debit_account=accounts[1].number,
+            amount=1
+        ),
+        # several repository calls in one handler
+        UpdateAccountBalanceDTO(user_id=user.id, account_number=accounts[0].number),
+    ]
+
+    for command in commands:
+        connection_checkouts.clear()
+        await app.execute(command, container.db_session())
+
+        assert len(connection_checkouts) == 1, type(command).__name__
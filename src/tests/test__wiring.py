@@ -0,0 +1,25 @@
+import pytest
+
+from core.wiring import CompiledHandler, RepositoryPool, compile_handler
+from domain.transaction.commands import CreateTransactionDTO, create_transaction
+
+
+def test__compiled_handler__repositories_resolved_once(container):
+    handler = compile_handler(create_transaction, container)
+
+    assert isinstance(handler, CompiledHandler)
+    assert set(handler.repositories) == {'tx_repo', 'account_repo'}
+    assert container.app()._get_handler(CreateTransactionDTO(None, None, None, 0)).function \
+        is handler.function
+
+
+@pytest.mark.asyncio
+async def test__repository_pool__per_session(container):
+    session_maker = container.db_session()
+
+    async with session_maker() as session, session_maker() as another_session:
+        repo = RepositoryPool.get(session, 'account_repo', container.account_repo)
+
+        assert repo.session is session
+        assert RepositoryPool.get(session, 'account_repo', container.account_repo) is repo
+        assert RepositoryPool.get(another_session, 'account_repo', container.account_repo) is not repo
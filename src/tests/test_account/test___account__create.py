@@ -1,3 +1,4 @@
+import copy
 import random
 import uuid
 from decimal import Decimal
@@ -5,8 +6,10 @@ from decimal import Decimal
 import pytest
 
 from domain.account.commands import CreateAccountDTO
+from domain.account.entities import Account
 from domain.account.queries import GetAccountByIdDTO
 from shared.exceptions import EntityNotFoundException, IncorrectData
+from shared.money import Money
 
 
 @pytest.mark.asyncio
@@ -63,3 +66,29 @@ async def test__create_account__with_balance__below_zero(clean_db, container, us
             ),
             container.db_session()
         )
+
+
+def test__account_entity__balance_quantized():
+    account = Account(
+        id=Account.next_id(), name='account', number=Account.generate_number(), owner_id=None, balance=10.005
+    )
+    assert account.balance == Decimal('10.01')
+    assert not hasattr(account, '__dict__')
+
+    account.balance = 1
+    assert account.balance == Decimal('1.00')
+
+    trusted = Account.trusted(account.id, account.name, account.number, None, Decimal('1.00'))
+    assert trusted == account
+    assert copy.deepcopy(trusted) == account
+
+
+def test__account_entity__balance_units():
+    account = Account(
+        id=Account.next_id(), name='account', number=Account.generate_number(), owner_id=None, balance=100
+    )
+    assert account.balance == Decimal('100.00')
+
+    # results of Money arithmetic are Money, assigned as is
+    account.balance = account.balance - Money.from_decimal('0.50')
+    assert account.balance == Decimal('99.50') and account.balance == Money(9950)
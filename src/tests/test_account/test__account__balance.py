@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update, select
+
+from domain.account.commands import UpdateAccountBalanceDTO, AddTransactionDTO
+from domain.account.queries import GetAccountByIdDTO, GetAccountBalanceAtDTO
+from domain.transaction.queries import GetAccountStatementDTO
+from storage.account import balance_period_end
+from storage.models import AccountBalanceModel, AccountBalanceCheckpointModel
+
+
+@pytest.mark.asyncio
+async def test__account_balance__verification__no_drift(clean_db, container, user_accounts_transactions):
+    app = container.app()
+    user, accounts, _ = user_accounts_transactions
+
+    for account in accounts:
+        stored = await app.execute(GetAccountByIdDTO(user.id, account.id), container.db_session())
+        verified = await app.execute(UpdateAccountBalanceDTO(user.id, account.number), container.db_session())
+
+        assert verified.balance == stored.balance
+
+
+@pytest.mark.asyncio
+async def test__account_balance__verification__drift_is_fixed(clean_db, container, user_accounts_transactions):
+    app = container.app()
+    user, accounts, _ = user_accounts_transactions
+    account = await app.execute(GetAccountByIdDTO(user.id, accounts[0].id), container.db_session())
+
+    async with container.db_session()() as session:
+        await session.execute(
+            update(AccountBalanceModel).where(
+                AccountBalanceModel.account_id == account.id
+            ).values(balance=account.balance + Decimal('100.00'))
+        )
+        await session.commit()
+
+    await app.execute(UpdateAccountBalanceDTO(user.id, account.number), container.db_session())
+    fixed = await app.execute(GetAccountByIdDTO(user.id, account.id), container.db_session())
+
+    assert fixed.balance == account.balance
+
+
+@pytest.mark.asyncio
+async def test__account_balance__incremental__transfer(clean_db, container, user_accounts):
+    app = container.app()
+    user, accounts = user_accounts
+    credit_account, debit_account = accounts[0], accounts[1]
+    amount = (credit_account.balance * Decimal('0.3')).quantize(Decimal('0.01'))
+
+    await app.execute(
+        AddTransactionDTO(
+            user_id=user.id,
+            credit_account=credit_account.number,
+            debit_account=debit_account.number,
+            amount=amount
+        ),
+        container.db_session()
+    )
+
+    for account, expected in ((credit_account, credit_account.balance - amount),
+                              (debit_account, debit_account.balance + amount)):
+        stored = await app.execute(GetAccountByIdDTO(user.id, account.id), container.db_session())
+        verified = await app.execute(UpdateAccountBalanceDTO(user.id, account.number), container.db_session())
+
+        assert stored.balance == expected
+        assert verified.balance == expected
+
+
+@pytest.mark.asyncio
+async def test__account_balance_at(clean_db, container, user_accounts_transactions):
+    app = container.app()
+    user, accounts, _ = user_accounts_transactions
+    account = await app.execute(GetAccountByIdDTO(user.id, accounts[0].id), container.db_session())
+
+    balance_now = await app.execute(
+        GetAccountBalanceAtDTO(user.id, account.number, datetime.utcnow()),
+        container.db_session()
+    )
+    balance_before_account = await app.execute(
+        GetAccountBalanceAtDTO(user.id, account.number, datetime(2000, 1, 1)),
+        container.db_session()
+    )
+    balance_next_period = await app.execute(
+        GetAccountBalanceAtDTO(user.id, account.number, balance_period_end(datetime.utcnow()) + timedelta(days=1)),
+        container.db_session()
+    )
+
+    assert balance_now == account.balance
+    assert balance_before_account == Decimal('0.00')
+    assert balance_next_period == account.balance
+
+
+@pytest.mark.asyncio
+async def test__account_balance_checkpoint__one_per_period(clean_db, container, user_accounts_transactions):
+    user, accounts, _ = user_accounts_transactions
+
+    async with container.db_session()() as session:
+        checkpoints = (await session.scalars(
+            select(AccountBalanceCheckpointModel).where(AccountBalanceCheckpointModel.account_id == accounts[0].id)
+        )).all()
+
+    assert len(checkpoints) == 1
+    assert checkpoints[0].period_end == balance_period_end(datetime.utcnow())
+
+
+@pytest.mark.asyncio
+async def test__account_statement(clean_db, container, user_accounts_transactions):
+    app = container.app()
+    user, accounts, _ = user_accounts_transactions
+    account = await app.execute(GetAccountByIdDTO(user.id, accounts[0].id), container.db_session())
+
+    statement = await app.execute(
+        GetAccountStatementDTO(user.id, account.number, from_=datetime(2000, 1, 1), to=datetime.utcnow()),
+        container.db_session()
+    )
+
+    assert statement.opening_balance == Decimal('0.00')
+    assert statement.closing_balance == account.balance
+    # correction tx of initial balance is included
+    assert len(statement.transactions) >= 1
+    assert all(account.number in (tx.debit_account, tx.credit_account) for tx in statement.transactions)
+    assert statement.transactions == sorted(statement.transactions, key=lambda tx: tx.created_at)
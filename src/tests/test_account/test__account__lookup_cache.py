@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import event
+
+from domain.account.commands import AddTransactionDTO
+from shared.exceptions import EntityNotFoundException
+
+
+@pytest.fixture
+def statements(container):
+    executed = []
+
+    def count(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    engine = container.engine().sync_engine
+    event.listen(engine, 'before_cursor_execute', count)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', count)
+
+
+@pytest.mark.asyncio
+async def test__account_lookup__loaded_once_per_session(clean_db, container, user_accounts, statements):
+    user, accounts = user_accounts
+    account_repo = container.account_repo()
+
+    async with container.db_session()() as session:
+        account_repo.session = session
+        statements.clear()
+
+        by_number = await account_repo.get_by_number(accounts[0].number, user.id)
+        by_id = await account_repo.get_user_account_by_id(accounts[0].id, user.id)
+        other = await account_repo.get_by_number(accounts[1].number, user.id)
+        all_accounts = await account_repo.get_all__user(user.id)
+
+    assert len(statements) == 1
+    assert by_number is by_id
+    assert other.id == accounts[1].id
+    assert sorted(account.id for account in all_accounts) == sorted(account.id for account in accounts)
+
+
+@pytest.mark.asyncio
+async def test__account_lookup__access_checked(clean_db, container, user_accounts, another_user_account):
+    user, accounts = user_accounts
+    another_user, another_account = another_user_account
+    account_repo = container.account_repo()
+
+    async with container.db_session()() as session:
+        account_repo.session = session
+
+        with pytest.raises(EntityNotFoundException):
+            await account_repo.get_by_number(another_account.number, user.id)
+        with pytest.raises(EntityNotFoundException):
+            await account_repo.get_user_account_by_id(another_account.id, user.id)
+
+        assert await account_repo.is_accessible(another_account.number, another_user.id)
+        assert not await account_repo.is_accessible(another_account.number, user.id)
+
+
+@pytest.mark.asyncio
+async def test__account_lookup__transfer_round_trips(clean_db, container, user_accounts, statements):
+    app = container.app()
+    user, accounts = user_accounts
+    statements.clear()
+
+    await app.execute(
+        AddTransactionDTO(
+            user_id=user.id,
+            credit_account=accounts[0].number,
+            debit_account=accounts[1].number,
+            amount=1
+        ),
+        container.db_session()
+    )
+
+    account_lookups = [
+        statement for statement in statements
+        if statement.lstrip().upper().startswith('SELECT') and 'account_access' in statement
+    ]
+    assert len(account_lookups) == 1